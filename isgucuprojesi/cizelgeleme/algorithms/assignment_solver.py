@@ -0,0 +1,144 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from ..models import Is, IsAtama
+from django.db import transaction
+from django.db.models import F
+from .fitness_matrix import SEVIYELER, build_fitness_matrix, senaryo_index
+from .geneticalgorithm import load_dataset, load_monte_carlo_results
+
+# Kritik işlerin rollerine eklenen ağırlık; uygunluk puanı (0-100) bunun üzerine eklenir
+KRITIK_AGIRLIGI = 100.0
+
+def solve_assignments(isler, fitness_matrix, mesgul_calisanlar=()):
+    """
+    Bekleyen tüm işlere çalışanları tek seferde atar.
+
+    isler: {"id", "kod", "oncelik"} sözlüklerinin listesi. Her işin rolleri personel_ihtiyaci'ndan gelir ve
+    bir çalışan yalnızca kendi seviyesindeki bir role, en fazla bir işte atanabilir. Seviyeler birbirinden
+    bağımsız olduğundan her seviye için ayrı bir dikdörtgen atama problemi (Macar algoritması) çözülür.
+    Bir seviyedeki her çalışan o seviyenin her rolünü doldurabildiğinden dikdörtgen çözüm her zaman
+    min(çalışan, rol) eşleşme yapar; doldurulan rol sayısı yapısal olarak en fazladır ve ayrı bir doluluk
+    ağırlığı gerekmez (tüm hücrelere eklenen sabit seçimi değiştirmezdi). Rol sayısı çalışandan fazlaysa
+    ağırlıklar önce kritik işlerin rollerini, sonra toplam uygunluğu tercih eder.
+
+    Dönüş: ({is_id: {seviye: [çalışan adı, ...]}}, {is_id: {seviye: eksik sayı}})
+    """
+    task_index = fitness_matrix["task_index"]
+    mesgul = {fitness_matrix["worker_index"][w] for w in mesgul_calisanlar if w in fitness_matrix["worker_index"]}
+
+    isler = [i for i in isler if i["kod"] in task_index]
+    atamalar = {i["id"]: {seviye_str: [] for seviye_str, _ in SEVIYELER} for i in isler}
+    eksikler = {i["id"]: {seviye_str: 0 for seviye_str, _ in SEVIYELER} for i in isler}
+
+    for s_idx, (seviye_str, seviye_int) in enumerate(SEVIYELER):
+        workers = np.array([
+            w for w in np.flatnonzero(fitness_matrix["seviye"] == seviye_int) if w not in mesgul
+        ], dtype=int)
+
+        # Her rol bir sütun: (iş, görev indeksi, senaryo indeksi)
+        slot_is, slot_task, slot_senaryo = [], [], []
+        for is_obj in isler:
+            t_idx = task_index[is_obj["kod"]]
+            for _ in range(fitness_matrix["ihtiyac"][t_idx, s_idx]):
+                slot_is.append(is_obj["id"])
+                slot_task.append(t_idx)
+                slot_senaryo.append(senaryo_index(is_obj["oncelik"] == "kritik"))
+        if not slot_is:
+            continue
+
+        atanan_slotlar = np.zeros(len(slot_is), dtype=bool)
+        if len(workers) > 0:
+            slot_task = np.array(slot_task)
+            slot_senaryo = np.array(slot_senaryo)
+            uygunluk = fitness_matrix["fitness"][slot_senaryo[None, :], slot_task[None, :], workers[:, None]]
+            agirlik = KRITIK_AGIRLIGI * (slot_senaryo == senaryo_index(True)) + uygunluk
+
+            satirlar, kolonlar = linear_sum_assignment(agirlik, maximize=True)
+            for w_idx, slot in zip(workers[satirlar], kolonlar):
+                atamalar[slot_is[slot]][seviye_str].append(fitness_matrix["workers"][w_idx])
+            atanan_slotlar[kolonlar] = True
+
+        for slot in np.flatnonzero(~atanan_slotlar):
+            eksikler[slot_is[slot]][seviye_str] += 1
+
+    return atamalar, eksikler
+
+@transaction.atomic
+def save_assignments(atamalar, eksikler, calisanlar):
+    """Bekleyen işlerin eski atamalarını global çözümle değiştirir; eksik roller taşeron olarak işlenir."""
+    IsAtama.objects.filter(is_objesi_id__in=list(atamalar.keys())).delete()
+    IsAtama.objects.bulk_create([
+        IsAtama(is_objesi_id=is_id, calisan_id=calisanlar[isim]["id"], seviye=seviye)
+        for is_id, seviyeler in atamalar.items()
+        for seviye, isimler in seviyeler.items()
+        for isim in isimler
+    ])
+    for is_id, eksik in eksikler.items():
+        Is.objects.filter(id=is_id).update(
+            taseron_ustabasi=eksik["ustabasi"],
+            taseron_kalifiyeli=eksik["kalifiyeli"],
+            taseron_cirak=eksik["cirak"]
+        )
+
+def onay_asimlari(isler, eksikler):
+    """Global çözümde onaylanan taşeron sayısını aşan işler için {is_id: toplam aşım} döndürür."""
+    onayli = {i["id"]: i for i in isler}
+    asimlar = {}
+    for is_id, eksik in eksikler.items():
+        asim = sum(max(0, eksik[seviye_str] - onayli[is_id][f"taseron_{seviye_str}"]) for seviye_str, _ in SEVIYELER)
+        if asim:
+            asimlar[is_id] = asim
+    return asimlar
+
+def main(fitness_matrix=None, hata_firlat=False):
+    """
+    Beklemedeki tüm işleri uygunluk matrisi üzerinde tek bir global atama ile yeniden dağıtır.
+
+    Devam eden işlerdeki çalışanlar meşgul kabul edilir ve değiştirilmez. Taşeron sayısı hiçbir işte
+    onaylanmış değerin (is_kaydet'te taseron_onayi ile kaydedilen) üzerine çıkarılmaz: çözüm bir işte
+    daha fazla taşeron gerektiriyorsa o işin mevcut ataması korunur, çalışanları meşgul sayılır ve
+    kalan işler yeniden çözülür. Okuma ve yazma aynı işlemde, bekleyen işler kilitlenerek yapılır;
+    çözüm sırasında elle yapılan değişiklikler ezilmez. hata_firlat=True ise veri yükleme hataları
+    yeniden fırlatılır.
+    """
+    print("Global iş atama çözücüsü başlatılıyor...")
+    tasarim_kodlari, calisanlar = load_dataset(hata_firlat=hata_firlat)
+    if not tasarim_kodlari or not calisanlar:
+        print("Veri yüklenemedi, işlem durduruluyor.")
+        return None
+
+    if fitness_matrix is None:
+        mc_results = load_monte_carlo_results(hata_firlat=hata_firlat)
+        fitness_matrix = build_fitness_matrix(tasarim_kodlari, calisanlar, mc_results)
+
+    with transaction.atomic():
+        isler = list(Is.objects.select_for_update(of=('self',)).filter(durum='beklemede').values(
+            'id', 'oncelik', 'taseron_ustabasi', 'taseron_kalifiyeli', 'taseron_cirak', kod=F('tasarim__kod')
+        ))
+        mesgul_calisanlar = set(
+            IsAtama.objects.filter(is_objesi__durum='devam_ediyor', calisan__isnull=False)
+            .values_list('calisan__ad_soyad', flat=True)
+        )
+        mevcut_atamalar = {}
+        for is_id, ad_soyad in IsAtama.objects.filter(
+            is_objesi_id__in=[i["id"] for i in isler], calisan__isnull=False
+        ).values_list('is_objesi_id', 'calisan__ad_soyad'):
+            mevcut_atamalar.setdefault(is_id, set()).add(ad_soyad)
+
+        # Her turda onayı en çok aşan iş korunur ve kalanlar yeniden çözülür; korunan küme yalnızca büyür
+        korunan = set()
+        while True:
+            cozulecek = [i for i in isler if i["id"] not in korunan]
+            mesgul = mesgul_calisanlar.union(*(mevcut_atamalar.get(is_id, set()) for is_id in korunan))
+            atamalar, eksikler = solve_assignments(cozulecek, fitness_matrix, mesgul)
+            asimlar = onay_asimlari(cozulecek, eksikler)
+            if not asimlar:
+                break
+            korunan.add(max(asimlar, key=lambda is_id: (asimlar[is_id], -is_id)))
+
+        save_assignments(atamalar, eksikler, calisanlar)
+
+    toplam_eksik = sum(sum(e.values()) for e in eksikler.values())
+    print(f"{len(isler)} bekleyen iş için global atama tamamlandı. Eksik rol sayısı: {toplam_eksik}, "
+          f"taşeron onayı yetmediği için korunan iş sayısı: {len(korunan)}")
+    return {"is_sayisi": len(isler), "eksik_rol_sayisi": toplam_eksik, "korunan_is_sayisi": len(korunan)}
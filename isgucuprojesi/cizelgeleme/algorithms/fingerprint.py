@@ -0,0 +1,59 @@
+import hashlib
+from ..models import OptimizasyonParmakIzi
+from django.db import transaction
+
+def hesapla_parmak_izi(satirlar):
+    """Sıralı bir satır/değer dizisinin içerik parmak izini (sha256) hesaplar."""
+    h = hashlib.sha256()
+    for satir in satirlar:
+        if isinstance(satir, (bytes, bytearray, memoryview)):
+            h.update(bytes(satir))
+        else:
+            h.update(repr(satir).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+def gruplu_parmak_izleri(satirlar):
+    """(anahtar, satır) çiftlerinden anahtar başına parmak izi üretir; satırlar anahtara göre sıralı gelmelidir."""
+    parmak_izleri = {}
+    h = None
+    onceki_anahtar = None
+    for anahtar, satir in satirlar:
+        if h is None or anahtar != onceki_anahtar:
+            if h is not None:
+                parmak_izleri[str(onceki_anahtar)] = h.hexdigest()
+            h = hashlib.sha256()
+            onceki_anahtar = anahtar
+        h.update(repr(satir).encode("utf-8"))
+        h.update(b"\x1e")
+    if h is not None:
+        parmak_izleri[str(onceki_anahtar)] = h.hexdigest()
+    return parmak_izleri
+
+def load_fingerprints(asama):
+    """Bir aşama için kayıtlı parmak izlerini {anahtar: parmak_izi} olarak döndürür."""
+    return dict(OptimizasyonParmakIzi.objects.filter(asama=asama).values_list('anahtar', 'parmak_izi'))
+
+@transaction.atomic
+def save_fingerprints(asama, parmak_izleri):
+    """Bir aşamanın parmak izlerini verilen kümeyle değiştirir."""
+    OptimizasyonParmakIzi.objects.filter(asama=asama).delete()
+    OptimizasyonParmakIzi.objects.bulk_create([
+        OptimizasyonParmakIzi(asama=asama, anahtar=anahtar, parmak_izi=parmak_izi)
+        for anahtar, parmak_izi in parmak_izleri.items()
+    ])
+
+def degisen_anahtarlar(guncel, kayitli):
+    """Parmak izi değişen veya yeni eklenen anahtarlar ile artık bulunmayan anahtarları döndürür."""
+    degisen = {a for a, p in guncel.items() if kayitli.get(a) != p}
+    silinen = set(kayitli) - set(guncel)
+    return degisen, silinen
+
+@transaction.atomic
+def update_fingerprints(asama, parmak_izleri, silinen=()):
+    """Bir aşamanın yalnızca verilen anahtarlarını günceller ve silinen anahtarları kaldırır."""
+    OptimizasyonParmakIzi.objects.filter(asama=asama, anahtar__in=list(parmak_izleri) + list(silinen)).delete()
+    OptimizasyonParmakIzi.objects.bulk_create([
+        OptimizasyonParmakIzi(asama=asama, anahtar=anahtar, parmak_izi=parmak_izi)
+        for anahtar, parmak_izi in parmak_izleri.items()
+    ])
@@ -0,0 +1,132 @@
+import numpy as np
+
+# Senaryo ve seviye sıraları matris eksenlerinin sırasını belirler
+SENARYOLAR = ("normal", "kritik")
+SEVIYELER = (("ustabasi", 1), ("kalifiyeli", 2), ("cirak", 3))
+
+def build_fitness_matrix(tasarim_kodlari, calisanlar, mc_results):
+    """
+    Tüm (senaryo, görev, çalışan) üçlüleri için bireysel uygunluk puanlarını tek seferde hesaplar.
+
+    Değerler calculate_worker_fitness_for_task ile birebir aynıdır; 'fitness' dizisi
+    (2, görev sayısı, çalışan sayısı) boyutundadır ve 0. eksen SENARYOLAR sırasını izler.
+    """
+    workers = list(calisanlar.keys())
+    tasks = list(tasarim_kodlari.keys())
+
+    seviye = np.array([calisanlar[w]["yetkinlik_seviyesi"] for w in workers], dtype=int)
+    tecrube = np.array([calisanlar[w]["tecrube_yili"] for w in workers], dtype=float)
+    verimlilik = np.array([calisanlar[w]["verimlilik_puani"] for w in workers], dtype=float)
+    ihtiyac = np.array([
+        [tasarim_kodlari[t]["personel_ihtiyaci"].get(s, 0) for s, _ in SEVIYELER] for t in tasks
+    ], dtype=int).reshape(len(tasks), len(SEVIYELER))
+
+    # Yetkinlik puanı (görev x çalışan): her ihtiyaç seviyesi için uygunluğun maksimumu
+    gerekli = ihtiyac[:, :, None] > 0
+    yetkinlik = np.full((len(tasks), len(workers)), 0.1)
+    yetkinlik = np.maximum(yetkinlik, np.where(gerekli[:, 0] & (seviye == 1), 1.0, 0.0))
+    yetkinlik = np.maximum(yetkinlik, np.where(gerekli[:, 1] & (seviye <= 2), np.where(seviye == 2, 0.9, 0.8), 0.0))
+    yetkinlik = np.maximum(yetkinlik, np.where(gerekli[:, 2] & (seviye <= 3), np.where(seviye == 3, 0.8, 0.7), 0.0))
+
+    tecrube_puani = np.minimum(tecrube / 15, 1.0)
+
+    # Monte Carlo verisi olmayan çalışanlar bonus almaz
+    mc_calisanlar = (mc_results or {}).get('calisanlar', {})
+    mc_var = np.array([w in mc_calisanlar for w in workers], dtype=bool)
+    risk = np.array([mc_calisanlar.get(w, {}).get('risk_skoru', 0.5) for w in workers], dtype=float)
+    performans = np.array([mc_calisanlar.get(w, {}).get('ortalama_performans', 0.5) for w in workers], dtype=float)
+
+    fitness = np.empty((len(SENARYOLAR), len(tasks), len(workers)))
+    for s_idx, senaryo in enumerate(SENARYOLAR):
+        is_kritik = senaryo == "kritik"
+        risk_w, performans_w = (0.7, 0.3) if is_kritik else (0.3, 0.7)
+        w_yetkinlik, w_tecrube, w_verimlilik = (0.30, 0.40, 0.30) if is_kritik else (0.40, 0.20, 0.40)
+
+        mc_bonus = np.where(mc_var, ((1 - risk) * risk_w + performans * performans_w) * 20, 0.0)
+        base_fitness = (
+            yetkinlik * w_yetkinlik +
+            tecrube_puani * w_tecrube +
+            verimlilik * w_verimlilik
+        ) * 100
+        fitness[s_idx] = np.minimum(base_fitness + mc_bonus, 100)
+
+    return {
+        "workers": workers,
+        "tasks": tasks,
+        "worker_index": {w: i for i, w in enumerate(workers)},
+        "task_index": {t: i for i, t in enumerate(tasks)},
+        "seviye": seviye,
+        "ihtiyac": ihtiyac,
+        "fitness": fitness,
+    }
+
+def senaryo_index(is_kritik):
+    """Senaryo bayrağını matrisin 0. eksenindeki indekse çevirir."""
+    return SENARYOLAR.index("kritik" if is_kritik else "normal")
+
+def worker_fitness(fm, worker_name, task_id, is_kritik=False):
+    """Önceden hesaplanmış matristen tek bir çalışanın uygunluk puanını okur."""
+    w_idx = fm["worker_index"].get(worker_name)
+    t_idx = fm["task_index"].get(task_id)
+    if w_idx is None or t_idx is None:
+        return 0
+    return float(fm["fitness"][senaryo_index(is_kritik), t_idx, w_idx])
+
+def slot_levels(fm, task_id):
+    """Görevin takım dizisindeki her sütunun seviye indeksini (0: ustabaşı, 1: kalifiyeli, 2: çırak) döndürür."""
+    ihtiyac = fm["ihtiyac"][fm["task_index"][task_id]]
+    return np.repeat(np.arange(len(SEVIYELER)), ihtiyac)
+
+def encode_population(fm, task_id, population):
+    """
+    Sözlük tabanlı takımları (seviye -> isim listesi) çalışan indeksi dizisine çevirir.
+
+    Her satır bir takım, her sütun personel_ihtiyaci'ndan gelen bir roldür; boş roller -1 ile doldurulur.
+    """
+    ihtiyac = fm["ihtiyac"][fm["task_index"][task_id]]
+    baslangic = np.concatenate(([0], np.cumsum(ihtiyac)[:-1]))
+    encoded = np.full((len(population), int(ihtiyac.sum())), -1, dtype=int)
+    worker_index = fm["worker_index"]
+
+    for row, individual in enumerate(population):
+        for s_idx, (seviye_str, _) in enumerate(SEVIYELER):
+            isimler = individual.get(seviye_str, [])[:ihtiyac[s_idx]]
+            for offset, isim in enumerate(isimler):
+                encoded[row, baslangic[s_idx] + offset] = worker_index.get(isim, -1)
+    return encoded
+
+def decode_individual(fm, task_id, individual_idx):
+    """İndeks dizisi olarak kodlanmış tek bir takımı seviye -> isim listesi sözlüğüne çevirir."""
+    ihtiyac = fm["ihtiyac"][fm["task_index"][task_id]]
+    seviyeler = slot_levels(fm, task_id)
+    individual = {}
+    for s_idx, (seviye_str, _) in enumerate(SEVIYELER):
+        if ihtiyac[s_idx] > 0:
+            individual[seviye_str] = [
+                fm["workers"][w_idx] for w_idx in individual_idx[seviyeler == s_idx] if w_idx >= 0
+            ]
+    return individual
+
+def score_population(fm, task_id, population_idx, is_kritik=False):
+    """
+    İndeks dizisi olarak kodlanmış bir popülasyonun takım uygunluklarını tek bir topla-ve-topla adımıyla hesaplar.
+
+    calculate_team_fitness ile aynı eksik personel cezasını uygular.
+    """
+    population_idx = np.asarray(population_idx, dtype=int)
+    t_idx = fm["task_index"][task_id]
+    row = fm["fitness"][senaryo_index(is_kritik), t_idx]
+    dolu = population_idx >= 0
+
+    total_fitness = np.where(dolu, row[np.where(dolu, population_idx, 0)], 0.0).sum(axis=1)
+
+    # İhtiyaç karşılanmadıysa ceza puanı uygula
+    ihtiyac = fm["ihtiyac"][t_idx]
+    seviyeler = slot_levels(fm, task_id)
+    for s_idx, gereken_sayi in enumerate(ihtiyac):
+        if gereken_sayi == 0:
+            continue
+        atanan_sayi = dolu[:, seviyeler == s_idx].sum(axis=1)
+        ceza = np.where(atanan_sayi < gereken_sayi, 0.5 * (atanan_sayi / gereken_sayi), 1.0)
+        total_fitness = total_fitness * ceza
+    return total_fitness
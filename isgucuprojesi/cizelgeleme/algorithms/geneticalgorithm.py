@@ -1,14 +1,23 @@
 import json
 import os
+import multiprocessing
 import numpy as np
 import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from ..models import TasarimKodu, Calisan, GenetikSonuc, GenetikAtama, MonteCarloSonuc
+from django.conf import settings
 from django.db import transaction
+from .fingerprint import hesapla_parmak_izi, load_fingerprints, save_fingerprints, degisen_anahtarlar
+from .fitness_matrix import (
+    SENARYOLAR, SEVIYELER, build_fitness_matrix, decode_individual, encode_population, score_population,
+    senaryo_index, slot_levels
+)
 
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
-def load_dataset():
-    """Veri setini Django modellerinden yükle"""
+def load_dataset(hata_firlat=False):
+    """Veri setini Django modellerinden yükle; okuma hata verirse (None, None) döner, hata_firlat=True ise fırlatır"""
     try:
         tasarim_kodlari = {t.kod: {
             "urun_adi": t.urun_adi,
@@ -30,10 +39,12 @@ def load_dataset():
         return tasarim_kodlari, calisanlar
     except Exception as e:
         print(f"Veri yükleme hatası: {str(e)}")
+        if hata_firlat:
+            raise
         return None, None
 
-def load_monte_carlo_results():
-    """Monte Carlo simülasyon sonuçlarını Django modellerinden yükle"""
+def load_monte_carlo_results(hata_firlat=False):
+    """Monte Carlo simülasyon sonuçlarını Django modellerinden yükle; okuma hata verirse None döner, hata_firlat=True ise fırlatır"""
     try:
         sonuclar = {'calisanlar': {}}
         for sonuc in MonteCarloSonuc.objects.select_related('calisan').all():
@@ -45,6 +56,8 @@ def load_monte_carlo_results():
         return sonuclar
     except Exception as e:
         print(f"Monte Carlo sonuçları yüklenemedi: {str(e)}")
+        if hata_firlat:
+            raise
         return None
 
 def calculate_worker_fitness_for_task(worker_name, task_id, tasarim_kodlari, calisanlar, mc_results, is_kritik=False):
@@ -220,93 +233,298 @@ def mutate(individual, calisanlar):
 
     return mutated_individual
 
-@transaction.atomic
-def save_genetic_results(task_id, best_team, tasarim_kodlari, calisanlar, mc_results, is_kritik):
+def _level_pools(fitness_matrix):
+    """Her seviye (0: ustabaşı, 1: kalifiyeli, 2: çırak) için çalışan indeksi havuzunu döndürür."""
+    return [np.flatnonzero(fitness_matrix["seviye"] == seviye_int) for _, seviye_int in SEVIYELER]
+
+def create_initial_population_array(task_id, fitness_matrix, pop_size, rng):
+    """Başlangıç popülasyonunu (pop_size x rol sayısı) çalışan indeksi dizisi olarak oluşturur."""
+    ihtiyac = fitness_matrix["ihtiyac"][fitness_matrix["task_index"][task_id]]
+    pools = _level_pools(fitness_matrix)
+    bloklar = []
+    for s_idx, gereken_sayi in enumerate(ihtiyac):
+        if gereken_sayi == 0:
+            continue
+        aday_havuzu = pools[s_idx]
+        blok = np.full((pop_size, gereken_sayi), -1, dtype=int)
+        secilen = min(gereken_sayi, len(aday_havuzu))
+        if secilen > 0:
+            # Her satır için havuzun rastgele bir permütasyonunun ilk elemanları (tekrarsız seçim)
+            sira = np.argsort(rng.random((pop_size, len(aday_havuzu))), axis=1)[:, :secilen]
+            blok[:, :secilen] = aday_havuzu[sira]
+        bloklar.append(blok)
+    if not bloklar:
+        return np.empty((pop_size, 0), dtype=int)
+    return np.hstack(bloklar)
+
+def select_parents_array(fitness_scores, num_parents, rng, tournament_size=3):
+    """Tüm ebeveynleri tek seferde turnuva seçimiyle seçer ve popülasyon satır indekslerini döndürür."""
+    competitors = rng.integers(0, len(fitness_scores), size=(num_parents, min(tournament_size, len(fitness_scores))))
+    winners = np.argmax(fitness_scores[competitors], axis=1)
+    return competitors[np.arange(num_parents), winners]
+
+def crossover_array(parents1, parents2, seviyeler, rng):
     """
-    En iyi takımı 'atanan' olarak, diğer TÜM çalışanları ise 'alternatif' olarak,
-    bireysel uygunluk puanlarına göre sıralayarak kaydeder.
+    Ebeveyn çiftlerinden toplu çaprazlama yapar.
+
+    Her seviye bloğu için iki ebeveynin çalışanlarının birleşiminden tekrarsız rastgele seçim yapılır;
+    birleşim yetmezse eksik roller -1 kalır.
+    """
+    child = np.full_like(parents1, -1)
+    for s_idx in np.unique(seviyeler):
+        kolonlar = np.flatnonzero(seviyeler == s_idx)
+        b1, b2 = parents1[:, kolonlar], parents2[:, kolonlar]
+        # İkinci ebeveynde birincide zaten olan çalışanlar tekrar sayılmaz
+        tekrar = (b2[:, :, None] == b1[:, None, :]).any(axis=2)
+        adaylar = np.hstack([b1, np.where(tekrar, -1, b2)])
+        gecersiz = adaylar < 0
+        anahtar = np.where(gecersiz, 2.0, rng.random(adaylar.shape))
+        sira = np.argsort(anahtar, axis=1)[:, :len(kolonlar)]
+        child[:, kolonlar] = np.take_along_axis(adaylar, sira, axis=1)
+    return child
+
+def mutate_array(population, seviyeler, fitness_matrix, mutation_rate, rng, max_deneme=3):
+    """Seçilen takımlarda rastgele bir rolü aynı seviyeden, takımda olmayan bir çalışanla değiştirir."""
+    if population.shape[1] == 0:
+        return population
+    pools = _level_pools(fitness_matrix)
+    satirlar = np.flatnonzero(rng.random(len(population)) < mutation_rate)
+    kolonlar = rng.integers(0, population.shape[1], size=len(satirlar))
+
+    # Boş rollere mutasyon uygulanmaz
+    dolu = population[satirlar, kolonlar] >= 0
+    satirlar, kolonlar = satirlar[dolu], kolonlar[dolu]
+
+    for s_idx in np.unique(seviyeler[kolonlar]):
+        aday_havuzu = pools[s_idx]
+        secim = seviyeler[kolonlar] == s_idx
+        bekleyen_satir, bekleyen_kolon = satirlar[secim], kolonlar[secim]
+        blok = population[:, seviyeler == s_idx]
+        for _ in range(max_deneme):
+            if len(bekleyen_satir) == 0:
+                break
+            yeni = aday_havuzu[rng.integers(0, len(aday_havuzu), size=len(bekleyen_satir))]
+            # Aynı seviye bloğunda zaten bulunan çalışanlar reddedilir, bir sonraki denemede tekrar çekilir
+            gecerli = ~(blok[bekleyen_satir] == yeni[:, None]).any(axis=1)
+            population[bekleyen_satir[gecerli], bekleyen_kolon[gecerli]] = yeni[gecerli]
+            bekleyen_satir, bekleyen_kolon = bekleyen_satir[~gecerli], bekleyen_kolon[~gecerli]
+    return population
+
+def seed_population_array(population, initial_team, task_id, fitness_matrix, rng, warm_ratio=0.5):
+    """
+    Popülasyonun bir kısmını önceki çalıştırmanın en iyi takımıyla tohumlar.
+
+    İlk satır takımın kendisi, sonraki satırların warm_ratio kadarı ise bir kez mutasyona uğratılmış
+    kopyalarıdır; kalan satırlar çeşitliliği korumak için rastgele bırakılır.
+    """
+    seviyeler = slot_levels(fitness_matrix, task_id)
+    n_warm = max(1, int(len(population) * warm_ratio))
+    population[:n_warm] = encode_population(fitness_matrix, task_id, [initial_team])[0]
+    population[1:n_warm] = mutate_array(population[1:n_warm], seviyeler, fitness_matrix, 1.0, rng)
+    return population
+
+def genetic_algorithm_array(task_id, fitness_matrix, is_kritik=False, pop_size=50, generations=100,
+                            mutation_rate=0.1, rng=None, initial_team=None, patience=None):
+    """
+    Popülasyonu çalışan indeksi dizisi olarak tutan GA çekirdeği.
+
+    Seçim, çaprazlama ve mutasyon tüm popülasyon üzerinde toplu dizi işlemleriyle yapılır.
+    initial_team verilirse popülasyon bu takımla tohumlanır; patience verilirse en iyi uygunluk bu kadar
+    nesil boyunca iyileşmediğinde arama erken durdurulur.
+    En iyi takımı seviye -> isim listesi sözlüğü olarak, en iyi uygunluğu ile birlikte döndürür.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    seviyeler = slot_levels(fitness_matrix, task_id)
+
+    population = create_initial_population_array(task_id, fitness_matrix, pop_size, rng)
+    if population.shape[1] == 0:
+        return {}, 0.0
+    if initial_team:
+        population = seed_population_array(population, initial_team, task_id, fitness_matrix, rng)
+
+    best_overall_fitness = -1
+    best_overall_individual = None
+    # Çiftler halinde üretim için ebeveyn sayısı çift tutulur
+    num_parents = pop_size + (pop_size % 2)
+    iyilesmeyen_nesil = 0
+
+    for gen in range(generations):
+        fitness_scores = score_population(fitness_matrix, task_id, population, is_kritik)
+
+        best_idx = int(np.argmax(fitness_scores))
+        if fitness_scores[best_idx] > best_overall_fitness:
+            best_overall_fitness = float(fitness_scores[best_idx])
+            best_overall_individual = population[best_idx].copy()
+            iyilesmeyen_nesil = 0
+        else:
+            iyilesmeyen_nesil += 1
+            if patience is not None and iyilesmeyen_nesil >= patience:
+                print(f"'{task_id}' için {gen + 1}. nesilde erken durduruldu.")
+                break
+
+        parent_idx = select_parents_array(fitness_scores, num_parents, rng)
+        parents1, parents2 = population[parent_idx[0::2]], population[parent_idx[1::2]]
+
+        # Her ebeveyn çiftinden iki çocuk üretilir
+        children = np.empty((num_parents, population.shape[1]), dtype=int)
+        children[0::2] = crossover_array(parents1, parents2, seviyeler, rng)
+        children[1::2] = crossover_array(parents1, parents2, seviyeler, rng)
+
+        population = mutate_array(children[:pop_size], seviyeler, fitness_matrix, mutation_rate, rng)
+
+    return decode_individual(fitness_matrix, task_id, best_overall_individual), best_overall_fitness
+
+# bulk_create için parti boyutu
+KAYIT_PARTI_BOYU = 1000
+
+def save_all_genetic_results(best_teams, fitness_matrix, calisanlar, hata_firlat=False):
+    """
+    Tüm görev/senaryo sonuçlarını tek bir işlemde toplu olarak kaydeder.
+
+    best_teams: {(görev, is_kritik): takım}. Her görev için en iyi takım 'atanan', diğer TÜM çalışanlar
+    'alternatif' olarak yazılır. Uygunluk oranları uygunluk matrisinden okunur, çalışan kimlikleri
+    calisanlar sözlüğünden çözülür; satırlar bulk_create ile partiler halinde eklenir.
+    Başarıda True, hatada False döner; hata_firlat=True ise hata yeniden fırlatılır.
     """
     try:
-        tasarim = TasarimKodu.objects.get(kod=task_id)
-        senaryo = "kritik" if is_kritik else "normal"
-        
-        # Bu görev/senaryo için önceki sonuçları temizle
-        GenetikSonuc.objects.filter(tasarim=tasarim, senaryo=senaryo).delete()
-        
-        sonuc_obj = GenetikSonuc.objects.create(tasarim=tasarim, senaryo=senaryo)
-
-        # 1. 'Atanan' çalışanları kaydet
-        assigned_worker_names = set()
-        for seviye_str, calisan_listesi in best_team.items():
-            for worker_name in calisan_listesi:
-                assigned_worker_names.add(worker_name)
-                try:
-                    calisan = Calisan.objects.get(ad_soyad=worker_name)
-                    GenetikAtama.objects.create(
-                        sonuc=sonuc_obj,
-                        calisan=calisan,
-                        seviye=seviye_str,
-                        atanma_tipi="atanan",
-                        uygunluk_orani=calculate_worker_fitness_for_task(
-                            worker_name, task_id, tasarim_kodlari, calisanlar, mc_results, is_kritik
-                        )
-                    )
-                except Calisan.DoesNotExist:
-                    print(f"Atanan çalışan bulunamadı: {worker_name}")
-
-        # 2. Diğer TÜM çalışanları 'alternatif' olarak kaydet
-        all_worker_names = set(calisanlar.keys())
-        alternative_worker_names = all_worker_names - assigned_worker_names
-
-        for worker_name in alternative_worker_names:
-            try:
-                calisan = Calisan.objects.get(ad_soyad=worker_name)
-                seviye_int = calisan.yetkinlik_seviyesi
-                seviye_str = "ustabasi" if seviye_int == 1 else "kalifiyeli" if seviye_int == 2 else "cirak"
-
-                fitness = calculate_worker_fitness_for_task(
-                    worker_name, task_id, tasarim_kodlari, calisanlar, mc_results, is_kritik
-                )
-
-                GenetikAtama.objects.create(
-                    sonuc=sonuc_obj,
-                    calisan=calisan,
-                    seviye=seviye_str,
-                    atanma_tipi="alternatif",
-                    uygunluk_orani=fitness
-                )
-            except Calisan.DoesNotExist:
-                print(f"Alternatif çalışan bulunamadı: {worker_name}")
-        
-        print(f"'{task_id}' için sonuçlar kaydedildi. Atanan: {len(assigned_worker_names)}, Alternatif: {len(alternative_worker_names)}")
+        with transaction.atomic():
+            tasarim_idleri = dict(TasarimKodu.objects.filter(
+                kod__in={task for task, _ in best_teams}
+            ).values_list('kod', 'id'))
+            seviye_adlari = dict((seviye_int, seviye_str) for seviye_str, seviye_int in SEVIYELER)
+            hedefler = [(task, is_kritik) for task, is_kritik in best_teams if task in tasarim_idleri]
+
+            # Bu görev/senaryolar için önceki sonuçları temizle ve yenilerini oluştur
+            for senaryo in SENARYOLAR:
+                GenetikSonuc.objects.filter(
+                    tasarim_id__in=[tasarim_idleri[t] for t, k in hedefler if (senaryo == "kritik") == k],
+                    senaryo=senaryo
+                ).delete()
+            GenetikSonuc.objects.bulk_create([
+                GenetikSonuc(tasarim_id=tasarim_idleri[task], senaryo="kritik" if is_kritik else "normal")
+                for task, is_kritik in hedefler
+            ], batch_size=KAYIT_PARTI_BOYU)
+            sonuc_idleri = {
+                (tasarim_id, senaryo): sonuc_id
+                for sonuc_id, tasarim_id, senaryo in GenetikSonuc.objects.filter(
+                    tasarim_id__in=set(tasarim_idleri.values())
+                ).values_list('id', 'tasarim_id', 'senaryo')
+            }
+
+            atamalar = []
+            for task, is_kritik in hedefler:
+                senaryo = "kritik" if is_kritik else "normal"
+                sonuc_id = sonuc_idleri[(tasarim_idleri[task], senaryo)]
+                uygunluk = fitness_matrix["fitness"][senaryo_index(is_kritik), fitness_matrix["task_index"][task]]
+
+                # 1. 'Atanan' çalışanlar
+                assigned_worker_names = set()
+                for seviye_str, calisan_listesi in best_teams[(task, is_kritik)].items():
+                    for worker_name in calisan_listesi:
+                        if worker_name not in calisanlar:
+                            print(f"Atanan çalışan bulunamadı: {worker_name}")
+                            continue
+                        assigned_worker_names.add(worker_name)
+                        atamalar.append(GenetikAtama(
+                            sonuc_id=sonuc_id,
+                            calisan_id=calisanlar[worker_name]["id"],
+                            seviye=seviye_str,
+                            atanma_tipi="atanan",
+                            uygunluk_orani=float(uygunluk[fitness_matrix["worker_index"][worker_name]])
+                        ))
+
+                # 2. Diğer TÜM çalışanlar 'alternatif'
+                for worker_name, w_idx in fitness_matrix["worker_index"].items():
+                    if worker_name in assigned_worker_names:
+                        continue
+                    atamalar.append(GenetikAtama(
+                        sonuc_id=sonuc_id,
+                        calisan_id=calisanlar[worker_name]["id"],
+                        seviye=seviye_adlari.get(calisanlar[worker_name]["yetkinlik_seviyesi"], "cirak"),
+                        atanma_tipi="alternatif",
+                        uygunluk_orani=float(uygunluk[w_idx])
+                    ))
+
+            GenetikAtama.objects.bulk_create(atamalar, batch_size=KAYIT_PARTI_BOYU)
+
+        print(f"{len(hedefler)} görev/senaryo için sonuçlar kaydedildi ({len(atamalar)} atama satırı).")
         return True
     except Exception as e:
-        print(f"'{task_id}' için sonuçlar kaydedilemedi: {str(e)}")
+        print(f"GA sonuçları kaydedilemedi: {str(e)}")
+        if hata_firlat:
+            raise
         import traceback
         traceback.print_exc()
         return False
 
+def save_genetic_results(task_id, best_team, tasarim_kodlari, calisanlar, mc_results, is_kritik):
+    """
+    En iyi takımı 'atanan' olarak, diğer TÜM çalışanları ise 'alternatif' olarak,
+    bireysel uygunluk puanlarına göre sıralayarak kaydeder.
+    """
+    fitness_matrix = build_fitness_matrix(tasarim_kodlari, calisanlar, mc_results)
+    return save_all_genetic_results({(task_id, is_kritik): best_team}, fitness_matrix, calisanlar)
+
 def genetic_algorithm_for_task(task_id, tasarim_kodlari, calisanlar, mc_results, is_kritik=False,
-                               pop_size=50, generations=100, mutation_rate=0.1):
-    """Tek bir görev için genetik algoritmayı çalıştırır ve en iyi takımı döndürür."""
+                               pop_size=50, generations=100, mutation_rate=0.1, fitness_matrix=None,
+                               engine="dict", rng=None, initial_team=None, patience=None):
+    """
+    Tek bir görev için genetik algoritmayı çalıştırır ve en iyi takımı döndürür.
+
+    fitness_matrix verilirse (build_fitness_matrix) popülasyon her nesilde tek bir vektörel adımda puanlanır.
+    engine="array" seçilirse popülasyon indeks dizisi olarak tutulur ve genetic_algorithm_array kullanılır;
+    rng (numpy Generator) yalnızca bu motor tarafından kullanılır.
+    initial_team (önceki en iyi takım) popülasyonu tohumlar, patience erken durdurma için nesil sayısıdır.
+    """
     
     print(f"'{task_id}' görevi için GA başlatılıyor ({'kritik' if is_kritik else 'normal'})...")
+
+    if engine == "array":
+        if fitness_matrix is None:
+            fitness_matrix = build_fitness_matrix(tasarim_kodlari, calisanlar, mc_results)
+        best_team, best_fitness = genetic_algorithm_array(
+            task_id, fitness_matrix, is_kritik=is_kritik, pop_size=pop_size,
+            generations=generations, mutation_rate=mutation_rate, rng=rng,
+            initial_team=initial_team, patience=patience
+        )
+        print(f"'{task_id}' için en iyi takım uygunluğu: {best_fitness:.2f}")
+        return best_team
+    elif engine != "dict":
+        raise ValueError(f"Geçersiz GA motoru: {engine}")
     
     # 1. Başlangıç popülasyonu
     population = create_initial_population(task_id, tasarim_kodlari, calisanlar, pop_size)
+    if initial_team:
+        # Önceki en iyi takım ve mutasyonlu kopyalarıyla popülasyonun yarısını tohumla
+        n_warm = max(1, pop_size // 2)
+        population[0] = {seviye: list(isimler) for seviye, isimler in initial_team.items()}
+        for i in range(1, min(n_warm, len(population))):
+            population[i] = mutate({seviye: list(isimler) for seviye, isimler in initial_team.items()}, calisanlar)
     best_overall_fitness = -1
     best_overall_individual = None
+    iyilesmeyen_nesil = 0
 
     # 2. Nesiller boyu evrim
     for gen in range(generations):
         # Uygunluk hesapla
-        fitness_scores = [calculate_team_fitness(ind, task_id, tasarim_kodlari, calisanlar, mc_results, is_kritik) for ind in population]
+        if fitness_matrix is not None:
+            fitness_scores = score_population(
+                fitness_matrix, task_id, encode_population(fitness_matrix, task_id, population), is_kritik
+            ).tolist()
+        else:
+            fitness_scores = [calculate_team_fitness(ind, task_id, tasarim_kodlari, calisanlar, mc_results, is_kritik) for ind in population]
 
         # En iyi bireyi takip et
         best_gen_fitness = max(fitness_scores)
         if best_gen_fitness > best_overall_fitness:
             best_overall_fitness = best_gen_fitness
             best_overall_individual = population[np.argmax(fitness_scores)]
+            iyilesmeyen_nesil = 0
+        else:
+            iyilesmeyen_nesil += 1
+            if patience is not None and iyilesmeyen_nesil >= patience:
+                print(f"'{task_id}' için {gen + 1}. nesilde erken durduruldu.")
+                break
 
         # Ebeveyn seçimi
         parents = select_parents(population, fitness_scores, pop_size)
@@ -332,34 +550,198 @@ def genetic_algorithm_for_task(task_id, tasarim_kodlari, calisanlar, mc_results,
     print(f"'{task_id}' için en iyi takım uygunluğu: {best_overall_fitness:.2f}")
     return best_overall_individual
 
-def main():
+# Alt süreçlerde görevler arasında paylaşılan, süreç başına bir kez aktarılan veriler
+_WORKER_STATE = {}
+
+def _init_ga_worker(tasarim_kodlari, calisanlar, mc_results, fitness_matrix):
+    """Süreç havuzundaki her alt süreç için GA girdilerini bir kez yükler."""
+    _WORKER_STATE.update(
+        tasarim_kodlari=tasarim_kodlari,
+        calisanlar=calisanlar,
+        mc_results=mc_results,
+        fitness_matrix=fitness_matrix,
+    )
+
+def _run_ga_job(task, is_kritik, seed_seq, engine, initial_team=None, patience=None):
+    """Tek bir (görev, senaryo) GA çalıştırmasını kendi RNG tohumuyla yürütür."""
+    rng = np.random.default_rng(seed_seq)
+    if engine == "dict":
+        random.seed(int(rng.integers(2**32)))
+    best_team = genetic_algorithm_for_task(
+        task, _WORKER_STATE["tasarim_kodlari"], _WORKER_STATE["calisanlar"], _WORKER_STATE["mc_results"],
+        is_kritik=is_kritik, fitness_matrix=_WORKER_STATE["fitness_matrix"], engine=engine, rng=rng,
+        initial_team=initial_team, patience=patience
+    )
+    return task, is_kritik, best_team
+
+def load_previous_results():
+    """
+    Kayıtlı GenetikSonuc/GenetikAtama satırlarını tek sorguda okur.
+
+    Dönüş: {(görev, is_kritik): {"atanan": {seviye: [isim, ...]}, "uygunluk": {isim: uygunluk_orani}}}
+    """
+    onceki = {}
+    satirlar = GenetikAtama.objects.filter(calisan__isnull=False).values_list(
+        'sonuc__tasarim__kod', 'sonuc__senaryo', 'calisan__ad_soyad', 'seviye', 'atanma_tipi', 'uygunluk_orani'
+    )
+    for kod, senaryo, isim, seviye, atanma_tipi, uygunluk in satirlar:
+        kayit = onceki.setdefault((kod, senaryo == "kritik"), {"atanan": {}, "uygunluk": {}})
+        kayit["uygunluk"][isim] = uygunluk
+        if atanma_tipi == "atanan":
+            kayit["atanan"].setdefault(seviye, []).append(isim)
+    return onceki
+
+def warm_start_team(onceki_kayit, fitness_matrix, task_id, is_kritik, tolerans=1.0):
+    """
+    Girdiler neredeyse değişmemişse önceki en iyi takımı, aksi halde None döndürür.
+
+    Önceki sonuç tüm güncel çalışanları kapsamalı, takım güncel personel ihtiyacına uymalı ve kayıtlı
+    uygunluk oranları güncel matristen ortalama en fazla 'tolerans' puan sapmalıdır.
+    """
+    if not onceki_kayit or not onceki_kayit["atanan"]:
+        return None
+    uygunluk = onceki_kayit["uygunluk"]
+    if set(uygunluk) != set(fitness_matrix["workers"]):
+        return None
+
+    ihtiyac = fitness_matrix["ihtiyac"][fitness_matrix["task_index"][task_id]]
+    for s_idx, (seviye_str, seviye_int) in enumerate(SEVIYELER):
+        isimler = onceki_kayit["atanan"].get(seviye_str, [])
+        if len(isimler) > ihtiyac[s_idx]:
+            return None
+        if any(fitness_matrix["seviye"][fitness_matrix["worker_index"][i]] != seviye_int for i in isimler):
+            return None
+
+    isimler = list(uygunluk)
+    kayitli = np.array([uygunluk[i] if uygunluk[i] is not None else np.nan for i in isimler], dtype=float)
+    guncel = fitness_matrix["fitness"][
+        senaryo_index(is_kritik), fitness_matrix["task_index"][task_id],
+        [fitness_matrix["worker_index"][i] for i in isimler]
+    ]
+    if np.isnan(kayitli).any() or np.mean(np.abs(kayitli - guncel)) > tolerans:
+        return None
+    return onceki_kayit["atanan"]
+
+def run_ga_jobs(jobs, tasarim_kodlari, calisanlar, mc_results, fitness_matrix, engine="array",
+                max_workers=1, seed=None, initial_teams=None, patience=None):
+    """
+    (görev, is_kritik) çiftleri için GA'yı çalıştırır ve {(görev, is_kritik): en iyi takım} döndürür.
+
+    max_workers > 1 ise çalıştırmalar bir ProcessPoolExecutor'a dağıtılır. Her iş SeedSequence'tan
+    türetilen kendi tohumunu aldığından sonuçlar süreç sayısından ve zamanlamadan bağımsızdır.
+    initial_teams, işe göre warm-start takımlarını içerir.
+    """
+    seed_seqs = np.random.SeedSequence(seed).spawn(len(jobs))
+    state = (tasarim_kodlari, calisanlar, mc_results, fitness_matrix)
+    initial_teams = initial_teams or {}
+
+    if max_workers > 1 and len(jobs) > 1:
+        # fork ile alt süreçler Django kurulumunu ve yüklenmiş modülleri devralır
+        methods = multiprocessing.get_all_start_methods()
+        mp_context = multiprocessing.get_context("fork") if "fork" in methods else None
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                                     initializer=_init_ga_worker, initargs=state) as executor:
+                futures = [
+                    executor.submit(
+                        _run_ga_job, task, is_kritik, seed_seq, engine,
+                        initial_teams.get((task, is_kritik)), patience
+                    )
+                    for (task, is_kritik), seed_seq in zip(jobs, seed_seqs)
+                ]
+                return {(task, is_kritik): team for task, is_kritik, team in (f.result() for f in futures)}
+        except (AssertionError, OSError, BrokenProcessPool) as e:
+            # Ör. Celery prefork alt süreçleri (daemon) yeni süreç başlatamaz
+            print(f"Paralel GA başlatılamadı, sıralı çalıştırılıyor: {str(e)}")
+
+    _init_ga_worker(*state)
+    results = {}
+    for (task, is_kritik), seed_seq in zip(jobs, seed_seqs):
+        task, is_kritik, best_team = _run_ga_job(
+            task, is_kritik, seed_seq, engine, initial_teams.get((task, is_kritik)), patience
+        )
+        results[(task, is_kritik)] = best_team
+    return results
+
+def gorev_parmak_izleri(fitness_matrix):
+    """Her görev için GA girdilerinin (aday havuzu, personel ihtiyacı ve uygunluk satırı) parmak izini hesaplar."""
+    ortak = hesapla_parmak_izi([fitness_matrix["workers"], fitness_matrix["seviye"].tobytes()])
+    return {
+        task: hesapla_parmak_izi([
+            ortak,
+            fitness_matrix["ihtiyac"][t_idx].tobytes(),
+            np.ascontiguousarray(fitness_matrix["fitness"][:, t_idx]).tobytes(),
+        ])
+        for task, t_idx in fitness_matrix["task_index"].items()
+    }
+
+def main(engine="array", max_workers=None, seed=None, warm_start=True, patience=None, force=False,
+         hata_firlat=False):
+    """
+    Tüm görevler ve senaryolar için GA'yı çalıştırır ve sonuçları toplu olarak kaydeder.
+
+    max_workers verilmezse settings.GA_MAX_WORKERS (varsayılan 1, yani sıralı) kullanılır.
+    warm_start açıkken girdileri neredeyse değişmemiş görevler önceki GenetikSonuc ile tohumlanır
+    (sapma eşiği settings.GA_WARM_START_TOLERANS, varsayılan 1.0 puan). patience verilmezse
+    settings.GA_PATIENCE (varsayılan 20 nesil) kullanılır.
+    Girdi parmak izi değişmeyen görevler atlanır; force=True hepsini yeniden çalıştırır.
+    hata_firlat=True ise veri yükleme ve kayıt hataları yeniden fırlatılır (optimizasyon hattı
+    değişiklik kuyruğunu onaylamadan durur).
+    """
     print("Genetik Algoritma Optimizasyonu Başlatılıyor...")
-    tasarim_kodlari, calisanlar = load_dataset()
-    mc_results = load_monte_carlo_results()
+    tasarim_kodlari, calisanlar = load_dataset(hata_firlat=hata_firlat)
+    mc_results = load_monte_carlo_results(hata_firlat=hata_firlat)
 
     if not tasarim_kodlari or not calisanlar or not mc_results:
         print("Veri yüklenemedi, işlem durduruluyor.")
         return
 
+    if max_workers is None:
+        max_workers = getattr(settings, "GA_MAX_WORKERS", 1)
+    if patience is None:
+        patience = getattr(settings, "GA_PATIENCE", 20)
+
     all_tasks = list(tasarim_kodlari.keys())
 
-    for senaryo in ["normal", "kritik"]:
-        is_kritik_senaryo = (senaryo == "kritik")
-        print(f"\n--- {senaryo.upper()} SENARYOSU İŞLENİYOR ---")
-        
-        for task in all_tasks:
-            # Her görev için en iyi takımı bul
-            best_team = genetic_algorithm_for_task(
-                task, tasarim_kodlari, calisanlar, mc_results, is_kritik=is_kritik_senaryo
-            )
-            
-            if best_team:
-                # Sonuçları kaydet (atananlar + tüm alternatifler)
-                save_genetic_results(
-                    task, best_team, tasarim_kodlari, calisanlar, mc_results, is_kritik=is_kritik_senaryo
-                )
-            else:
-                print(f"'{task}' için uygun takım bulunamadı.")
+    # Uygunluk matrisi tüm görevler ve senaryolar için bir kez hesaplanır
+    fitness_matrix = build_fitness_matrix(tasarim_kodlari, calisanlar, mc_results)
+
+    # Yalnızca girdileri değişen görevleri çalıştır
+    guncel_parmak_izleri = gorev_parmak_izleri(fitness_matrix)
+    degisen, _ = degisen_anahtarlar(guncel_parmak_izleri, load_fingerprints("genetik"))
+    jobs = [
+        (task, senaryo == "kritik") for senaryo in SENARYOLAR for task in all_tasks
+        if force or task in degisen
+    ]
+    if not jobs:
+        print("GA girdileri değişmedi, önceki sonuçlar kullanılıyor.")
+        return
+
+    initial_teams = {}
+    if warm_start:
+        onceki = load_previous_results()
+        tolerans = getattr(settings, "GA_WARM_START_TOLERANS", 1.0)
+        for task, is_kritik in jobs:
+            team = warm_start_team(onceki.get((task, is_kritik)), fitness_matrix, task, is_kritik, tolerans)
+            if team:
+                initial_teams[(task, is_kritik)] = team
+        print(f"{len(initial_teams)}/{len(jobs)} GA çalıştırması önceki sonuçtan başlatılacak.")
+
+    print(f"{len(jobs)} GA çalıştırması {max_workers} süreç ile yürütülecek.")
+    best_teams = run_ga_jobs(
+        jobs, tasarim_kodlari, calisanlar, mc_results, fitness_matrix,
+        engine=engine, max_workers=max_workers, seed=seed,
+        initial_teams=initial_teams, patience=patience
+    )
+
+    # Tüm en iyi takımları tek bir işlemde kaydet (atananlar + tüm alternatifler)
+    for task, is_kritik in jobs:
+        if not best_teams.get((task, is_kritik)):
+            print(f"'{task}' için uygun takım bulunamadı.")
+    kaydedilecek = {job: team for job, team in best_teams.items() if team}
+    with transaction.atomic():
+        if save_all_genetic_results(kaydedilecek, fitness_matrix, calisanlar, hata_firlat=hata_firlat):
+            save_fingerprints("genetik", guncel_parmak_izleri)
 
     print("\nGenetik Algoritma Optimizasyonu Tamamlandı.")
 
@@ -2,184 +2,461 @@ import json
 import os
 import numpy as np
 from typing import Dict, List
-import matplotlib.pyplot as plt
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from ..models import Calisan, TasarimKodu, GecmisPerformansVerisi, MonteCarloSonuc, MonteCarloTasarimSonuc
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from channels.layers import get_channel_layer
+from .fingerprint import (
+    gruplu_parmak_izleri, hesapla_parmak_izi, load_fingerprints, save_fingerprints, update_fingerprints,
+    degisen_anahtarlar
+)
 from asgiref.sync import async_to_sync
 
 # Ana dizin yolunu belirle
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
-def performans_verilerini_oku() -> Dict:
-    """Geçmiş performans verilerini Django modellerinden okur."""
+def performans_verilerini_oku(hata_firlat=False) -> Dict:
+    """
+    Geçmiş performans verilerini Django modellerinden okur.
+
+    Tüm satırlar çalışan adıyla birleştirilmiş tek bir sorguda (tasarım kodu, proje indeksi) sırasıyla
+    çekilir ve her kodun proje tabloları tek geçişte oluşturulur. Çalışanı silinmiş satırlar atlanır.
+    Okuma hata verirse None döndürülür; hata_firlat=True ise hata yeniden fırlatılır.
+    """
     try:
         veriler = {}
-        for tasarim in TasarimKodu.objects.all():
-            veriler[tasarim.kod] = []
-            performans_verileri = GecmisPerformansVerisi.objects.filter(tasarim=tasarim)
-            
-            # Proje indekslerine göre grupla
-            for proje_index in set(pv.proje_index for pv in performans_verileri):
-                proje = {}
-                for pv in performans_verileri.filter(proje_index=proje_index):
-                    proje[pv.calisan.ad_soyad] = pv.verimlilik_puani
-                veriler[tasarim.kod].append(proje)
-                
+        satirlar = GecmisPerformansVerisi.objects.filter(calisan__isnull=False).order_by(
+            'tasarim__kod', 'proje_index', 'id'
+        ).values_list('tasarim__kod', 'proje_index', 'calisan__ad_soyad', 'verimlilik_puani')
+
+        # Proje indekslerine göre grupla
+        for (kod, _), proje_satirlari in groupby(satirlar.iterator(chunk_size=5000), key=itemgetter(0, 1)):
+            veriler.setdefault(kod, []).append({ad_soyad: puan for _, _, ad_soyad, puan in proje_satirlari})
+
         return veriler
     except Exception as e:
         print(f"Performans verileri okunamadı: {str(e)}")
+        if hata_firlat:
+            raise
         return None
 
-def calisan_performans_dagilimi(veriler: Dict, calisan: str) -> Dict[str, Dict]:
-    """Her tasarım kodu için çalışanın performans dağılımını ve trendini hesaplar."""
-    dagilimlar = {}
-    for tasarim_kodu in veriler:
-        performanslar = [proje[calisan] for proje in veriler[tasarim_kodu] if calisan in proje]
-        if not performanslar:
-            continue
+def performans_indeksi(veriler: Dict) -> Dict[str, Dict[str, List[float]]]:
+    """Proje tablolarını bir kez tarayıp {çalışan: {tasarım kodu: zaman sıralı puanlar}} indeksine çevirir."""
+    indeks = {}
+    for tasarim_kodu, projeler in veriler.items():
+        for proje in projeler:
+            for calisan, puan in proje.items():
+                indeks.setdefault(calisan, {}).setdefault(tasarim_kodu, []).append(puan)
+    return indeks
 
-        # Son 25 iş ve önceki işleri ayır
-        if len(performanslar) > 25:
-            son_25_is = performanslar[-25:]
-            onceki_isler = performanslar[:-25]
-        else:
-            son_25_is = performanslar
-            onceki_isler = []
-
-        # Ağırlıklı ortalama hesapla: %40 son 25 iş, %60 önceki işler
-        if onceki_isler:
-            son_25_ortalama = np.mean(son_25_is) if son_25_is else 0
-            onceki_ortalama = np.mean(onceki_isler) if onceki_isler else 0
-            agirlikli_performans = (son_25_ortalama * 0.4) + (onceki_ortalama * 0.6)
-        else:
-            agirlikli_performans = np.mean(son_25_is) if son_25_is else 0
-
-        # Trend analizi (son projelerdeki değişim)
-        trend = 0
-        if len(performanslar) > 1:
-            trend = np.polyfit(range(len(performanslar)), performanslar, 1)[0]
-
-        dagilimlar[tasarim_kodu] = {
-            'performanslar': performanslar,
-            'agirlikli_performans': float(agirlikli_performans),
-            'trend': float(trend),
-            'varyans': float(np.var(performanslar))
+def toplu_performans_dagilimi(veriler: Dict, calisan_listesi: List[str]) -> Dict[str, Dict[str, Dict]]:
+    """
+    Tüm (çalışan, tasarım kodu) çiftleri için performans dağılımını ve trendini toplu olarak hesaplar.
+
+    Çiftlerin puan dizileri tek bir düz dizide art arda tutulur; ağırlıklı ortalama (%40 son 25 iş,
+    %60 önceki işler), varyans ve doğrusal trend (kapalı form en küçük kareler, np.polyfit eğimiyle aynı)
+    bölüt toplamlarıyla tek seferde çıkarılır.
+    """
+    indeks = performans_indeksi(veriler)
+    ciftler = [(c, kod) for c in calisan_listesi for kod in indeks.get(c, {})]
+    if not ciftler:
+        return {}
+
+    diziler = [indeks[c][kod] for c, kod in ciftler]
+    n = np.array([len(d) for d in diziler])
+    baslangic = np.concatenate(([0], np.cumsum(n)[:-1]))
+    y = np.concatenate(diziler).astype(float)
+    n_tekrar = np.repeat(n, n)
+    x = np.arange(len(y)) - np.repeat(baslangic, n)
+
+    def bolut_toplami(degerler):
+        return np.add.reduceat(degerler, baslangic)
+
+    ortalama = bolut_toplami(y) / n
+    sapma = y - np.repeat(ortalama, n)
+    varyans = bolut_toplami(sapma ** 2) / n
+
+    # Son 25 iş ve önceki işleri ayır
+    son_25 = (n_tekrar - 1 - x) < 25
+    son_25_sayisi = np.minimum(n, 25)
+    onceki_sayisi = n - son_25_sayisi
+    son_25_ortalama = bolut_toplami(np.where(son_25, y, 0.0)) / son_25_sayisi
+    onceki_ortalama = bolut_toplami(np.where(son_25, 0.0, y)) / np.maximum(onceki_sayisi, 1)
+    agirlikli_performans = np.where(onceki_sayisi > 0, son_25_ortalama * 0.4 + onceki_ortalama * 0.6, ortalama)
+
+    # Trend analizi: eğim = Σ(x - x̄)(y - ȳ) / Σ(x - x̄)²
+    x_sapma = x - np.repeat((n - 1) / 2, n)
+    sxx = n * (n ** 2 - 1) / 12
+    trend = np.where(n > 1, bolut_toplami(x_sapma * sapma) / np.where(n > 1, sxx, 1), 0.0)
+
+    dagilimlar = {}
+    for i, (calisan, tasarim_kodu) in enumerate(ciftler):
+        dagilimlar.setdefault(calisan, {})[tasarim_kodu] = {
+            'performanslar': diziler[i],
+            'agirlikli_performans': float(agirlikli_performans[i]),
+            'trend': float(trend[i]),
+            'varyans': float(varyans[i])
         }
     return dagilimlar
 
-def monte_carlo_simulasyonu(veriler: Dict, calisan_listesi: List[str], iterasyon_sayisi: int = 10000) -> Dict:
-    """Monte Carlo simülasyonu yaparak gelecek performans tahminlerini üretir."""
+def calisan_performans_dagilimi(veriler: Dict, calisan: str) -> Dict[str, Dict]:
+    """Her tasarım kodu için çalışanın performans dağılımını ve trendini hesaplar."""
+    return toplu_performans_dagilimi(veriler, [calisan]).get(calisan, {})
+
+# Toplu simülasyonda bir parçada tutulacak en fazla örnek sayısı (~32 MB float64)
+MAKS_PARCA_ELEMANI = 4_000_000
+
+def _yuzdelik(sirali, n_gecerli, q):
+    """Satır başına ilk n_gecerli elemanı sıralı bir dizide numpy 'linear' yöntemiyle yüzdelik hesaplar."""
+    pozisyon = q * (n_gecerli - 1)
+    alt = np.floor(pozisyon).astype(int)
+    ust = np.minimum(alt + 1, n_gecerli - 1)
+    satirlar = np.arange(len(sirali))
+    return sirali[satirlar, alt] + (sirali[satirlar, ust] - sirali[satirlar, alt]) * (pozisyon - alt)
+
+def toplu_simulasyon(loc: np.ndarray, scale: np.ndarray, maske: np.ndarray, iterasyon_sayisi: int,
+                     rng: np.random.Generator, maks_eleman: int = MAKS_PARCA_ELEMANI) -> Dict[str, np.ndarray]:
+    """
+    (çalışan x tasarım kodu) parametre dizileri için tüm simülasyonu toplu olarak çalıştırır.
+
+    loc/scale/maske (W, K) boyutludur; maske, çalışanın o sütunda geçmiş verisi olup olmadığını gösterir.
+    Örnekler çalışan parçaları halinde (W_parca, K, iterasyon) dizisi olarak çekilir ve tüm istatistikler
+    eksen indirgemeleriyle hesaplanır. Tasarım bazlı sonuçlar (W, K), çalışan bazlı sonuçlar (W,) döner.
+    """
+    W, K = loc.shape
+    k = maske.sum(axis=1)
+    sonuc = {ad: np.zeros((W, K)) for ad in ('kod_ortalama', 'kod_risk', 'kod_gecikme')}
+    sonuc.update({ad: np.zeros(W) for ad in ('ortalama', 'risk', 'gecikme', 'varyans', 'min', 'max', 'q25', 'q75')})
+
+    parca = max(1, maks_eleman // max(1, K * iterasyon_sayisi))
+    for bas in range(0, W, parca):
+        r = slice(bas, min(bas + parca, W))
+        m, kk = maske[r], k[r]
+        sim = rng.normal(loc[r, :, None], scale[r, :, None], size=(len(kk), K, iterasyon_sayisi))
+        np.clip(sim, 0, 1, out=sim)
+
+        # Tasarım kodu bazlı sonuçlar
+        kod_ortalama = sim.mean(axis=2)
+        sonuc['kod_ortalama'][r] = kod_ortalama
+        sonuc['kod_risk'][r] = (sim < 0.5).mean(axis=2)
+        sonuc['kod_gecikme'][r] = (sim < 0.3).mean(axis=2)
+
+        # Çalışan bazlı sonuçlar (her kodda aynı sayıda örnek olduğundan kod ortalamalarının ortalaması)
+        ortalama = (kod_ortalama * m).sum(axis=1) / kk
+        sonuc['ortalama'][r] = ortalama
+        sonuc['risk'][r] = (sonuc['kod_risk'][r] * m).sum(axis=1) / kk
+        sonuc['gecikme'][r] = (sonuc['kod_gecikme'][r] * m).sum(axis=1) / kk
+        sonuc['varyans'][r] = (((sim - ortalama[:, None, None]) ** 2).mean(axis=2) * m).sum(axis=1) / kk
+
+        # Min/max ve çeyrekler için geçersiz sütunlar +inf ile doldurulup sıralanır
+        gecerli = np.where(m[:, :, None], sim, np.inf).reshape(len(kk), -1)
+        gecerli.sort(axis=1)
+        n_gecerli = kk * iterasyon_sayisi
+        satirlar = np.arange(len(kk))
+        sonuc['min'][r] = gecerli[:, 0]
+        sonuc['max'][r] = gecerli[satirlar, n_gecerli - 1]
+        sonuc['q25'][r] = _yuzdelik(gecerli, n_gecerli, 0.25)
+        sonuc['q75'][r] = _yuzdelik(gecerli, n_gecerli, 0.75)
+
+    return sonuc
+
+# Akan modda bir iterasyon parçasının boyu ve çeyrek taslağının kutu sayısı
+AKAN_PARCA_BOYU = 10_000
+TASLAK_KUTU_SAYISI = 4096
+
+def _taslak_yuzdelik(histogram, n, q):
+    """[0, 1] aralığındaki eşit genişlikli kutu sayımlarından satır başına yüzdelik tahmini yapar."""
+    kutu_sayisi = histogram.shape[1]
+    birikimli = np.cumsum(histogram, axis=1)
+    sira = q * (n - 1)
+    kutu = np.minimum((birikimli <= sira[:, None]).sum(axis=1), kutu_sayisi - 1)
+    satirlar = np.arange(len(histogram))
+    onceki = birikimli[satirlar, kutu] - histogram[satirlar, kutu]
+    # Kutu içinde doğrusal dağılım varsayımıyla ara değer bul
+    oran = (sira - onceki + 0.5) / np.maximum(histogram[satirlar, kutu], 1)
+    return np.clip((kutu + np.clip(oran, 0, 1)) / kutu_sayisi, 0, 1)
+
+def akan_simulasyon(loc: np.ndarray, scale: np.ndarray, maske: np.ndarray, iterasyon_sayisi: int,
+                    rng: np.random.Generator, maks_eleman: int = MAKS_PARCA_ELEMANI,
+                    parca_boyu: int = AKAN_PARCA_BOYU, kutu_sayisi: int = TASLAK_KUTU_SAYISI) -> Dict[str, np.ndarray]:
+    """
+    toplu_simulasyon ile aynı sonuçları sabit bellekle üreten akan (online) istatistik modu.
+
+    Örnekler sabit boyutlu iterasyon parçaları halinde çekilir; ortalama/varyans birleştirilebilir anlarla
+    (Chan yöntemi), risk ve gecikme eşik sayaçlarıyla, min/max ve çeyrekler ise [0, 1] aralığında sabit
+    kutulu bir histogram taslağıyla güncellenir. Bellek kullanımı iterasyon_sayisi'ndan bağımsızdır;
+    çeyreklerin hatası en fazla 1 / kutu_sayisi kadardır.
+    """
+    W, K = loc.shape
+    k = maske.sum(axis=1)
+    sonuc = {ad: np.zeros((W, K)) for ad in ('kod_ortalama', 'kod_risk', 'kod_gecikme')}
+    sonuc.update({ad: np.zeros(W) for ad in ('ortalama', 'risk', 'gecikme', 'varyans', 'min', 'max', 'q25', 'q75')})
+
+    parca_boyu = max(1, min(parca_boyu, iterasyon_sayisi))
+    parca = max(1, maks_eleman // max(1, K * parca_boyu))
+    for bas in range(0, W, parca):
+        r = slice(bas, min(bas + parca, W))
+        m, kk = maske[r], k[r]
+        Wp = len(kk)
+        m3 = m[:, :, None]
+
+        kod_toplam = np.zeros((Wp, K))
+        kod_risk = np.zeros((Wp, K))
+        kod_gecikme = np.zeros((Wp, K))
+        n = np.zeros(Wp)
+        ortalama = np.zeros(Wp)
+        m2 = np.zeros(Wp)
+        en_kucuk = np.full(Wp, np.inf)
+        en_buyuk = np.full(Wp, -np.inf)
+        histogram = np.zeros((Wp, kutu_sayisi), dtype=np.int64)
+        kutu_kaydirma = (np.arange(Wp) * kutu_sayisi)[:, None, None]
+
+        for it_bas in range(0, iterasyon_sayisi, parca_boyu):
+            boy = min(parca_boyu, iterasyon_sayisi - it_bas)
+            sim = rng.normal(loc[r, :, None], scale[r, :, None], size=(Wp, K, boy))
+            np.clip(sim, 0, 1, out=sim)
+
+            # Eşik sayaçları ve kod toplamları
+            kod_toplam += sim.sum(axis=2)
+            kod_risk += (sim < 0.5).sum(axis=2)
+            kod_gecikme += (sim < 0.3).sum(axis=2)
+
+            # Parça anlarını çalışan bazında birleştir
+            n_b = kk * boy
+            ortalama_b = np.where(m3, sim, 0).sum(axis=(1, 2)) / n_b
+            m2_b = np.where(m3, (sim - ortalama_b[:, None, None]) ** 2, 0).sum(axis=(1, 2))
+            n_yeni = n + n_b
+            fark = ortalama_b - ortalama
+            ortalama = ortalama + fark * n_b / n_yeni
+            m2 = m2 + m2_b + fark ** 2 * n * n_b / n_yeni
+            n = n_yeni
+
+            en_kucuk = np.minimum(en_kucuk, np.where(m3, sim, np.inf).min(axis=(1, 2)))
+            en_buyuk = np.maximum(en_buyuk, np.where(m3, sim, -np.inf).max(axis=(1, 2)))
+
+            # Çeyrek taslağı: her çalışanın kutuları tek bir bincount ile güncellenir
+            kutular = np.minimum((sim * kutu_sayisi).astype(np.int64), kutu_sayisi - 1) + kutu_kaydirma
+            histogram += np.bincount(
+                kutular[np.broadcast_to(m3, sim.shape)], minlength=Wp * kutu_sayisi
+            ).reshape(Wp, kutu_sayisi)
+
+        sonuc['kod_ortalama'][r] = kod_toplam / iterasyon_sayisi
+        sonuc['kod_risk'][r] = kod_risk / iterasyon_sayisi
+        sonuc['kod_gecikme'][r] = kod_gecikme / iterasyon_sayisi
+        sonuc['ortalama'][r] = ortalama
+        sonuc['risk'][r] = (sonuc['kod_risk'][r] * m).sum(axis=1) / kk
+        sonuc['gecikme'][r] = (sonuc['kod_gecikme'][r] * m).sum(axis=1) / kk
+        sonuc['varyans'][r] = m2 / n
+        sonuc['min'][r] = en_kucuk
+        sonuc['max'][r] = en_buyuk
+        sonuc['q25'][r] = np.clip(_taslak_yuzdelik(histogram, n, 0.25), en_kucuk, en_buyuk)
+        sonuc['q75'][r] = np.clip(_taslak_yuzdelik(histogram, n, 0.75), en_kucuk, en_buyuk)
+
+    return sonuc
+
+def monte_carlo_simulasyonu(veriler: Dict, calisan_listesi: List[str], iterasyon_sayisi: int = 10000,
+                            rng: np.random.Generator = None, akan: bool = None) -> Dict:
+    """
+    Monte Carlo simülasyonu yaparak gelecek performans tahminlerini üretir.
+
+    Tüm çalışan ve tasarım kodu çiftleri tek bir toplu motorda simüle edilir. akan=True sabit bellekli
+    akan_simulasyon modunu, akan=False tüm örnekleri tutan toplu_simulasyon modunu seçer; None ise
+    tek bir çalışanın örnekleri bir parçaya sığmadığında akan moda geçer.
+    Geçmiş verisi olmayan çalışanlar için tahmin üretilmez.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
     sonuclar = {
         'calisanlar': {},
         'simulasyon_zamani': datetime.now()
     }
-    
-    for calisan in calisan_listesi:
-        performans_dagilimi = calisan_performans_dagilimi(veriler, calisan)
-        
-        # Her tasarım kodu için ayrı simülasyon yap
-        tasarim_sonuclari = {}
-        tum_performanslar = []
-        
-        for tasarim_kodu, dagilim in performans_dagilimi.items():
-            # Performans dağılımını ve trendi kullanarak simülasyon
-            temel_performans = dagilim['agirlikli_performans']
-            trend = dagilim['trend']
-            varyans = max(0.01, dagilim['varyans'])  # Minimum varyans garantisi
-            
-            # Trend ve varyansı kullanarak simülasyon
-            simulasyon = np.random.normal(
-                loc=temel_performans + trend,
-                scale=np.sqrt(varyans),
-                size=iterasyon_sayisi
-            )
-            
-            # Değerleri 0-1 aralığına sınırla
-            simulasyon = np.clip(simulasyon, 0, 1)
-            
-            tasarim_sonuclari[tasarim_kodu] = {
-                'ortalama': float(np.mean(simulasyon)),
-                'risk_skoru': float(len(simulasyon[simulasyon < 0.5]) / len(simulasyon)),
-                'gecikme_olasiligi': float(len(simulasyon[simulasyon < 0.3]) / len(simulasyon))
-            }
-            
-            tum_performanslar.extend(simulasyon)
-        
-        # Genel performans metrikleri
-        ortalama_performans = np.mean(tum_performanslar)
-        risk_skoru = len([p for p in tum_performanslar if p < 0.5]) / len(tum_performanslar)
-        gecikme_olasiligi = len([p for p in tum_performanslar if p < 0.3]) / len(tum_performanslar)
-        
+
+    # Her çalışan için performans dağılımı ve trendden simülasyon parametrelerini çıkar
+    dagilimlar = toplu_performans_dagilimi(veriler, calisan_listesi)
+    if not dagilimlar:
+        return sonuclar
+
+    calisanlar = list(dagilimlar.keys())
+    K = max(len(d) for d in dagilimlar.values())
+    loc = np.zeros((len(calisanlar), K))
+    scale = np.ones((len(calisanlar), K))
+    maske = np.zeros((len(calisanlar), K), dtype=bool)
+    kodlar = []
+    for i, calisan in enumerate(calisanlar):
+        kodlar.append(list(dagilimlar[calisan].keys()))
+        for j, dagilim in enumerate(dagilimlar[calisan].values()):
+            # Trend ve varyansı kullanarak simülasyon (minimum varyans garantisi)
+            loc[i, j] = dagilim['agirlikli_performans'] + dagilim['trend']
+            scale[i, j] = np.sqrt(max(0.01, dagilim['varyans']))
+            maske[i, j] = True
+
+    if akan is None:
+        akan = K * iterasyon_sayisi > MAKS_PARCA_ELEMANI
+    motor = akan_simulasyon if akan else toplu_simulasyon
+    s = motor(loc, scale, maske, iterasyon_sayisi, rng)
+
+    for i, calisan in enumerate(calisanlar):
+        tasarim_sonuclari = {
+            kod: {
+                'ortalama': float(s['kod_ortalama'][i, j]),
+                'risk_skoru': float(s['kod_risk'][i, j]),
+                'gecikme_olasiligi': float(s['kod_gecikme'][i, j])
+            } for j, kod in enumerate(kodlar[i])
+        }
+
         # Performans kararlılığı (düşük varyans = yüksek kararlılık)
-        performans_kararliligi = 1 - min(1, np.var(tum_performanslar) * 2)
-        
+        performans_kararliligi = 1 - min(1, s['varyans'][i] * 2)
+
         sonuclar['calisanlar'][calisan] = {
-            'ortalama_performans': float(ortalama_performans),
-            'risk_skoru': float(risk_skoru),
-            'gecikme_olasiligi': float(gecikme_olasiligi),
+            'ortalama_performans': float(s['ortalama'][i]),
+            'risk_skoru': float(s['risk'][i]),
+            'gecikme_olasiligi': float(s['gecikme'][i]),
             'performans_kararliligi': float(performans_kararliligi),
             'tasarim_bazli_sonuclar': tasarim_sonuclari,
             'performans_dagilimi': {
-                'min': float(np.min(tum_performanslar)),
-                'max': float(np.max(tum_performanslar)),
-                'std': float(np.std(tum_performanslar)),
-                'q25': float(np.percentile(tum_performanslar, 25)),
-                'q75': float(np.percentile(tum_performanslar, 75))
+                'min': float(s['min'][i]),
+                'max': float(s['max'][i]),
+                'std': float(np.sqrt(s['varyans'][i])),
+                'q25': float(s['q25'][i]),
+                'q75': float(s['q75'][i])
             }
         }
     
     return sonuclar
 
-def simulasyon_calistir():
-    """Ana simülasyon fonksiyonu."""
+def calisan_parmak_izleri(calisan_idler=None) -> Dict[str, str]:
+    """
+    Her çalışan için simülasyon girdilerinin (ad ve geçmiş performans satırları) parmak izini hesaplar.
+
+    calisan_idler verilirse yalnızca bu çalışanlar okunur.
+    """
+    calisanlar = Calisan.objects.all()
+    satirlar = GecmisPerformansVerisi.objects.filter(calisan__isnull=False)
+    if calisan_idler is not None:
+        calisanlar = calisanlar.filter(id__in=calisan_idler)
+        satirlar = satirlar.filter(calisan_id__in=calisan_idler)
+    satirlar = satirlar.order_by('calisan_id', 'tasarim__kod', 'proje_index', 'id').values_list(
+        'calisan_id', 'tasarim__kod', 'proje_index', 'verimlilik_puani'
+    )
+    gecmis = gruplu_parmak_izleri((satir[0], satir[1:]) for satir in satirlar)
+    return {
+        str(calisan_id): hesapla_parmak_izi([ad_soyad, gecmis.get(str(calisan_id))])
+        for calisan_id, ad_soyad in calisanlar.values_list('id', 'ad_soyad')
+    }
+
+# bulk_create için parti boyutu
+KAYIT_PARTI_BOYU = 1000
+
+@transaction.atomic
+def simulasyon_sonuclarini_kaydet(sonuclar: Dict, calisan_idler: List[int]):
+    """
+    Simülasyon sonuçlarını tek bir atomik işlemde kaydeder.
+
+    Verilen çalışanların ve çalışanı silinmiş satırların eski sonuçları silinip yenileri bulk_create ile
+    partiler halinde yazılır. Çalışan ve tasarım kimlikleri önceden yüklenen ad→id eşlemelerinden çözülür.
+    İşlem onaylanana kadar okuyucular önceki anlık görüntüyü görür; boş veya yarım tablo görünmez.
+    """
+    calisan_idleri = dict(Calisan.objects.values_list('ad_soyad', 'id'))
+    tasarim_idleri = dict(TasarimKodu.objects.values_list('kod', 'id'))
+
+    temizlenecek = Q(calisan_id__in=calisan_idler) | Q(calisan__isnull=True)
+    MonteCarloSonuc.objects.filter(temizlenecek).delete()
+    MonteCarloTasarimSonuc.objects.filter(temizlenecek).delete()
+
+    genel_sonuclar = []
+    tasarim_sonuclari = []
+    for calisan_adi, bilgi in sonuclar['calisanlar'].items():
+        calisan_id = calisan_idleri.get(calisan_adi)
+        if calisan_id is None:
+            continue
+
+        # Genel sonuçlar
+        genel_sonuclar.append(MonteCarloSonuc(
+            calisan_id=calisan_id,
+            ortalama_performans=bilgi['ortalama_performans'],
+            risk_skoru=bilgi['risk_skoru'],
+            gecikme_olasiligi=bilgi['gecikme_olasiligi'],
+            performans_kararliligi=bilgi['performans_kararliligi'],
+            simulasyon_zamani=sonuclar['simulasyon_zamani']
+        ))
+
+        # Tasarım bazlı sonuçlar
+        for tasarim_kodu, tasarim_sonuc in bilgi['tasarim_bazli_sonuclar'].items():
+            tasarim_sonuclari.append(MonteCarloTasarimSonuc(
+                calisan_id=calisan_id,
+                tasarim_id=tasarim_idleri.get(tasarim_kodu),
+                ortalama=tasarim_sonuc['ortalama'],
+                risk_skoru=tasarim_sonuc['risk_skoru'],
+                gecikme_olasiligi=tasarim_sonuc['gecikme_olasiligi']
+            ))
+
+    MonteCarloSonuc.objects.bulk_create(genel_sonuclar, batch_size=KAYIT_PARTI_BOYU)
+    MonteCarloTasarimSonuc.objects.bulk_create(tasarim_sonuclari, batch_size=KAYIT_PARTI_BOYU)
+
+def simulasyon_calistir(force=False, calisan_idler=None, hata_firlat=False):
+    """
+    Ana simülasyon fonksiyonu.
+
+    Girdileri (parmak izi) değişmeyen çalışanlar yeniden simüle edilmez; önceki sonuçları korunur.
+    calisan_idler verilirse (değişiklik kuyruğundan gelen kirli çalışanlar) yalnızca bu çalışanlar
+    kontrol edilir. force=True tüm çalışanları yeniden hesaplar. hata_firlat=True ise hata mesaj olarak
+    döndürülmez, yeniden fırlatılır (optimizasyon hattı değişiklik kuyruğunu onaylamadan durur).
+    """
     try:
+        tam_calistirma = force or not MonteCarloSonuc.objects.exists()
+        if tam_calistirma:
+            calisan_idler = None
+
+        # Değişen çalışanları parmak izleriyle belirle
+        guncel_parmak_izleri = calisan_parmak_izleri(calisan_idler)
+        kayitli_parmak_izleri = load_fingerprints("monte_carlo")
+        if calisan_idler is not None:
+            kontrol_edilen = {str(i) for i in calisan_idler}
+            kayitli_parmak_izleri = {a: p for a, p in kayitli_parmak_izleri.items() if a in kontrol_edilen}
+        degisen, silinen = degisen_anahtarlar(guncel_parmak_izleri, kayitli_parmak_izleri)
+        if tam_calistirma:
+            degisen = set(guncel_parmak_izleri)
+        if not degisen and not silinen:
+            return "Simülasyon girdileri değişmedi, önceki sonuçlar kullanılıyor."
+
         # Verileri oku
-        veriler = performans_verilerini_oku()
-        if not veriler:
+        veriler = performans_verilerini_oku(hata_firlat=hata_firlat)
+        if veriler is None:
             return "Performans verileri okunamadı!"
+        if not veriler:
+            # Geçmiş performans verisi yoksa simüle edilecek bir şey yoktur; bu bir hata değildir
+            return "Geçmiş performans verisi yok, simülasyon atlandı."
         
-        # Tüm çalışanların listesini al
-        calisan_listesi = [c.ad_soyad for c in Calisan.objects.all()]
-        
-        # Simülasyonu çalıştır
-        sonuclar = monte_carlo_simulasyonu(veriler, calisan_listesi)
+        # Yalnızca girdileri değişen çalışanları simüle et
+        hedef_calisanlar = [
+            (calisan_id, ad_soyad) for calisan_id, ad_soyad in Calisan.objects.values_list('id', 'ad_soyad')
+            if str(calisan_id) in degisen
+        ]
+        calisan_listesi = [ad_soyad for _, ad_soyad in hedef_calisanlar]
         
-        # Önceki sonuçları temizle
-        MonteCarloSonuc.objects.all().delete()
-        MonteCarloTasarimSonuc.objects.all().delete()
+        # Simülasyonu çalıştır (büyük iterasyon sayılarında akan moda otomatik geçilir)
+        iterasyon_sayisi = getattr(settings, "MC_ITERASYON_SAYISI", 10000)
+        sonuclar = monte_carlo_simulasyonu(veriler, calisan_listesi, iterasyon_sayisi=iterasyon_sayisi)
         
-        # Sonuçları veritabanına kaydet
-        for calisan_adi, bilgi in sonuclar['calisanlar'].items():
-            calisan = Calisan.objects.get(ad_soyad=calisan_adi)
-            
-            # Genel sonuçları kaydet
-            mc_sonuc = MonteCarloSonuc.objects.create(
-                calisan=calisan,
-                ortalama_performans=bilgi['ortalama_performans'],
-                risk_skoru=bilgi['risk_skoru'],
-                gecikme_olasiligi=bilgi['gecikme_olasiligi'],
-                performans_kararliligi=bilgi['performans_kararliligi'],
-                simulasyon_zamani=sonuclar['simulasyon_zamani']
-            )
-            
-            # Tasarım bazlı sonuçları kaydet
-            for tasarim_kodu, tasarim_sonuc in bilgi['tasarim_bazli_sonuclar'].items():
-                tasarim = TasarimKodu.objects.get(kod=tasarim_kodu)
-                MonteCarloTasarimSonuc.objects.create(
-                    calisan=calisan,
-                    tasarim=tasarim,
-                    ortalama=tasarim_sonuc['ortalama'],
-                    risk_skoru=tasarim_sonuc['risk_skoru'],
-                    gecikme_olasiligi=tasarim_sonuc['gecikme_olasiligi']
-                )
+        # Değişen ve silinen çalışanların sonuçlarını tek işlemde yenileriyle değiştir
+        simulasyon_sonuclarini_kaydet(sonuclar, [calisan_id for calisan_id, _ in hedef_calisanlar])
         
+        if calisan_idler is None:
+            save_fingerprints("monte_carlo", guncel_parmak_izleri)
+        else:
+            update_fingerprints("monte_carlo", guncel_parmak_izleri, silinen)
+
         # WebSocket mesajı gönder
         send_channel_message("monte_carlo_simulasyon", "simulasyon_sonuclari", sonuclar)
         
-        return "Simülasyon başarıyla tamamlandı. Sonuçlar veritabanına kaydedildi."
+        return f"Simülasyon başarıyla tamamlandı ({len(calisan_listesi)} çalışan). Sonuçlar veritabanına kaydedildi."
         
     except Exception as e:
+        if hata_firlat:
+            raise
         return f"Hata oluştu: {str(e)}"
 
 def send_channel_message(group_name, message_type, message_content):
@@ -1,114 +1,153 @@
 import json
 import numpy as np
+from functools import lru_cache
 from itertools import product
 import os
 from scipy import stats
-import matplotlib.pyplot as plt
 from datetime import datetime
-import random
+from itertools import groupby
+from operator import itemgetter
 from ..models import TasarimKodu, GecmisSureVerisi, TaguchiSonucu
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from django.utils.module_loading import import_string
+from .fingerprint import (
+    gruplu_parmak_izleri, hesapla_parmak_izi, load_fingerprints, save_fingerprints, degisen_anahtarlar
+)
 
 # Ana dizin yolunu belirle
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
-def load_data():
-    """Django modellerinden verileri yükle"""
-    try:
-        tasarim_kodlari = {t.kod: {
-            "urun_adi": t.urun_adi,
-            "tahmini_montaj_suresi": t.tahmini_montaj_suresi,
-            "minimum_yetkinlik_seviyesi": t.minimum_yetkinlik_seviyesi,
-            "optimum_yetkinlik_seviyesi": t.optimum_yetkinlik_seviyesi,
-            "departman": t.departman
-        } for t in TasarimKodu.objects.all()}
-        
-        # Geçmiş süre verilerini departmanlara göre grupla
-        gecmis_veriler_ham = {}
-        for veri in GecmisSureVerisi.objects.all():
-            if veri.departman not in gecmis_veriler_ham:
-                gecmis_veriler_ham[veri.departman] = {}
-            
-            if veri.tasarim.kod not in gecmis_veriler_ham[veri.departman]:
-                gecmis_veriler_ham[veri.departman][veri.tasarim.kod] = {
-                    "urun_adi": veri.urun_adi,
-                    "gecmis_sureler": []
-                }
-            
-            gecmis_veriler_ham[veri.departman][veri.tasarim.kod]["gecmis_sureler"].append(veri.sure)
-            
-        # Tüm departmanlardan verileri birleştir
-            gecmis_veriler = {}
-            for departman, veriler in gecmis_veriler_ham.items():
-                gecmis_veriler.update(veriler)
-            
-        return tasarim_kodlari, gecmis_veriler, gecmis_veriler_ham
-    except Exception as e:
-        print(f"Veri yükleme hatası: {str(e)}")
-        return None, None, None
+def load_tasarim_kodlari():
+    """Tasarım kodlarını Django modellerinden yükle"""
+    return {t.kod: {
+        "urun_adi": t.urun_adi,
+        "tahmini_montaj_suresi": t.tahmini_montaj_suresi,
+        "minimum_yetkinlik_seviyesi": t.minimum_yetkinlik_seviyesi,
+        "optimum_yetkinlik_seviyesi": t.optimum_yetkinlik_seviyesi,
+        "departman": t.departman
+    } for t in TasarimKodu.objects.all()}
+
+def toplu_gecmis_analizi(gecmis_veriler):
+    """
+    Tüm tasarım kodlarının geçmiş sürelerini tek seferde analiz et ve optimum süreleri hesapla
+
+    Her kodun süreleri sıralanıp tek bir düz dizide art arda tutulur; çeyrekler (numpy 'linear'),
+    IQR aykırı değer filtresi, filtrelenmiş ortalama/std/minimum ve %95 normal güven aralığı bölüt
+    indirgemeleriyle hesaplanır. Süresi olmayan kodlar sonuçta yer almaz.
+
+    Dönüş: {kod: analyze_historical_data ile aynı biçimde analiz}
+    """
+    kodlar = [kod for kod, veri in gecmis_veriler.items() if veri.get("gecmis_sureler")]
+    if not kodlar:
+        return {}
+
+    diziler = [np.sort(np.asarray(gecmis_veriler[kod]["gecmis_sureler"], dtype=float)) for kod in kodlar]
+    n = np.array([len(d) for d in diziler])
+    baslangic = np.concatenate(([0], np.cumsum(n)[:-1]))
+    y = np.concatenate(diziler)
+
+    def bolut_toplami(degerler):
+        return np.add.reduceat(degerler, baslangic)
+
+    def yuzdelik(q):
+        pozisyon = q * (n - 1)
+        alt = np.floor(pozisyon).astype(int)
+        ust = np.minimum(alt + 1, n - 1)
+        return y[baslangic + alt] + (y[baslangic + ust] - y[baslangic + alt]) * (pozisyon - alt)
 
-def analyze_historical_data(gecmis_veriler, kod):
-    """Geçmiş verileri analiz et ve optimum süreyi hesapla"""
-    if kod not in gecmis_veriler:
-        return None
-        
-    sureler = gecmis_veriler[kod].get("gecmis_sureler", [])
-    
-    # Eğer bu tasarım kodu için hiç geçmiş süre verisi yoksa, analiz yapılamaz.
-    if not sureler:
-        return None
-    
-    # Temel istatistikler
-    ortalama = np.mean(sureler)
-    std = np.std(sureler)
-    
     # Aykırı değerleri tespit et
-    q1 = np.percentile(sureler, 25)
-    q3 = np.percentile(sureler, 75)
+    q1 = yuzdelik(0.25)
+    q3 = yuzdelik(0.75)
     iqr = q3 - q1
-    lower_bound = q1 - 1.5 * iqr
-    upper_bound = q3 + 1.5 * iqr
-    
-    # Aykırı değerleri filtrele
-    filtered_sureler = [s for s in sureler if lower_bound <= s <= upper_bound]
-    
-    # Filtrelenmiş verilerle istatistikleri güncelle
-    if filtered_sureler:
-        ortalama = np.mean(filtered_sureler)
-        std = np.std(filtered_sureler)
-        minimum = np.min(filtered_sureler)
-    else:
-        minimum = np.min(sureler)
-    
+    lower_bound = np.repeat(q1 - 1.5 * iqr, n)
+    upper_bound = np.repeat(q3 + 1.5 * iqr, n)
+    filtre = (lower_bound <= y) & (y <= upper_bound)
+
+    # Filtrelenmiş verilerle istatistikler (filtre boş kalırsa tüm veriler)
+    filtered_count = bolut_toplami(filtre.astype(int))
+    filtre = filtre | np.repeat(filtered_count == 0, n)
+    sayi = bolut_toplami(filtre.astype(int))
+    ortalama = bolut_toplami(np.where(filtre, y, 0.0)) / sayi
+    std = np.sqrt(bolut_toplami(np.where(filtre, (y - np.repeat(ortalama, n)) ** 2, 0.0)) / sayi)
+    minimum = np.minimum.reduceat(np.where(filtre, y, np.inf), baslangic)
+
     # Normal dağılım varsayımı altında güven aralığı
-    guven_araligi = stats.norm.interval(0.95, loc=ortalama, scale=std)
-    
-    # Optimum süre: Alt güven aralığı, ortalama ve minimum değerin ağırlıklı ortalaması
-    optimum_sure = (
-        guven_araligi[0] * 0.4 +  # Alt güven aralığı %40 ağırlık
-        ortalama * 0.4 +          # Ortalama %40 ağırlık
-        minimum * 0.2             # Minimum %20 ağırlık
-    )
-    
+    z = stats.norm.ppf(0.975)
+    alt_guven = ortalama - z * std
+    ust_guven = ortalama + z * std
+
+    # Optimum süre: Alt güven aralığı %40, ortalama %40, minimum %20 ağırlık
+    optimum_sure = alt_guven * 0.4 + ortalama * 0.4 + minimum * 0.2
+
     return {
-        "optimum_sure": optimum_sure,
-        "ortalama": ortalama,
-        "std": std,
-        "minimum": minimum,
-        "guven_araligi": guven_araligi,
-        "filtered_count": len(filtered_sureler),
-        "original_count": len(sureler),
-        "q1": q1,
-        "q3": q3
+        kod: {
+            "optimum_sure": float(optimum_sure[i]),
+            "ortalama": float(ortalama[i]),
+            "std": float(std[i]),
+            "minimum": float(minimum[i]),
+            "guven_araligi": (float(alt_guven[i]), float(ust_guven[i])),
+            "filtered_count": int(filtered_count[i]),
+            "original_count": int(n[i]),
+            "q1": float(q1[i]),
+            "q3": float(q3[i])
+        } for i, kod in enumerate(kodlar)
+    }
+
+def analyze_historical_data(gecmis_veriler, kod):
+    """Geçmiş verileri analiz et ve optimum süreyi hesapla"""
+    if kod not in gecmis_veriler:
+        return None
+    return toplu_gecmis_analizi({kod: gecmis_veriler[kod]}).get(kod)
+
+# Kod başına geçmiş analiz önbelleği: {kod: (veri sürümü, analiz)}
+_GECMIS_ANALIZ_ONBELLEGI = {}
+
+def gecmis_analizleri():
+    """
+    Tüm tasarım kodlarının geçmiş süre analizlerini döndürür; sonuçlar kod başına önbelleğe alınır.
+
+    Her kodun veri sürümü (satır sayısı, son kayıt id'si, süre toplamı) tek bir gruplu sorguyla okunur;
+    yalnızca sürümü değişen, yani yeni süre verisi gelen kodların süreleri tek sorguda yüklenip
+    toplu_gecmis_analizi ile yeniden analiz edilir. Bir kodun farklı departman adlarıyla kaydedilmiş
+    süreleri birlikte analiz edilir.
+    """
+    surumler = {
+        kod: (sayi, son_id, toplam)
+        for kod, sayi, son_id, toplam in GecmisSureVerisi.objects.values('tasarim__kod').annotate(
+            sayi=Count('id'), son_id=Max('id'), toplam=Sum('sure')
+        ).values_list('tasarim__kod', 'sayi', 'son_id', 'toplam')
     }
+    for kod in set(_GECMIS_ANALIZ_ONBELLEGI) - set(surumler):
+        del _GECMIS_ANALIZ_ONBELLEGI[kod]
+
+    bayat = [kod for kod, surum in surumler.items() if _GECMIS_ANALIZ_ONBELLEGI.get(kod, (None,))[0] != surum]
+    if bayat:
+        satirlar = GecmisSureVerisi.objects.filter(tasarim__kod__in=bayat).order_by(
+            'tasarim__kod', 'sure'
+        ).values_list('tasarim__kod', 'sure')
+        gruplar = {
+            kod: {"gecmis_sureler": [sure for _, sure in kod_satirlari]}
+            for kod, kod_satirlari in groupby(satirlar.iterator(chunk_size=5000), key=itemgetter(0))
+        }
+        for kod, analiz in toplu_gecmis_analizi(gruplar).items():
+            _GECMIS_ANALIZ_ONBELLEGI[kod] = (surumler[kod], analiz)
+
+    return {kod: _GECMIS_ANALIZ_ONBELLEGI[kod][1] for kod in surumler if kod in _GECMIS_ANALIZ_ONBELLEGI}
+
+def create_parameter_levels(tasarim_kodlari, gecmis_veriler, level_count=3, analizler=None):
+    """
+    Tasarım kodları için parametre seviyelerini oluştur
+
+    analizler (gecmis_analizleri çıktısı) verilmezse geçmiş veriler burada toplu olarak analiz edilir.
+    """
+    if analizler is None:
+        analizler = toplu_gecmis_analizi(gecmis_veriler or {})
 
-def create_parameter_levels(tasarim_kodlari, gecmis_veriler, level_count=3):
-    """Tasarım kodları için parametre seviyelerini oluştur"""
     parameter_levels = {}
     for kod, bilgi in tasarim_kodlari.items():
         # Geçmiş veriler varsa onları kullan
-        historical_analysis = None
-        if gecmis_veriler and kod in gecmis_veriler:
-            historical_analysis = analyze_historical_data(gecmis_veriler, kod)
+        historical_analysis = analizler.get(kod)
         
         if historical_analysis:
             base_time = historical_analysis["optimum_sure"]
@@ -169,385 +208,326 @@ def calculate_snr(values, snr_type="smaller"):
     else:
         raise ValueError(f"Geçersiz SNR tipi: {snr_type}")
 
+# Ortogonal dizinin en fazla eleman sayısı (deney x parametre); aşılırsa rastgele örneklemeye düşülür
+MAKS_DIZI_ELEMANI = 20_000_000
+
+def _asal_kuvvet(n):
+    """n = p^m ise (p, m), değilse None döndürür."""
+    if n < 2:
+        return None
+    p = next(d for d in range(2, n + 1) if n % d == 0)
+    m = 0
+    while n % p == 0:
+        n //= p
+        m += 1
+    return (p, m) if n == 1 else None
+
+def _polinom_carp(a, b, p):
+    """Katsayı listeleri (düşük dereceden yükseğe) verilen iki polinomu GF(p) üzerinde çarpar."""
+    sonuc = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            sonuc[i + j] = (sonuc[i + j] + x * y) % p
+    return sonuc
+
+def _polinom_mod(a, mod, p):
+    """a polinomunun monik mod polinomuna göre kalanını GF(p) üzerinde hesaplar."""
+    a = list(a)
+    m = len(mod) - 1
+    for i in range(len(a) - 1, m - 1, -1):
+        katsayi = a[i]
+        if katsayi:
+            for j in range(m + 1):
+                a[i - m + j] = (a[i - m + j] - katsayi * mod[j]) % p
+    return (a + [0] * m)[:m]
+
+def _indirgenemez_polinom(p, m):
+    """GF(p) üzerinde m dereceli monik indirgenemez bir polinom bulur (katsayılar düşükten yükseğe)."""
+    def katsayilar(sayi, derece):
+        return [(sayi // p ** k) % p for k in range(derece)] + [1]
+
+    for sayi in range(p ** m):
+        aday = katsayilar(sayi, m)
+        if aday[0] == 0 and m > 1:
+            continue
+        bolunebilir = any(
+            not any(_polinom_mod(aday, katsayilar(b, d), p))
+            for d in range(1, m // 2 + 1) for b in range(p ** d)
+        )
+        if not bolunebilir:
+            return aday
+    return None
+
+def _galois_tablolari(q):
+    """GF(q) için toplama ve çarpma tablolarını döndürür; elemanlar p tabanında polinom kodlarıdır."""
+    p, m = _asal_kuvvet(q)
+    elemanlar = np.arange(q)
+    basamaklar = (elemanlar[:, None] // p ** np.arange(m)) % p
+    agirlik = p ** np.arange(m)
+    toplama = (((basamaklar[:, None, :] + basamaklar[None, :, :]) % p) * agirlik).sum(axis=2)
+
+    if m == 1:
+        carpma = np.outer(elemanlar, elemanlar) % p
+    else:
+        mod = _indirgenemez_polinom(p, m)
+        carpma = np.zeros((q, q), dtype=int)
+        for a in range(q):
+            for b in range(q):
+                kalan = _polinom_mod(_polinom_carp(list(basamaklar[a]), list(basamaklar[b]), p), mod, p)
+                carpma[a, b] = sum(k * p ** i for i, k in enumerate(kalan))
+    return toplama, carpma
+
+@lru_cache(maxsize=32)
 def create_orthogonal_array(parameter_count, level_count):
     """
-    Ortogonal dizi oluştur
-    
+    Güç (strength) 2 ortogonal dizi oluştur
+
+    Asal kuvveti seviye sayıları (q = p^m) için Rao-Hamming yapısı kullanılır: GF(q)^t içindeki tüm
+    vektörler satır, her projektif nokta (ilk sıfır olmayan koordinatı 1 olan vektör) bir sütundur ve
+    hücre değeri iç çarpımdır. t, (q^t - 1) / (q - 1) >= parametre sayısı olacak en küçük değerdir
+    (t = 2 Bose yapısıdır; ör. L9, L25). Sonuç (parametre, seviye) çiftine göre önbelleğe alınır ve
+    salt okunurdur. Uygun dizi yoksa None döndürülür.
+
     Parametreler:
     - parameter_count: Parametre sayısı
     - level_count: Seviye sayısı
     """
-    # Basit bir L9 ortogonal dizi (3 seviye, 4 faktör)
-    if level_count == 3 and parameter_count <= 4:
-        return np.array([
-            [0, 0, 0, 0],
-            [0, 1, 1, 1],
-            [0, 2, 2, 2],
-            [1, 0, 1, 2],
-            [1, 1, 2, 0],
-            [1, 2, 0, 1],
-            [2, 0, 2, 1],
-            [2, 1, 0, 2],
-            [2, 2, 1, 0]
-        ])[:, :parameter_count]
-    
-    # L27 ortogonal dizi (3 seviye, 13 faktör)
-    elif level_count == 3 and parameter_count <= 13:
-        # L27 ortogonal dizi temel matrisi
-        L27_base = np.zeros((27, 13), dtype=int)
-        
-        # İlk 3 sütun temel faktörler
-        for i in range(27):
-            L27_base[i, 0] = (i // 9) % 3
-            L27_base[i, 1] = (i // 3) % 3
-            L27_base[i, 2] = i % 3
-        
-        # Diğer sütunlar etkileşimler
-        for i in range(27):
-            L27_base[i, 3] = (L27_base[i, 0] + L27_base[i, 1]) % 3
-            L27_base[i, 4] = (L27_base[i, 0] + L27_base[i, 2]) % 3
-            L27_base[i, 5] = (L27_base[i, 1] + L27_base[i, 2]) % 3
-            L27_base[i, 6] = (L27_base[i, 0] + L27_base[i, 1] + L27_base[i, 2]) % 3
-            L27_base[i, 7] = (2*L27_base[i, 0] + L27_base[i, 1]) % 3
-            L27_base[i, 8] = (2*L27_base[i, 0] + L27_base[i, 2]) % 3
-            L27_base[i, 9] = (2*L27_base[i, 1] + L27_base[i, 0]) % 3
-            L27_base[i, 10] = (2*L27_base[i, 1] + L27_base[i, 2]) % 3
-            L27_base[i, 11] = (2*L27_base[i, 2] + L27_base[i, 0]) % 3
-            L27_base[i, 12] = (2*L27_base[i, 2] + L27_base[i, 1]) % 3
-            
-        return L27_base[:, :parameter_count]
-    
-    # Basit bir L25 ortogonal dizi (5 seviye, 6 faktör)
-    elif level_count == 5 and parameter_count <= 6:
-        # L25 ortogonal dizi oluştur
-        L25 = np.zeros((25, 6), dtype=int)
-        for i in range(25):
-            for j in range(6):
-                L25[i, j] = (i + j*5) % 5
-        return L25[:, :parameter_count]
-    
-    # L50 ortogonal dizi (5 seviye, 12 faktör)
-    elif level_count == 5 and parameter_count <= 12:
-        # L50 ortogonal dizi oluştur (5^12 için yaklaşık bir dizi)
-        L50 = np.zeros((50, 12), dtype=int)
-        
-        # İlk 2 sütun temel faktörler
-        for i in range(50):
-            L50[i, 0] = (i // 10) % 5
-            L50[i, 1] = i % 5
-        
-        # Diğer sütunlar için Latin kare tasarımı kullan
-        for j in range(2, 12):
-            for i in range(50):
-                L50[i, j] = (L50[i, 0] + j*L50[i, 1]) % 5
-                
-        return L50[:, :parameter_count]
-    
-    # Parametre sayısı çok fazla ise uyarı ver ve None döndür
-    elif parameter_count > 15 or (level_count ** parameter_count) > 1000000:
-        print(f"UYARI: Parametre sayısı ({parameter_count}) veya kombinasyon sayısı ({level_count ** parameter_count}) çok fazla!")
-        print("Tam faktöriyel tasarım çok fazla bellek kullanacak ve sistem yavaşlayabilir.")
-        print("Daha az parametre ile tekrar deneyin veya farklı bir optimizasyon yöntemi kullanın.")
+    if parameter_count < 1:
+        print("Uygun ortogonal dizi bulunamadı (parametre yok).")
         return None
-    
-    # Ortogonal dizi yoksa tam faktöriyel tasarım kullan
-    else:
-        print(f"Uygun ortogonal dizi bulunamadı. Tam faktöriyel tasarım kullanılıyor.")
-        print(f"Toplam {level_count ** parameter_count} kombinasyon oluşturulacak.")
+    if _asal_kuvvet(level_count) is None:
+        print(f"Uygun ortogonal dizi bulunamadı (seviye sayısı {level_count} asal kuvveti değil).")
         return None
 
-def taguchi_optimization(parameter_levels, gecmis_veriler, level_count=3, snr_type="smaller"):
+    q = level_count
+    t = 2
+    while (q ** t - 1) // (q - 1) < parameter_count:
+        t += 1
+
+    if q ** t * parameter_count > MAKS_DIZI_ELEMANI:
+        print(f"UYARI: L{q ** t} ortogonal dizisi {parameter_count} parametre için çok büyük.")
+        return None
+
+    toplama, carpma = _galois_tablolari(q)
+
+    # Satırlar: GF(q)^t içindeki tüm vektörler
+    satirlar = (np.arange(q ** t)[:, None] // q ** np.arange(t - 1, -1, -1)) % q
+
+    # Sütunlar: ilk sıfır olmayan koordinatı 1 olan vektörler (ilk parameter_count tanesi)
+    sutunlar = []
+    for bas in range(t):
+        kuyruk = t - bas - 1
+        for kod in range(q ** kuyruk):
+            sutunlar.append([0] * bas + [1] + [(kod // q ** (kuyruk - 1 - k)) % q for k in range(kuyruk)])
+            if len(sutunlar) == parameter_count:
+                break
+        if len(sutunlar) == parameter_count:
+            break
+    sutunlar = np.array(sutunlar)
+
+    dtype = np.uint8 if q <= 256 else np.int32
+    dizi = np.zeros((q ** t, parameter_count), dtype=dtype)
+    for k in range(t):
+        dizi = toplama[dizi, carpma[satirlar[:, k][:, None], sutunlar[None, :, k]]].astype(dtype)
+
+    dizi.flags.writeable = False
+    return dizi
+
+def calculate_snr_batch(values, snr_type="smaller"):
+    """
+    calculate_snr'nin toplu sürümü: son eksendeki değer grupları için SNR dizisi döndürür.
+
+    Parametreler:
+    - values: (..., n) boyutlu değer dizisi
+    - snr_type: SNR tipi ("smaller", "larger", "nominal")
+    """
+    values = np.asarray(values, dtype=float)
+
+    if snr_type == "smaller":  # Smaller is better
+        return -10 * np.log10(np.mean(values ** 2, axis=-1))
+    elif snr_type == "larger":  # Larger is better
+        return -10 * np.log10(np.mean(1 / (values ** 2), axis=-1))
+    elif snr_type == "nominal":  # Nominal is best
+        mean = np.mean(values, axis=-1)
+        var = np.var(values, axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(var == 0, 0.0, 10 * np.log10((mean ** 2) / var))
+    else:
+        raise ValueError(f"Geçersiz SNR tipi: {snr_type}")
+
+def create_level_matrix(parameter_levels, keys, level_count):
+    """Parametre seviyelerini (parametre sayısı, seviye sayısı) boyutlu bir matrise çevirir."""
+    return np.array([parameter_levels[key][:level_count] for key in keys], dtype=float).reshape(len(keys), level_count)
+
+def taguchi_optimization(parameter_levels, gecmis_veriler, level_count=3, snr_type="smaller", rng=None,
+                         objective=None, analizler=None):
     """
     Taguchi optimizasyonu gerçekleştir ve birden fazla çalıştırmanın ortalamasını al
-    
+
+    Tüm çalıştırmaların deneyleri tek bir (çalıştırma, deney, parametre) seviye indeksi dizisinde tutulur;
+    değerler seviye matrisinden indekslemeyle okunur, satır toplamları ve SNR değerleri tek adımda hesaplanır.
+    Deneyler analyze_parameter_effects için seviye indeksi matrisi olarak döndürülür.
+    objective verilirse deney sonucu (..., parametre) değer dizisinden bu fonksiyonla hesaplanır
+    (etkileşimli amaç); verilmezse sürelerin toplamı kullanılır.
+
     Parametreler:
     - parameter_levels: Parametre seviyeleri
     - gecmis_veriler: Geçmiş veriler
     - level_count: Seviye sayısı
     - snr_type: SNR tipi
+    - rng: Rastgele örnekleme için numpy Generator
+    - objective: (..., parametre) -> (...) deney sonucu fonksiyonu
+    - analizler: Kod başına geçmiş analizler (verilmezse gecmis_veriler'den hesaplanır)
     """
     CALISTIRMA_SAYISI = 5  # Optimizasyonun kaç kez tekrarlanacağı
-    
+    rng = rng if rng is not None else np.random.default_rng()
+
     keys = list(parameter_levels.keys())
     parameter_count = len(keys)
-    
+
     print(f"Toplam parametre sayısı: {parameter_count}, Seviye sayısı: {level_count}")
     print(f"Optimizasyon {CALISTIRMA_SAYISI} kez tekrarlanacak ve ortalama sonuç alınacak")
-    
-    # Her tasarım kodu için optimize edilmiş süreleri tutacak sözlük
-    tum_optimum_sureler = {}
-    tum_improvement_data = {}
-    tum_snr_values = []
-    all_runs_experiments = [] # Tüm çalıştırmalardaki deneyleri topla
-    
-    for calistirma in range(CALISTIRMA_SAYISI):
-        print(f"\nOptimizasyon çalıştırması {calistirma + 1}/{CALISTIRMA_SAYISI}")
-        
-        # Ortogonal dizi oluştur
-        orthogonal_array = create_orthogonal_array(parameter_count, level_count)
-        
-        if orthogonal_array is not None:
-            print(f"Ortogonal dizi kullanılıyor. Toplam {len(orthogonal_array)} deney yapılacak.")
-            # Ortogonal dizi kullanarak deneyleri oluştur
-            experiments = []
-            for row in orthogonal_array:
-                experiment = []
-                for i, level_idx in enumerate(row):
-                    key = keys[i]
-                    experiment.append(parameter_levels[key][level_idx])
-                experiments.append(experiment)
-            
-            # Deneyleri değerlendir
-            experiment_results = []
-            snr_values = []
-            for experiment in experiments:
-                total_time = sum(experiment)
-                experiment_results.append(total_time)
-                snr_values.append(calculate_snr([total_time], snr_type))
-            
-            # En iyi kombinasyonu bul
-            best_idx = np.argmax(snr_values)
-            best_combination = experiments[best_idx]
-            best_parameters = dict(zip(keys, best_combination))
-            
-        else:
-            # Rastgele örnekleme için
-            print("Rastgele örnekleme yöntemi kullanılıyor...")
-            max_combinations = 10000
-            
-            # Parametre seviyelerini liste olarak hazırla
-            level_lists = [parameter_levels[key] for key in keys]
-            
-            # En iyi kombinasyonu bulmak için değişkenler
-            best_combination = None
-            best_snr = float('-inf')
-            best_total_time = float('inf')
-            
-            # Rastgele kombinasyonları değerlendir
-            experiments = [] # Deneyleri saklamak için liste oluştur
-            experiment_results = []
-            snr_values = []
-            for _ in range(max_combinations):
-                combination = [random.choice(levels) for levels in level_lists]
-                experiments.append(combination) # Deneyi listeye ekle
-                total_time = sum(combination)
-                snr_value = calculate_snr([total_time], snr_type)
-                
-                experiment_results.append(total_time)
-                snr_values.append(snr_value)
-                
-                if snr_value > best_snr:
-                    best_snr = snr_value
-                    best_combination = combination
-                    best_total_time = total_time
-            
-            best_parameters = dict(zip(keys, best_combination))
-        
-        all_runs_experiments.extend(experiments) # Deneyleri ana listeye ekle
-
-        # İyileştirme oranlarını hesapla
-        improvement_data = {}
-        for kod, optimum_sure in best_parameters.items():
-            if kod in gecmis_veriler:
-                historical = analyze_historical_data(gecmis_veriler, kod)
-                if historical:
-                    original = historical["ortalama"]
-                    improvement = ((original - optimum_sure) / original) * 100
-                    improvement_data[kod] = {
-                        "original": original,
-                        "optimized": optimum_sure,
-                        "improvement": improvement
-                    }
-        
-        # Her tasarım kodu için optimize edilmiş süreleri ve iyileştirme verilerini sakla
-        for kod, optimum_sure in best_parameters.items():
-            if kod not in tum_optimum_sureler:
-                tum_optimum_sureler[kod] = []
-            tum_optimum_sureler[kod].append(optimum_sure)
-            
-            if kod in improvement_data:
-                if kod not in tum_improvement_data:
-                    tum_improvement_data[kod] = []
-                tum_improvement_data[kod].append(improvement_data[kod])
-        
-        tum_snr_values.extend(snr_values)
-    
-    # Ortalama sonuçları hesapla
+
+    level_matrix = create_level_matrix(parameter_levels, keys, level_count)
+    if analizler is None:
+        analizler = toplu_gecmis_analizi(gecmis_veriler or {})
+
+    # Ortogonal dizi oluştur
+    orthogonal_array = create_orthogonal_array(parameter_count, level_count)
+
+    if orthogonal_array is not None:
+        print(f"Ortogonal dizi kullanılıyor. Toplam {len(orthogonal_array)} deney yapılacak.")
+        level_indices = np.broadcast_to(orthogonal_array, (CALISTIRMA_SAYISI,) + orthogonal_array.shape)
+    else:
+        # Rastgele örnekleme: tüm çalıştırmaların kombinasyonları tek seferde çekilir
+        print("Rastgele örnekleme yöntemi kullanılıyor...")
+        max_combinations = 10000
+        level_indices = rng.integers(0, level_count, size=(CALISTIRMA_SAYISI, max_combinations, parameter_count))
+
+    # Deneyleri değerlendir
+    experiments = level_matrix[np.arange(parameter_count), level_indices]
+    experiment_results = objective(experiments) if objective is not None else experiments.sum(axis=2)
+    snr_values = calculate_snr_batch(experiment_results[..., None], snr_type)
+
+    # Her çalıştırmanın en iyi kombinasyonu ve çalıştırmaların ortalaması
+    best_idx = np.argmax(snr_values, axis=1)
+    best_combinations = experiments[np.arange(CALISTIRMA_SAYISI), best_idx]
+    ortalama_sureler = best_combinations.mean(axis=0)
+
     final_best_parameters = {}
     final_improvement_data = {}
-    
-    for kod in tum_optimum_sureler:
-        # Optimize edilmiş sürelerin ortalamasını al
-        ortalama_sure = np.mean(tum_optimum_sureler[kod])
+    for i, kod in enumerate(keys):
+        ortalama_sure = ortalama_sureler[i]
         final_best_parameters[kod] = ortalama_sure
-        
-        # İyileştirme verilerinin ortalamasını al
-        if kod in tum_improvement_data:
-            ortalama_improvement = np.mean([data["improvement"] for data in tum_improvement_data[kod]])
+
+        # İyileştirme oranı (çalıştırma başına oranların ortalaması, orana doğrusal olduğundan eşdeğer)
+        historical = analizler.get(kod)
+        if historical:
+            original = historical["ortalama"]
             final_improvement_data[kod] = {
-                "original": tum_improvement_data[kod][0]["original"],  # İlk değeri kullan
+                "original": original,
                 "optimized": ortalama_sure,
-                "improvement": ortalama_improvement
+                "improvement": float(np.mean((original - best_combinations[:, i]) / original * 100))
             }
-    
+
     print("\nTüm çalıştırmaların ortalaması alındı.")
-    
-    return final_best_parameters, all_runs_experiments, tum_snr_values, final_improvement_data
+
+    return final_best_parameters, level_indices.reshape(-1, parameter_count), snr_values.reshape(-1), final_improvement_data
+
+def decomposed_taguchi_optimization(parameter_levels, gecmis_veriler, level_count=3, snr_type="smaller",
+                                    analizler=None):
+    """
+    Toplamsal amaç için ayrışık Taguchi optimizasyonu
+
+    Amaç deney sürelerinin toplamı olduğunda her tasarım kodunun en iyi seviyesi diğerlerinden bağımsızdır.
+    SNR ("smaller"/"larger") toplamın monoton bir fonksiyonu olduğundan, her parametre yalnızca kendi
+    seviyeleri üzerinden O(seviye) adımda çözülür ve sonuç tam faktöriyel aramanın en iyisiyle aynıdır.
+
+    Dönüş: (en iyi parametreler, parametre etkileri, iyileştirme verileri)
+    """
+    if snr_type not in ("smaller", "larger"):
+        raise ValueError(f"Ayrışık optimizasyon için SNR tipi monoton olmalı: {snr_type}")
+
+    keys = list(parameter_levels.keys())
+    if not keys:
+        return {}, {}, {}
+
+    if analizler is None:
+        analizler = toplu_gecmis_analizi(gecmis_veriler or {})
+
+    level_matrix = create_level_matrix(parameter_levels, keys, level_count)
+    snr_values = calculate_snr_batch(level_matrix[..., None], snr_type)
+    best_levels = np.argmax(snr_values, axis=1)
+
+    best_parameters = {}
+    parameter_effects = {}
+    improvement_data = {}
+    for i, kod in enumerate(keys):
+        optimum_sure = level_matrix[i, best_levels[i]]
+        best_parameters[kod] = optimum_sure
+        parameter_effects[kod] = {
+            level_value: float(snr_values[i, level_idx]) for level_idx, level_value in enumerate(parameter_levels[kod])
+        }
+
+        # İyileştirme oranını hesapla
+        historical = analizler.get(kod)
+        if historical:
+            original = historical["ortalama"]
+            improvement_data[kod] = {
+                "original": original,
+                "optimized": optimum_sure,
+                "improvement": ((original - optimum_sure) / original) * 100
+            }
+
+    return best_parameters, parameter_effects, improvement_data
 
 def analyze_parameter_effects(parameter_levels, experiments, snr_values, is_random_sampling=False):
     """
     Her parametrenin etkisini analiz et
-    
+
+    Deneyler seviye indeksi matrisi olarak verilir; her (parametre, seviye) çiftinin ortalama SNR değeri
+    tüm sütunlar için tek bir np.bincount ile hesaplanır. Ortogonal dizi ve rastgele örnekleme için
+    hesap aynıdır.
+
     Parametreler:
     - parameter_levels: Parametre seviyeleri
-    - experiments: Deneyler
+    - experiments: (deney sayısı, parametre sayısı) boyutlu seviye indeksi matrisi
     - snr_values: SNR değerleri
-    - is_random_sampling: Rastgele örnekleme kullanıldı mı?
+    - is_random_sampling: Rastgele örnekleme kullanıldı mı? (geriye uyumluluk için, hesabı etkilemez)
     """
-    parameter_effects = {}
     keys = list(parameter_levels.keys())
-    
-    # Rastgele örnekleme kullanıldıysa, parametre etkilerini hesaplamak için
-    # her seviyenin ortalama SNR değerini kullan
-    if is_random_sampling:
-        print("Rastgele örnekleme için parametre etkileri hesaplanıyor...")
-        
-        # Her parametre için
-        for i, key in enumerate(keys):
-            parameter_effects[key] = {}
-            levels = parameter_levels[key]
-            
-            # Her seviye için
-            for level_idx, level_value in enumerate(levels):
-                # Bu seviyeyi içeren tüm deneyleri bul
-                level_snr_values = []
-                
-                # Tüm deneyleri kontrol et
-                for j, experiment in enumerate(experiments):
-                    if abs(experiment[i] - level_value) < 0.001:  # Yaklaşık eşitlik kontrolü
-                        level_snr_values.append(snr_values[j])
-                
-                # Bu seviye için ortalama SNR değerini hesapla
-                if level_snr_values:
-                    parameter_effects[key][level_value] = np.mean(level_snr_values)
-                else:
-                    parameter_effects[key][level_value] = 0
-        
-        return parameter_effects
-    
-    # Normal Taguchi analizi için
+    level_indices = np.asarray(experiments, dtype=int).reshape(-1, len(keys))
+    snr_values = np.asarray(snr_values, dtype=float).reshape(-1)
+    level_count = max((len(levels) for levels in parameter_levels.values()), default=0)
+
+    # (parametre, seviye) çiftini tek bir kutu indeksine çevir ve SNR toplamlarını/sayılarını çıkar
+    bins = (level_indices + np.arange(len(keys)) * level_count).ravel()
+    minlength = len(keys) * level_count
+    toplam = np.bincount(bins, weights=np.repeat(snr_values, len(keys)), minlength=minlength)
+    sayi = np.bincount(bins, minlength=minlength)
+    ortalama = np.divide(toplam, sayi, out=np.zeros(minlength), where=sayi > 0).reshape(len(keys), level_count)
+
+    parameter_effects = {}
     for i, key in enumerate(keys):
-        parameter_effects[key] = {}
-        levels = parameter_levels[key]
-        
-        for level_idx, level_value in enumerate(levels):
-            # Bu seviyeyi içeren tüm deneyleri bul
-            level_experiments = []
-            level_snr_values = []
-            
-            for j, experiment in enumerate(experiments):
-                if isinstance(experiment, list) and i < len(experiment):
-                    if abs(experiment[i] - level_value) < 0.001:  # Yaklaşık eşitlik kontrolü
-                        level_experiments.append(experiment)
-                        level_snr_values.append(snr_values[j])
-            
-            # Bu seviye için ortalama SNR değerini hesapla
-            if level_snr_values:
-                parameter_effects[key][level_value] = np.mean(level_snr_values)
-            else:
-                parameter_effects[key][level_value] = 0
-    
+        # Bu seviye için ortalama SNR değeri (deney yoksa 0)
+        parameter_effects[key] = {
+            level_value: float(ortalama[i, level_idx]) for level_idx, level_value in enumerate(parameter_levels[key])
+        }
+
     return parameter_effects
 
-def create_taguchi_visualizations(parameter_effects, improvement_data):
+def create_taguchi_visualizations(parameter_effects, improvement_data, output_dir=None):
     """
     Taguchi optimizasyonu sonuçlarını görselleştir
-    
-    Parametreler:
-    - parameter_effects: Parametre etkileri
-    - improvement_data: İyileştirme verileri
+
+    Çizim taguchi_grafikleri modülündedir; matplotlib yalnızca bu fonksiyon çağrıldığında yüklenir.
     """
-    # Grafikleri kaydetmek için klasör oluştur
-    output_dir = os.path.join(ROOT_DIR, 'static', 'img', 'taguchi')
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Parametre etkileri grafiği
-    plt.figure(figsize=(12, 8))
-    
-    for i, (param, effects) in enumerate(parameter_effects.items()):
-        plt.subplot(2, 3, i+1)
-        plt.plot(range(1, len(effects)+1), effects, 'o-', linewidth=2)
-        plt.title(f'Parametre: {param}')
-        plt.xlabel('Seviye')
-        plt.ylabel('Ortalama SNR')
-        plt.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'parameter_effects.png'), dpi=100, bbox_inches='tight')
-    
-    # İyileştirme oranları grafiği
-    if improvement_data:
-        plt.figure(figsize=(12, 6))
-        
-        # En yüksek iyileştirme oranına göre sırala
-        sorted_improvements = sorted(improvement_data.items(), key=lambda x: x[1]['improvement'], reverse=True)
-        codes = [item[0] for item in sorted_improvements]
-        improvements = [item[1]['improvement'] for item in sorted_improvements]
-        
-        # En fazla 15 tasarım kodunu göster
-        if len(codes) > 15:
-            codes = codes[:15]
-            improvements = improvements[:15]
-        
-        bars = plt.bar(codes, improvements, alpha=0.7)
-        plt.title('Tasarım Kodlarına Göre İyileştirme Oranları')
-        plt.xlabel('Tasarım Kodu')
-        plt.ylabel('İyileştirme Oranı (%)')
-        plt.xticks(rotation=45, ha='right')
-        plt.grid(True, alpha=0.3)
-        
-        # Değerleri çubukların üzerine ekle
-        for bar, value in zip(bars, improvements):
-            plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5, f'{value:.1f}%', 
-                    ha='center', va='bottom')
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'improvement_rates.png'), dpi=100, bbox_inches='tight')
-    
-    # Orijinal vs Optimize edilmiş süreler karşılaştırması
-    if improvement_data:
-        plt.figure(figsize=(12, 6))
-        
-        codes = list(improvement_data.keys())
-        original_times = [improvement_data[code]['original'] for code in codes]
-        optimized_times = [improvement_data[code]['optimized'] for code in codes]
-        
-        # En fazla 10 tasarım kodunu göster
-        if len(codes) > 10:
-            codes = codes[:10]
-            original_times = original_times[:10]
-            optimized_times = optimized_times[:10]
-        
-        x = np.arange(len(codes))
-        width = 0.35
-        
-        plt.bar(x - width/2, original_times, width, label='Orijinal Süre', color='orange', alpha=0.7)
-        plt.bar(x + width/2, optimized_times, width, label='Optimize Edilmiş Süre', color='green', alpha=0.7)
-        
-        plt.title('Orijinal vs Optimize Edilmiş Süreler')
-        plt.xlabel('Tasarım Kodu')
-        plt.ylabel('Süre (dk)')
-        plt.xticks(x, codes, rotation=45, ha='right')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'time_comparison.png'), dpi=100, bbox_inches='tight')
-    
-    plt.close('all')  # Tüm grafikleri kapat
+    from .taguchi_grafikleri import create_taguchi_visualizations as ciz
+    return ciz(parameter_effects, improvement_data, output_dir)
 
-def save_taguchi_results(tasarim_kodu, optimum_sure, optimum_seviye, iyilestirme_orani, method="Taguchi L27"):
-    """Taguchi optimizasyon sonuçlarını veritabanına kaydet"""
+def save_taguchi_results(tasarim_kodu, optimum_sure, optimum_seviye, iyilestirme_orani, method="Taguchi L27",
+                         hata_firlat=False):
+    """Taguchi optimizasyon sonuçlarını veritabanına kaydet; hatada False döner, hata_firlat=True ise fırlatır"""
     try:
         tasarim = TasarimKodu.objects.get(kod=tasarim_kodu)
         
@@ -566,55 +546,159 @@ def save_taguchi_results(tasarim_kodu, optimum_sure, optimum_seviye, iyilestirme
         return True
     except Exception as e:
         print(f"Taguchi sonuçları kaydedilemedi: {str(e)}")
+        if hata_firlat:
+            raise
         return False
 
-def main(save_results_to_db=True):
-    """Ana optimizasyon fonksiyonu"""
+def taguchi_parmak_izleri(amac_adi=""):
+    """
+    Her tasarım kodu için Taguchi girdilerinin (tasarım kodu satırı ve geçmiş süre verileri) parmak izini hesaplar.
+
+    amac_adi yapılandırılmış etkileşimli amacın adıdır; değişirse tüm kodlar yeniden hesaplanır.
+    """
+    sureler = GecmisSureVerisi.objects.order_by('tasarim__kod', 'id').values_list(
+        'tasarim__kod', 'departman', 'urun_adi', 'sure', 'kayit_index'
+    )
+    gecmis = gruplu_parmak_izleri((satir[0], satir[1:]) for satir in sureler)
+    return {
+        satir[0]: hesapla_parmak_izi([amac_adi, satir, gecmis.get(satir[0])])
+        for satir in TasarimKodu.objects.order_by('kod').values_list(
+            'kod', 'urun_adi', 'tahmini_montaj_suresi', 'minimum_yetkinlik_seviyesi',
+            'optimum_yetkinlik_seviyesi', 'departman'
+        )
+    }
+
+def etkilesimli_amac():
+    """
+    settings.TAGUCHI_ETKILESIMLI_AMAC ile yapılandırılmış amaç fonksiyonunu (dotted path) döndürür.
+
+    Yapılandırılmamışsa None döner ve toplamsal amaç için ayrışık optimizasyon kullanılır.
+    """
+    yol = getattr(settings, "TAGUCHI_ETKILESIMLI_AMAC", None)
+    return (yol, import_string(yol)) if yol else (None, None)
+
+def onceki_sonuclar():
+    """Kayıtlı TaguchiSonucu satırlarından main() ile aynı biçimde sonuç döndürür."""
+    final_results = [{
+        "tasarim_kodu": s["tasarim_kodu"],
+        "optimum_sure": s["optimum_sure"],
+        "iyilestirme_orani": s["iyilestirme_orani"],
+        "departman": s["departman"],
+        "guncellenme_tarihi": s["guncellenme_tarihi"].isoformat()
+    } for s in TaguchiSonucu.objects.values(
+        'tasarim_kodu', 'optimum_sure', 'iyilestirme_orani', 'departman', 'guncellenme_tarihi'
+    )]
+    ortalama_iyilestirme = np.mean([res['iyilestirme_orani'] for res in final_results]) if final_results else 0
+    return {
+        "success": True,
+        "message": "Taguchi girdileri değişmedi, önceki sonuçlar kullanılıyor.",
+        "taguchi_sonuclari": final_results,
+        "istatistikler": {
+            "ortalama_iyilestirme": ortalama_iyilestirme
+        }
+    }
+
+def optimizasyonu_hesapla(parameter_levels, analizler, amac=None):
+    """
+    Verilen parametre seviyeleri için Taguchi optimizasyonunu çalıştırır (veritabanına yazmaz).
+
+    amac None ise toplamsal amaç ayrışık olarak çözülür, aksi halde tüm parametrelerle ortak tasarım kullanılır.
+    Dönüş: (en iyi parametreler, parametre etkileri, iyileştirme verileri, yöntem adı)
+    """
+    if amac is None:
+        best_parameters, parameter_effects, improvement_data = decomposed_taguchi_optimization(
+            parameter_levels,
+            None,
+            level_count=3,
+            analizler=analizler
+        )
+        return best_parameters, parameter_effects, improvement_data, "Taguchi Ayrışık"
+
+    # Etkileşimli amaç: tüm parametrelerle ortak tasarım
+    best_parameters, experiments, snr_values, improvement_data = taguchi_optimization(
+        parameter_levels,
+        None,
+        level_count=3,
+        objective=amac,
+        analizler=analizler
+    )
+    parameter_effects = analyze_parameter_effects(parameter_levels, experiments, snr_values)
+    return best_parameters, parameter_effects, improvement_data, f"Taguchi L{len(experiments)}"
+
+def grafik_verisi():
+    """Kayıtlı sonuçların grafikleri için parametre etkilerini ve iyileştirme verilerini hesaplar (kaydetmez)."""
+    _, amac = etkilesimli_amac()
+    analizler = gecmis_analizleri()
+    parameter_levels = create_parameter_levels(load_tasarim_kodlari(), None, level_count=3, analizler=analizler)
+    _, parameter_effects, improvement_data, _ = optimizasyonu_hesapla(parameter_levels, analizler, amac)
+    return parameter_effects, improvement_data
+
+def main(save_results_to_db=True, force=False, tasarim_idler=None, hata_firlat=False):
+    """
+    Ana optimizasyon fonksiyonu
+
+    Amaç toplamsal olduğunda (varsayılan) her tasarım kodu ayrışık olarak ve yalnızca girdi parmak izi
+    değişen kodlar için çözülür; diğer kodların kayıtlı sonuçları korunur. settings.TAGUCHI_ETKILESIMLI_AMAC
+    yapılandırılmışsa tüm kodlar ortak bir ortogonal dizi tasarımıyla birlikte optimize edilir.
+    Hiçbir kodun girdisi değişmediyse kayıtlı sonuçlar döndürülür; force=True yeniden hesaplamayı zorlar.
+    tasarim_idler (değişiklik kuyruğundan gelen kirli tasarım kodları) boş bir küme ise girdiler okunmadan
+    kayıtlı sonuçlar döndürülür. hata_firlat=True ise hatalar sonuç sözlüğü yerine istisna olarak fırlatılır.
+    """
     try:
-        # Verileri yükle
-        tasarim_kodlari, gecmis_veriler, gecmis_veriler_ham = load_data()
-        if not all([tasarim_kodlari, gecmis_veriler, gecmis_veriler_ham]):
+        onceki_var = TaguchiSonucu.objects.exists()
+        if (save_results_to_db and not force and tasarim_idler is not None and not tasarim_idler
+                and onceki_var):
+            return onceki_sonuclar()
+
+        amac_adi, amac = etkilesimli_amac()
+        parmak_izleri = taguchi_parmak_izleri(amac_adi or "")
+        degisen, _ = degisen_anahtarlar(parmak_izleri, load_fingerprints("taguchi"))
+        if save_results_to_db and not force and not degisen and onceki_var:
+            return onceki_sonuclar()
+
+        # Verileri yükle (geçmiş analizler kod başına önbellekten gelir). Geçmiş süre verisi olmaması
+        # geçerli bir durumdur: create_parameter_levels bu kodlar için tahmini montaj süresini kullanır.
+        try:
+            tasarim_kodlari = load_tasarim_kodlari()
+            analizler = gecmis_analizleri()
+        except Exception as e:
+            print(f"Veri yükleme hatası: {str(e)}")
+            if hata_firlat:
+                raise
+            return {"success": False, "message": "Veri yükleme hatası!"}
+        if not tasarim_kodlari:
+            if hata_firlat:
+                raise RuntimeError("Taguchi için tasarım kodu bulunamadı!")
             return {"success": False, "message": "Veri yükleme hatası!"}
 
         # Parametre seviyelerini tüm tasarım kodları için oluştur
-        parameter_levels = create_parameter_levels(tasarim_kodlari, gecmis_veriler, level_count=3)
+        parameter_levels = create_parameter_levels(tasarim_kodlari, None, level_count=3, analizler=analizler)
 
-        # Taguchi optimizasyonunu tüm parametrelerle bir kerede çalıştır
-        best_parameters, experiments, snr_values, all_improvement_data = taguchi_optimization(
-            parameter_levels,
-            gecmis_veriler,
-            level_count=3
+        # Toplamsal amaçta yalnızca girdisi değişen kodlar çözülür
+        if amac is None and save_results_to_db and not force and onceki_var:
+            parameter_levels = {kod: v for kod, v in parameter_levels.items() if kod in degisen}
+        best_parameters, parameter_effects, all_improvement_data, method = optimizasyonu_hesapla(
+            parameter_levels, analizler, amac
         )
-        
-        # Parametre etkilerini analiz et
-        is_random = create_orthogonal_array(len(parameter_levels), 3) is None
-        parameter_effects = analyze_parameter_effects(parameter_levels, experiments, snr_values, is_random_sampling=is_random)
 
         final_results = []
+        kayit_basarili = True
         for kod, sonuc in parameter_effects.items():
             # Her parametre için en iyi seviyeyi (en yüksek SNR'ye sahip olanı) bul
             best_level_value = max(sonuc, key=sonuc.get)
-            
-            # Bu değere karşılık gelen seviye indeksini bul
-            levels_list = parameter_levels[kod]
-            try:
-                # Float karşılaştırması için hassasiyet
-                best_level_index = next(i for i, v in enumerate(levels_list) if np.isclose(v, best_level_value))
-            except StopIteration:
-                best_level_index = -1 # Bulunamazsa -1
-                print(f"Uyarı: {kod} için en iyi seviye değeri {best_level_value} seviye listesinde bulunamadı.")
-
-            optimum_sure = best_parameters.get(kod, 0)
-            iyilestirme = all_improvement_data.get(kod, {}).get('improvement', 0)
+            best_level_index = parameter_levels[kod].index(best_level_value)
+            optimum_sure = float(best_parameters.get(kod, 0))
+            iyilestirme = float(all_improvement_data.get(kod, {}).get('improvement', 0))
 
             # Sonuçları kaydet
             if save_results_to_db:
-                save_taguchi_results(
+                kayit_basarili &= save_taguchi_results(
                     tasarim_kodu=kod,
                     optimum_sure=optimum_sure,
                     optimum_seviye=best_level_index,
                     iyilestirme_orani=iyilestirme,
-                    method=f"Taguchi L{len(experiments)}"
+                    method=method,
+                    hata_firlat=hata_firlat
                 )
             
             final_results.append({
@@ -624,6 +708,13 @@ def main(save_results_to_db=True):
                 "departman": tasarim_kodlari.get(kod, {}).get('departman', 'Bilinmiyor'),
                 "guncellenme_tarihi": datetime.now().isoformat()
             })
+
+        if save_results_to_db:
+            # Kaydedilemeyen sonuçların kodları bir sonraki çalıştırmada yeniden hesaplanmalı
+            if kayit_basarili:
+                save_fingerprints("taguchi", parmak_izleri)
+            # Değişmeyen kodların kayıtlı sonuçları da yanıtın parçasıdır
+            final_results = onceki_sonuclar()["taguchi_sonuclari"]
             
         ortalama_iyilestirme = np.mean([res['iyilestirme_orani'] for res in final_results]) if final_results else 0
         
@@ -637,6 +728,8 @@ def main(save_results_to_db=True):
         }
         
     except Exception as e:
+        if hata_firlat:
+            raise
         import traceback
         print(f"Hata oluştu: {str(e)}\n{traceback.format_exc()}")
         return {"success": False, "message": f"Hata oluştu: {str(e)}"}
@@ -0,0 +1,177 @@
+import math
+import os
+import shutil
+import tempfile
+import numpy as np
+from django.templatetags.static import static
+from ..models import TaguchiSonucu
+from .fingerprint import hesapla_parmak_izi
+
+# Ana dizin yolunu belirle
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+GRAFIK_DIZINI = os.path.join(ROOT_DIR, 'static', 'img', 'taguchi')
+SUTUN_SAYISI = 3
+
+def _pyplot():
+    """matplotlib'i başsız (Agg) arka uçla ilk kullanımda yükler."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def create_taguchi_visualizations(parameter_effects, improvement_data, output_dir=None):
+    """
+    Taguchi optimizasyonu sonuçlarını görselleştir
+
+    Parametre etkileri grafiği her parametre sayısı için SUTUN_SAYISI sütunlu bir ızgaraya yerleşir.
+
+    Parametreler:
+    - parameter_effects: Parametre etkileri
+    - improvement_data: İyileştirme verileri
+    - output_dir: Grafiklerin yazılacağı klasör (varsayılan static/img/taguchi)
+    """
+    plt = _pyplot()
+
+    # Grafikleri kaydetmek için klasör oluştur
+    output_dir = output_dir or GRAFIK_DIZINI
+    os.makedirs(output_dir, exist_ok=True)
+    dosyalar = []
+
+    # Parametre etkileri grafiği
+    if parameter_effects:
+        satir_sayisi = math.ceil(len(parameter_effects) / SUTUN_SAYISI)
+        plt.figure(figsize=(12, 4 * satir_sayisi))
+
+        for i, (param, effects) in enumerate(parameter_effects.items()):
+            plt.subplot(satir_sayisi, SUTUN_SAYISI, i + 1)
+            plt.plot(range(1, len(effects) + 1), list(effects.values()), 'o-', linewidth=2)
+            plt.title(f'Parametre: {param}')
+            plt.xlabel('Seviye')
+            plt.ylabel('Ortalama SNR')
+            plt.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, 'parameter_effects.png'), dpi=100, bbox_inches='tight')
+        dosyalar.append('parameter_effects.png')
+
+    # İyileştirme oranları grafiği
+    if improvement_data:
+        plt.figure(figsize=(12, 6))
+
+        # En yüksek iyileştirme oranına göre sırala
+        sorted_improvements = sorted(improvement_data.items(), key=lambda x: x[1]['improvement'], reverse=True)
+        codes = [item[0] for item in sorted_improvements]
+        improvements = [item[1]['improvement'] for item in sorted_improvements]
+
+        # En fazla 15 tasarım kodunu göster
+        if len(codes) > 15:
+            codes = codes[:15]
+            improvements = improvements[:15]
+
+        bars = plt.bar(codes, improvements, alpha=0.7)
+        plt.title('Tasarım Kodlarına Göre İyileştirme Oranları')
+        plt.xlabel('Tasarım Kodu')
+        plt.ylabel('İyileştirme Oranı (%)')
+        plt.xticks(rotation=45, ha='right')
+        plt.grid(True, alpha=0.3)
+
+        # Değerleri çubukların üzerine ekle
+        for bar, value in zip(bars, improvements):
+            plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5, f'{value:.1f}%',
+                    ha='center', va='bottom')
+
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, 'improvement_rates.png'), dpi=100, bbox_inches='tight')
+        dosyalar.append('improvement_rates.png')
+
+    # Orijinal vs Optimize edilmiş süreler karşılaştırması
+    if improvement_data:
+        plt.figure(figsize=(12, 6))
+
+        codes = list(improvement_data.keys())
+        original_times = [improvement_data[code]['original'] for code in codes]
+        optimized_times = [improvement_data[code]['optimized'] for code in codes]
+
+        # En fazla 10 tasarım kodunu göster
+        if len(codes) > 10:
+            codes = codes[:10]
+            original_times = original_times[:10]
+            optimized_times = optimized_times[:10]
+
+        x = np.arange(len(codes))
+        width = 0.35
+
+        plt.bar(x - width/2, original_times, width, label='Orijinal Süre', color='orange', alpha=0.7)
+        plt.bar(x + width/2, optimized_times, width, label='Optimize Edilmiş Süre', color='green', alpha=0.7)
+
+        plt.title('Orijinal vs Optimize Edilmiş Süreler')
+        plt.xlabel('Tasarım Kodu')
+        plt.ylabel('Süre (dk)')
+        plt.xticks(x, codes, rotation=45, ha='right')
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+        plt.savefig(os.path.join(output_dir, 'time_comparison.png'), dpi=100, bbox_inches='tight')
+        dosyalar.append('time_comparison.png')
+
+    plt.close('all')  # Tüm grafikleri kapat
+    return dosyalar
+
+def sonuc_parmak_izi():
+    """Kayıtlı Taguchi sonuçlarının parmak izi; sonuçlar değiştiğinde grafik önbelleği geçersiz olur."""
+    return hesapla_parmak_izi(TaguchiSonucu.objects.order_by('tasarim_kodu').values_list(
+        'tasarim_kodu', 'optimum_sure', 'optimum_seviye', 'iyilestirme_orani', 'method'
+    ))
+
+def _grafik_adresleri(parmak_izi, klasor):
+    """Önbellek klasöründeki PNG dosyalarının static adreslerini döndürür."""
+    return {
+        "parmak_izi": parmak_izi,
+        "grafikler": {
+            dosya: static(f"img/taguchi/{os.path.basename(klasor)}/{dosya}")
+            for dosya in sorted(os.listdir(klasor)) if dosya.endswith('.png')
+        }
+    }
+
+def onbellekteki_grafikler():
+    """Güncel sonuçlar için daha önce çizilmiş grafikler varsa adreslerini, yoksa None döndürür."""
+    parmak_izi = sonuc_parmak_izi()
+    klasor = os.path.join(GRAFIK_DIZINI, parmak_izi[:16])
+    if not os.path.isdir(klasor):
+        return None
+    return _grafik_adresleri(parmak_izi, klasor)
+
+def taguchi_grafiklerini_olustur(force=False):
+    """
+    Kayıtlı Taguchi sonuçlarının grafiklerini çizer ve sonuç parmak izine göre önbelleğe alır.
+
+    Aynı parmak izi için grafikler zaten varsa yeniden çizilmez. Grafikler geçici bir klasöre çizilip
+    tek adımda yerine taşınır; eski parmak izlerine ait klasörler silinir.
+    """
+    from .taguchi import grafik_verisi
+
+    parmak_izi = sonuc_parmak_izi()
+    klasor = os.path.join(GRAFIK_DIZINI, parmak_izi[:16])
+    if os.path.isdir(klasor) and not force:
+        return _grafik_adresleri(parmak_izi, klasor)
+
+    parameter_effects, improvement_data = grafik_verisi()
+    os.makedirs(GRAFIK_DIZINI, exist_ok=True)
+    gecici = tempfile.mkdtemp(prefix='.cizim-', dir=GRAFIK_DIZINI)
+    try:
+        create_taguchi_visualizations(parameter_effects, improvement_data, gecici)
+        if os.path.isdir(klasor):
+            shutil.rmtree(klasor)
+        os.replace(gecici, klasor)
+    finally:
+        if os.path.isdir(gecici):
+            shutil.rmtree(gecici, ignore_errors=True)
+
+    # Eski parmak izlerine ait grafikleri temizle
+    for ad in os.listdir(GRAFIK_DIZINI):
+        yol = os.path.join(GRAFIK_DIZINI, ad)
+        if os.path.isdir(yol) and yol != klasor and not ad.startswith('.'):
+            shutil.rmtree(yol, ignore_errors=True)
+
+    return _grafik_adresleri(parmak_izi, klasor)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CizelgelemeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cizelgeleme'
+
+    def ready(self):
+        # Değişiklik kuyruğunu besleyen model sinyallerini kaydet
+        from . import signals  # noqa: F401
+        # Optimizasyon hattı kilidinin paylaşılan önbellek gereksinimini denetle
+        from . import checks  # noqa: F401
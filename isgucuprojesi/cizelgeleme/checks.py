@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Yalnızca tek bir süreç içinde geçerli olan önbellek arka uçları
+SUREC_ICI_ONBELLEKLER = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+@register()
+def optimizasyon_kilidi_onbellegi(app_configs, **kwargs):
+    """Optimizasyon hattı kilidinin Celery süreçleri arasında paylaşılan bir önbellekte tutulduğunu denetler."""
+    arka_uc = getattr(settings, 'CACHES', {}).get('default', {}).get(
+        'BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+    )
+    if arka_uc in SUREC_ICI_ONBELLEKLER:
+        return [Warning(
+            f"Varsayılan önbellek ({arka_uc}) süreçler arasında paylaşılmıyor.",
+            hint="Optimizasyon hattı kilidi ve bekleyen tetik bayrağı için CACHES['default'] olarak Redis, "
+                 "Memcached veya veritabanı önbelleği yapılandırın; aksi halde çakışan çalıştırmalar önlenemez.",
+            id='cizelgeleme.W001',
+        )]
+    return []
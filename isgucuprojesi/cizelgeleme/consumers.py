@@ -1,8 +1,25 @@
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from urllib.parse import parse_qs
 import json
 
+from .degisiklik_akisi import degisiklikleri_getir
+
 class OptimizationConsumer(AsyncWebsocketConsumer):
+    """
+    Optimizasyon sonuçlarının sürümlü değişiklik akışı.
+
+    İstemci son gördüğü sürümle abone olur (ws/optimizations/?surum=N veya {"tip": "abone", "surum": N});
+    o sürümden bu yana değişen kayıtları, sürüm verilmediyse tam görüntüyü alır. Sonraki yayınlarda
+    yalnızca değişiklikler, değişiklik yoksa nabız gönderilir. Mesajlar:
+    - {"tip": "degisiklik", "surum", "tam", "calisanlar", "tasarim_kodlari", "atamalar"}; silinen kayıtlar null
+    - {"tip": "nabiz", "surum"}
+    Elle yapılan iş/atama değişiklikleri sürüm artırmadan, istemcinin güncel sürümüyle yalnızca
+    atamalar bölümünü taşıyan bir "degisiklik" mesajı olarak iletilir; bir sonraki yayın bunları da içerir.
+    """
+
     async def connect(self):
+        self.surum = None
         # Bağlantı kurulduğunda optimization_updates grubuna katıl
         await self.channel_layer.group_add(
             'optimization_updates',
@@ -10,6 +27,9 @@ class OptimizationConsumer(AsyncWebsocketConsumer):
         )
         await self.accept()
 
+        sorgu = parse_qs(self.scope.get('query_string', b'').decode())
+        await self.abone_ol(sorgu.get('surum', [None])[0])
+
     async def disconnect(self, close_code):
         # Bağlantı kesildiğinde gruptan ayrıl
         await self.channel_layer.group_discard(
@@ -17,10 +37,47 @@ class OptimizationConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
 
-    async def optimization_update(self, event):
-        # Optimizasyon sonuçlarını client'a gönder
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            mesaj = json.loads(text_data or '{}')
+        except json.JSONDecodeError:
+            return
+        if mesaj.get('tip') == 'abone':
+            await self.abone_ol(mesaj.get('surum'))
+
+    async def abone_ol(self, surum):
+        """İstemcinin sürümünden bu yana biriken değişiklikleri (veya tam görüntüyü) gönderir."""
+        try:
+            surum = int(surum) if surum not in (None, '') else None
+        except (TypeError, ValueError):
+            surum = None
+        guncel_surum, degisiklikler, tam = await database_sync_to_async(degisiklikleri_getir)(surum)
+        await self.degisiklik_gonder(guncel_surum, degisiklikler, tam)
+
+    async def degisiklik_gonder(self, surum, degisiklikler, tam=False):
+        self.surum = surum
+        if not degisiklikler and not tam:
+            await self.send(text_data=json.dumps({'tip': 'nabiz', 'surum': surum}))
+            return
         await self.send(text_data=json.dumps({
-            'monte_carlo': event['monte_carlo'],
-            'taguchi': event['taguchi'],
-            'genetic': event['genetic']
-        })) 
\ No newline at end of file
+            'tip': 'degisiklik',
+            'surum': surum,
+            'tam': tam,
+            'calisanlar': degisiklikler.get('calisanlar', {}),
+            'tasarim_kodlari': degisiklikler.get('tasarim_kodlari', {}),
+            'atamalar': degisiklikler.get('atamalar', {})
+        }))
+
+    async def optimization_update(self, event):
+        # İstemci bir önceki yayında güncelse yayının değişikliklerini doğrudan ilet
+        if self.surum == event['onceki_surum']:
+            await self.degisiklik_gonder(event['surum'], event['degisiklikler'])
+        elif self.surum is None or self.surum < event['surum']:
+            # Geride kalan istemci eksik sürümleri veritabanındaki akıştan tamamlar
+            await self.abone_ol(self.surum)
+
+    async def is_degisikligi(self, event):
+        # Henüz abone olmamış istemci bu değişikliği ilk görüntüsüyle zaten alacak
+        if self.surum is None:
+            return
+        await self.degisiklik_gonder(self.surum, {'atamalar': event['atamalar']})
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import threading
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from .models import (
+    IsAtama, MonteCarloSonuc, MonteCarloTasarimSonuc, TaguchiSonucu, GenetikAtama, YayinDegisikligi
+)
+
+# Değişiklik akışının bölümleri: çalışanlar (Monte Carlo), tasarım kodları (Taguchi + GA ekipleri), iş atamaları
+BOLUMLER = ('calisanlar', 'tasarim_kodlari', 'atamalar')
+
+def _calisanlar():
+    """Çalışan id'si -> Monte Carlo sonucu ve tasarım bazlı performansları."""
+    calisanlar = {}
+    for sonuc in MonteCarloSonuc.objects.filter(calisan__isnull=False).order_by('id').values(
+        'calisan_id', 'ortalama_performans', 'risk_skoru', 'gecikme_olasiligi', 'performans_kararliligi',
+        ad_soyad=F('calisan__ad_soyad')
+    ):
+        anahtar = str(sonuc.pop('calisan_id'))
+        if anahtar not in calisanlar:
+            sonuc['tasarim_bazli_performans'] = []
+            calisanlar[anahtar] = sonuc
+
+    for tasarim_sonuc in MonteCarloTasarimSonuc.objects.filter(
+        calisan__isnull=False, tasarim__isnull=False
+    ).order_by('id').values('calisan_id', 'ortalama', 'risk_skoru', 'gecikme_olasiligi', tasarim_kodu=F('tasarim__kod')):
+        kayit = calisanlar.get(str(tasarim_sonuc['calisan_id']))
+        if kayit is not None:
+            kayit['tasarim_bazli_performans'].append({
+                'tasarim_kodu': tasarim_sonuc['tasarim_kodu'],
+                'performans_ort': tasarim_sonuc['ortalama'],
+                'risk': tasarim_sonuc['risk_skoru'],
+                'gecikme': tasarim_sonuc['gecikme_olasiligi']
+            })
+    return calisanlar
+
+def _tasarim_kodlari():
+    """Tasarım kodu -> Taguchi sonucu ve senaryo başına GA ile atanan ekip."""
+    tasarim_kodlari = {
+        sonuc['tasarim_kodu']: {**sonuc, 'ekipler': {}}
+        for sonuc in TaguchiSonucu.objects.order_by('tasarim_kodu').values(
+            'tasarim_kodu', 'optimum_sure', 'optimum_seviye', 'iyilestirme_orani', 'method', 'departman',
+            'guncellenme_tarihi'
+        )
+    }
+    for kod, senaryo, seviye, ad_soyad in GenetikAtama.objects.filter(atanma_tipi='atanan').order_by('id').values_list(
+        'sonuc__tasarim__kod', 'sonuc__senaryo', 'seviye', 'calisan__ad_soyad'
+    ):
+        kayit = tasarim_kodlari.setdefault(kod, {'tasarim_kodu': kod, 'ekipler': {}})
+        kayit['ekipler'].setdefault(senaryo, []).append({'seviye': seviye, 'ad_soyad': ad_soyad})
+    return tasarim_kodlari
+
+def _atamalar(is_idler=None):
+    """Aktif iş id'si -> seviye başına atanan çalışan adları; is_idler verilirse yalnızca bu işler."""
+    atamalar = {}
+    sorgu = IsAtama.objects.filter(is_objesi__durum__in=['beklemede', 'devam_ediyor'], calisan__isnull=False)
+    if is_idler is not None:
+        sorgu = sorgu.filter(is_objesi_id__in=is_idler)
+    for is_id, kod, durum, seviye, ad_soyad in sorgu.order_by('is_objesi_id', 'id').values_list(
+        'is_objesi_id', 'is_objesi__tasarim__kod', 'is_objesi__durum', 'seviye', 'calisan__ad_soyad'
+    ):
+        kayit = atamalar.setdefault(str(is_id), {
+            'kod': kod, 'durum': durum, 'atananlar': {'ustabasi': [], 'kalifiyeli': [], 'cirak': []}
+        })
+        kayit['atananlar'].setdefault(seviye, []).append(ad_soyad)
+    return atamalar
+
+def anlik_goruntu():
+    """Akışın tüm bölümlerinin güncel durumu; anahtarlar JSON uyumlu olması için metindir."""
+    return {
+        'calisanlar': _calisanlar(),
+        'tasarim_kodlari': _tasarim_kodlari(),
+        'atamalar': _atamalar(),
+    }
+
+def _ozet(deger):
+    """Bir kaydın içerik özeti; yalnızca özeti değişen kayıtlar akışa girer."""
+    metin = json.dumps(deger, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(metin.encode("utf-8")).hexdigest()[:16]
+
+def _jsona_uygun(deger):
+    """Tarih gibi değerleri JSONField'a yazılabilir biçime çevirir."""
+    return json.loads(json.dumps(deger, cls=DjangoJSONEncoder))
+
+@transaction.atomic
+def yayin_degisikligini_kaydet(surum):
+    """
+    Yayınlanan sürümün bir önceki yayına göre değişikliklerini hesaplar ve kaydeder.
+
+    Kayıt başına özetler bir önceki yayınla karşılaştırılır; değişen kayıtlar yeni değerleriyle,
+    silinenler None ile akışa girer. En son settings.DEGISIKLIK_AKISI_SAKLAMA_SAYISI (varsayılan 100)
+    yayın saklanır. (onceki_surum, degisiklikler) döndürür.
+    """
+    onceki = YayinDegisikligi.objects.exclude(calisma_id=surum).order_by('-calisma_id').first()
+    onceki_ozetler = onceki.ozetler if onceki else {}
+
+    goruntu = anlik_goruntu()
+    degisiklikler = {}
+    ozetler = {}
+    for bolum in BOLUMLER:
+        eski = onceki_ozetler.get(bolum, {})
+        ozetler[bolum] = {anahtar: _ozet(deger) for anahtar, deger in goruntu[bolum].items()}
+        fark = {anahtar: deger for anahtar, deger in goruntu[bolum].items() if eski.get(anahtar) != ozetler[bolum][anahtar]}
+        fark.update({anahtar: None for anahtar in eski if anahtar not in goruntu[bolum]})
+        if fark:
+            degisiklikler[bolum] = fark
+
+    degisiklikler = _jsona_uygun(degisiklikler)
+    YayinDegisikligi.objects.update_or_create(calisma_id=surum, defaults={
+        'onceki_surum': onceki.calisma_id if onceki else 0,
+        'degisiklikler': degisiklikler,
+        'ozetler': ozetler,
+    })
+
+    # Eski yayınları temizle; bunlardan geride kalan istemciler tam görüntü alır
+    saklama = getattr(settings, "DEGISIKLIK_AKISI_SAKLAMA_SAYISI", 100)
+    sinir = YayinDegisikligi.objects.order_by('-calisma_id').values_list('calisma_id', flat=True)[saklama:saklama + 1]
+    if sinir:
+        YayinDegisikligi.objects.filter(calisma_id__lte=sinir[0]).delete()
+
+    return (onceki.calisma_id if onceki else 0), degisiklikler
+
+def son_surum():
+    """Akıştaki en son yayının sürümü; henüz yayın yoksa 0."""
+    return YayinDegisikligi.objects.order_by('-calisma_id').values_list('calisma_id', flat=True).first() or 0
+
+def degisiklikleri_getir(surum):
+    """
+    Bir istemcinin son gördüğü sürümden bu yana biriken değişiklikleri döndürür.
+
+    Ara yayınların değişiklikleri sırayla birleştirilir (bir kaydın en son değeri kalır). İstemcinin
+    sürümü bilinmiyorsa, saklama dışında kaldıysa veya verilmediyse tam görüntü gönderilir.
+    (guncel_surum, degisiklikler, tam) döndürür.
+    """
+    if surum:
+        kayitlar = list(YayinDegisikligi.objects.filter(calisma_id__gt=surum).order_by('calisma_id').values_list(
+            'calisma_id', 'onceki_surum', 'degisiklikler'
+        ))
+        if not kayitlar and YayinDegisikligi.objects.filter(calisma_id=surum).exists():
+            return surum, {}, False
+        if kayitlar and kayitlar[0][1] == surum:
+            birlesik = {}
+            for _, _, degisiklikler in kayitlar:
+                for bolum, fark in degisiklikler.items():
+                    birlesik.setdefault(bolum, {}).update(fark)
+            return kayitlar[-1][0], birlesik, False
+
+    return son_surum(), _jsona_uygun(anlik_goruntu()), True
+
+# Elle yapılan iş/atama değişikliklerinin yayınlanmayı bekleyen iş id'leri (iş parçacığı başına)
+_bekleyen_isler = threading.local()
+
+def is_degisikligini_bildir(is_id):
+    """
+    Bir işin ataması elle değiştiğinde bağlı istemcilere işlem onaylandıktan sonra bildirilir.
+
+    Aynı işlemdeki değişiklikler tek mesajda toplanır: her çağrı id'yi bekleyenlere ekler ve bir
+    on_commit geri çağrısı kaydeder; ilk çalışan geri çağrı tüm bekleyenleri gönderir, diğerleri boş
+    döner. Geri alınan bir işlemin id'leri bir sonraki gönderimde güncel değerleriyle gider.
+    """
+    if is_id is None:
+        return
+    if not hasattr(_bekleyen_isler, 'idler'):
+        _bekleyen_isler.idler = set()
+    _bekleyen_isler.idler.add(is_id)
+    transaction.on_commit(_is_degisikliklerini_gonder)
+
+def _is_degisikliklerini_gonder():
+    idler = getattr(_bekleyen_isler, 'idler', None)
+    if not idler:
+        return
+    _bekleyen_isler.idler = set()
+    try:
+        guncel = _atamalar(idler)
+        # Artık aktif olmayan (silinen, tamamlanan) veya ataması kalmayan işler akıştan çıkarılır
+        atamalar = {str(is_id): guncel.get(str(is_id)) for is_id in idler}
+        channel_layer = get_channel_layer()
+        if channel_layer is not None:
+            async_to_sync(channel_layer.group_send)('optimization_updates', {
+                'type': 'is_degisikligi',
+                'atamalar': atamalar
+            })
+    except Exception as e:
+        print(f"İş değişikliği WebSocket üzerinden gönderilemedi: {str(e)}")
@@ -0,0 +1,30 @@
+from .models import DegisiklikKuyrugu
+
+# Toplu işlemler (bulk_create, update, queryset.delete) model sinyali üretmez; bu yollarla yapılan
+# değişiklikler için kuyruga_ekle doğrudan çağrılmalıdır.
+
+def kuyruga_ekle(calisan_idler=(), tasarim_idler=()):
+    """Verilen çalışan ve tasarım kodu kimliklerini değişiklik kuyruğuna ekler."""
+    DegisiklikKuyrugu.objects.bulk_create(
+        [DegisiklikKuyrugu(varlik_tipi='calisan', varlik_id=i) for i in set(calisan_idler) if i is not None] +
+        [DegisiklikKuyrugu(varlik_tipi='tasarim', varlik_id=i) for i in set(tasarim_idler) if i is not None]
+    )
+
+def kuyrugu_oku():
+    """
+    Kuyruktaki kirli kimlikleri tekilleştirerek okur; kuyruk silinmez.
+
+    Dönüş: (son_id, {çalışan id}, {tasarım kodu id}). İşlem başarıyla bittiğinde kuyrugu_onayla(son_id)
+    çağrılır; okuma sırasında eklenen kayıtlar bir sonraki çalıştırmaya kalır.
+    """
+    calisan_idler, tasarim_idler = set(), set()
+    son_id = 0
+    for kayit_id, varlik_tipi, varlik_id in DegisiklikKuyrugu.objects.order_by('id').values_list(
+            'id', 'varlik_tipi', 'varlik_id'):
+        son_id = kayit_id
+        (calisan_idler if varlik_tipi == 'calisan' else tasarim_idler).add(varlik_id)
+    return son_id, calisan_idler, tasarim_idler
+
+def kuyrugu_onayla(son_id):
+    """son_id'ye kadar (dahil) işlenmiş kuyruk kayıtlarını siler."""
+    DegisiklikKuyrugu.objects.filter(id__lte=son_id).delete()
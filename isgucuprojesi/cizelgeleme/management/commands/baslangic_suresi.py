@@ -0,0 +1,52 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from django.core.management.base import BaseCommand
+
+# Web sürecinin başlangıcında yüklenmemesi gereken ağır modüller
+AGIR_MODULLER = ("numpy", "scipy", "matplotlib")
+
+# Ayrı bir yorumlayıcıda çalışır: Django kurulduktan sonra cizelgeleme.views içe aktarımını ölçer
+OLCUM_BETIGI = """
+import json, sys, time
+import django
+django.setup()
+baslangic = time.perf_counter()
+import {modul}
+sure = time.perf_counter() - baslangic
+print(json.dumps({{"sure": sure, "moduller": [m for m in {agir!r} if m in sys.modules]}}))
+"""
+
+class Command(BaseCommand):
+    help = "cizelgeleme.views modülünün soğuk içe aktarım süresini ölçer (web süreci başlangıç maliyeti)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tekrar", type=int, default=5, help="Ölçüm tekrar sayısı")
+        parser.add_argument("--modul", default="cizelgeleme.views", help="Ölçülecek modül")
+
+    def handle(self, *args, **options):
+        betik = OLCUM_BETIGI.format(modul=options["modul"], agir=AGIR_MODULLER)
+        ortam = dict(os.environ)
+        ortam.setdefault("DJANGO_SETTINGS_MODULE", "isgucuprojesi.settings")
+
+        sureler = []
+        yuklenen = set()
+        for _ in range(options["tekrar"]):
+            # Her ölçüm yeni bir süreçte yapılır; böylece modül önbelleği ölçümü etkilemez
+            cikti = subprocess.run(
+                [sys.executable, "-c", betik], capture_output=True, text=True, env=ortam, check=True
+            ).stdout
+            sonuc = json.loads(cikti.strip().splitlines()[-1])
+            sureler.append(sonuc["sure"])
+            yuklenen.update(sonuc["moduller"])
+
+        self.stdout.write(
+            f"{options['modul']} içe aktarımı ({options['tekrar']} tekrar): "
+            f"en az {min(sureler) * 1000:.1f} ms, medyan {statistics.median(sureler) * 1000:.1f} ms"
+        )
+        if yuklenen:
+            self.stdout.write(self.style.WARNING(f"Başlangıçta yüklenen ağır modüller: {', '.join(sorted(yuklenen))}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Başlangıçta ağır modül (NumPy/SciPy/matplotlib) yüklenmiyor."))
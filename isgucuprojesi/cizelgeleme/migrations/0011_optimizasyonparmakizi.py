@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cizelgeleme', '0010_is_taseron_cirak_is_taseron_kalifiyeli_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OptimizasyonParmakIzi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asama', models.CharField(help_text='Optimizasyon aşaması (monte_carlo, taguchi, genetik)', max_length=30)),
+                ('anahtar', models.CharField(blank=True, default='', help_text='Aşama içindeki varlık; boşsa aşamanın tamamı', max_length=100)),
+                ('parmak_izi', models.CharField(max_length=64)),
+                ('guncellenme_tarihi', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('asama', 'anahtar')},
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cizelgeleme', '0011_optimizasyonparmakizi'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DegisiklikKuyrugu',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('varlik_tipi', models.CharField(choices=[('calisan', 'Çalışan'), ('tasarim', 'Tasarım Kodu')], max_length=10)),
+                ('varlik_id', models.BigIntegerField()),
+            ],
+        ),
+    ]
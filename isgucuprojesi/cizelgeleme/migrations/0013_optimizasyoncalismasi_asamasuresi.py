@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cizelgeleme', '0012_degisiklikkuyrugu'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OptimizasyonCalismasi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('baslangic', models.DateTimeField(auto_now_add=True)),
+                ('bitis', models.DateTimeField(blank=True, null=True)),
+                ('durum', models.CharField(choices=[('calisiyor', 'Çalışıyor'), ('yayinlandi', 'Yayınlandı'), ('hata', 'Hata')], default='calisiyor', max_length=12)),
+                ('kirli_calisan_sayisi', models.PositiveIntegerField(default=0)),
+                ('kirli_tasarim_sayisi', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AsamaSuresi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asama', models.CharField(help_text='Hat aşaması (monte_carlo, taguchi, genetik, atama, yayin)', max_length=30)),
+                ('sure', models.FloatField(help_text='Aşama süresi (saniye)')),
+                ('basarili', models.BooleanField(default=True)),
+                ('calisma', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asamalar', to='cizelgeleme.optimizasyoncalismasi')),
+            ],
+        ),
+    ]
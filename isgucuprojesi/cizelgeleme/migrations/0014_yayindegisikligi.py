@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cizelgeleme', '0013_optimizasyoncalismasi_asamasuresi'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='YayinDegisikligi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('onceki_surum', models.PositiveIntegerField(default=0, help_text='Bir önceki yayının sürümü (0: ilk yayın)')),
+                ('degisiklikler', models.JSONField(default=dict, help_text='Bölüm -> {anahtar: yeni değer veya silindiyse null}')),
+                ('ozetler', models.JSONField(default=dict, help_text='Bölüm -> {anahtar: içerik özeti}; sonraki yayının karşılaştırma tabanı')),
+                ('calisma', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='degisiklik', to='cizelgeleme.optimizasyoncalismasi')),
+            ],
+        ),
+    ]
@@ -176,3 +176,65 @@ class IsAtama(models.Model):
     def __str__(self):
         return f"{self.calisan.ad_soyad} → {self.is_objesi.proje_adi} ({self.seviye})"
 
+
+
+class OptimizasyonParmakIzi(models.Model):
+    asama = models.CharField(max_length=30, help_text="Optimizasyon aşaması (monte_carlo, taguchi, genetik)")
+    anahtar = models.CharField(max_length=100, blank=True, default='', help_text="Aşama içindeki varlık; boşsa aşamanın tamamı")
+    parmak_izi = models.CharField(max_length=64)
+    guncellenme_tarihi = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('asama', 'anahtar')
+
+    def __str__(self):
+        return f"{self.asama} | {self.anahtar or '*'} | {self.parmak_izi[:12]}"
+
+
+class DegisiklikKuyrugu(models.Model):
+    """Optimizasyon hattının yeniden hesaplaması gereken (kirli) çalışan ve tasarım kodu kimlikleri."""
+    varlik_tipi = models.CharField(max_length=10, choices=[
+        ('calisan', 'Çalışan'),
+        ('tasarim', 'Tasarım Kodu')
+    ])
+    varlik_id = models.BigIntegerField()
+
+    def __str__(self):
+        return f"{self.varlik_tipi} #{self.varlik_id}"
+
+
+class OptimizasyonCalismasi(models.Model):
+    """Optimizasyon hattının bir çalıştırması; yayınlanan çalıştırmanın id'si sonuç sürümüdür."""
+    baslangic = models.DateTimeField(auto_now_add=True)
+    bitis = models.DateTimeField(null=True, blank=True)
+    durum = models.CharField(max_length=12, default='calisiyor', choices=[
+        ('calisiyor', 'Çalışıyor'),
+        ('yayinlandi', 'Yayınlandı'),
+        ('hata', 'Hata')
+    ])
+    kirli_calisan_sayisi = models.PositiveIntegerField(default=0)
+    kirli_tasarim_sayisi = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Çalıştırma #{self.id} ({self.durum})"
+
+
+class AsamaSuresi(models.Model):
+    calisma = models.ForeignKey(OptimizasyonCalismasi, on_delete=models.CASCADE, related_name="asamalar")
+    asama = models.CharField(max_length=30, help_text="Hat aşaması (monte_carlo, taguchi, genetik, atama, yayin)")
+    sure = models.FloatField(help_text="Aşama süresi (saniye)")
+    basarili = models.BooleanField(default=True)
+
+    def __str__(self):
+        return f"#{self.calisma_id} {self.asama}: {self.sure:.2f} sn"
+
+
+class YayinDegisikligi(models.Model):
+    """Bir yayının bir önceki yayına göre değişen çalışan, tasarım kodu ve iş atamaları (değişiklik akışı)."""
+    calisma = models.OneToOneField(OptimizasyonCalismasi, on_delete=models.CASCADE, related_name="degisiklik")
+    onceki_surum = models.PositiveIntegerField(default=0, help_text="Bir önceki yayının sürümü (0: ilk yayın)")
+    degisiklikler = models.JSONField(default=dict, help_text="Bölüm -> {anahtar: yeni değer veya silindiyse null}")
+    ozetler = models.JSONField(default=dict, help_text="Bölüm -> {anahtar: içerik özeti}; sonraki yayının karşılaştırma tabanı")
+
+    def __str__(self):
+        return f"Sürüm {self.calisma_id} (önceki {self.onceki_surum})"
@@ -0,0 +1,206 @@
+from itertools import groupby
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q
+from .models import (
+    Is, IsAtama, TasarimKodu, MonteCarloSonuc, MonteCarloTasarimSonuc, GenetikAtama, GenetikSonuc,
+    TaguchiSonucu, OptimizasyonCalismasi
+)
+
+# İş çizelgesi sayfasının önceden hesaplanmış okuma modeli tek bir önbellek anahtarında tutulur.
+# Model, oluşturulmaya başlandığı andaki geçersiz kılma sayacıyla birlikte saklanır; sayaç o zamandan
+# beri arttıysa model eskidir ve okunmaz.
+PANO_ANAHTARI = 'is_cizelgesi:pano'
+PANO_SAYAC_ANAHTARI = 'is_cizelgesi:pano:sayac'
+
+DURUM_MAP = {
+    'beklemede': 'Beklemede',
+    'devam_ediyor': 'Devam Ediyor',
+    'tamamlandi': 'Tamamlandı'
+}
+
+TASERON_ETIKETLERI = {
+    'ustabasi': "Taşeron İşçi (Ustabaşı)",
+    'kalifiyeli': "Taşeron İşçi (Kalifiyeli)",
+    'cirak': "Taşeron İşçi (Çırak)",
+}
+
+def _is_listesi():
+    """İşleri atanan çalışan adları ve taşeronlarla birlikte döndürür (2 sorgu)."""
+    atamalar = {}
+    for is_id, seviye, ad_soyad in (IsAtama.objects.filter(calisan__isnull=False)
+                                    .order_by('is_objesi_id', 'id')
+                                    .values_list('is_objesi_id', 'seviye', 'calisan__ad_soyad')):
+        atamalar.setdefault(is_id, {'ustabasi': [], 'kalifiyeli': [], 'cirak': []})[seviye].append(ad_soyad)
+
+    gorsel_is_listesi = []
+    for is_obj in Is.objects.order_by('id').values(
+        'id', 'proje_adi', 'teslimat_tarihi', 'oncelik', 'durum', 'kalan_sure',
+        'taseron_ustabasi', 'taseron_kalifiyeli', 'taseron_cirak', kod=F('tasarim__kod')
+    ):
+        atanan_calisanlar = atamalar.get(is_obj['id'], {'ustabasi': [], 'kalifiyeli': [], 'cirak': []})
+
+        # Taşeronları ekle
+        for seviye, etiket in TASERON_ETIKETLERI.items():
+            atanan_calisanlar[seviye].extend([etiket] * is_obj[f'taseron_{seviye}'])
+
+        gorsel_is_listesi.append({
+            'id': is_obj['id'],
+            'kod': is_obj['kod'],
+            'proje_adi': is_obj['proje_adi'],
+            'teslimat_tarihi': is_obj['teslimat_tarihi'],
+            'oncelik': is_obj['oncelik'],
+            'durum': is_obj['durum'],
+            'durum_gosterim': DURUM_MAP.get(is_obj['durum'], is_obj['durum']),
+            'kalan_sure': is_obj['kalan_sure'],
+            'atanan_calisanlar': atanan_calisanlar
+        })
+    return gorsel_is_listesi
+
+def _monte_carlo_sonuclari():
+    """Çalışan adına göre Monte Carlo sonuçlarını ve tasarım bazlı performanslarını döndürür (2 sorgu)."""
+    calisan_sonuclari = {}
+    for sonuc in (MonteCarloSonuc.objects.filter(calisan__isnull=False).order_by('id').values(
+            'ortalama_performans', 'risk_skoru', 'gecikme_olasiligi', 'performans_kararliligi',
+            calisan_adi=F('calisan__ad_soyad'))):
+        calisan_adi = sonuc.pop('calisan_adi')
+        if calisan_adi not in calisan_sonuclari:
+            sonuc['tasarim_bazli_performans'] = []
+            calisan_sonuclari[calisan_adi] = sonuc
+
+    for tasarim_sonuc in (MonteCarloTasarimSonuc.objects.filter(calisan__isnull=False, tasarim__isnull=False)
+                          .order_by('id').values(
+                              'ortalama', 'risk_skoru', 'gecikme_olasiligi',
+                              calisan_adi=F('calisan__ad_soyad'), tasarim_kodu=F('tasarim__kod'))):
+        if tasarim_sonuc['calisan_adi'] in calisan_sonuclari:
+            calisan_sonuclari[tasarim_sonuc['calisan_adi']]['tasarim_bazli_performans'].append({
+                'tasarim_kodu': tasarim_sonuc['tasarim_kodu'],
+                'performans_ort': tasarim_sonuc['ortalama'],
+                'risk': tasarim_sonuc['risk_skoru'],
+                'gecikme': tasarim_sonuc['gecikme_olasiligi']
+            })
+    return calisan_sonuclari
+
+def _genetik_gruplu():
+    """Genetik sonuçları senaryolara göre gruplar; atamalar tek sorguda okunur (2 sorgu)."""
+    sonuclar = list(GenetikSonuc.objects.order_by('-kayit_tarihi').values(
+        'id', 'senaryo', 'kayit_tarihi', tasarim_kodu=F('tasarim__kod')
+    ))
+    atamalar = {}
+    satirlar = (GenetikAtama.objects.filter(sonuc_id__in=[s['id'] for s in sonuclar])
+                .order_by('sonuc_id', 'atanma_tipi', 'id')
+                .values_list('sonuc_id', 'atanma_tipi', 'seviye', 'uygunluk_orani', 'calisan__ad_soyad'))
+    for (sonuc_id, atanma_tipi), grup in groupby(satirlar, key=lambda s: (s[0], s[1])):
+        liste = [
+            {'seviye': seviye, 'uygunluk_orani': oran, 'calisan': {'ad_soyad': ad_soyad}}
+            for _, _, seviye, oran, ad_soyad in grup
+        ]
+        if atanma_tipi == 'alternatif':
+            # Alternatifler uygunluk oranına göre azalan sırada gösterilir
+            liste.sort(key=lambda a: (a['uygunluk_orani'] is None, -(a['uygunluk_orani'] or 0)))
+        atamalar[(sonuc_id, atanma_tipi)] = liste
+
+    # Genetik sonuçları senaryolara göre grupla
+    genetik_gruplu = {
+        'normal': [],
+        'kritik': []
+    }
+    for sonuc in sonuclar:
+        atanan = atamalar.get((sonuc['id'], 'atanan'))
+        if atanan:
+            genetik_gruplu[sonuc['senaryo']].append({
+                'tasarim_kodu': sonuc['tasarim_kodu'],
+                'atamalar': atanan,
+                'alternatifler': atamalar.get((sonuc['id'], 'alternatif'), []),
+                'kayit_tarihi': sonuc['kayit_tarihi']
+            })
+    return genetik_gruplu
+
+def pano_olustur(surum):
+    """
+    İş çizelgesi sayfasının okuma modelini sabit sayıda sorguyla oluşturur.
+
+    Sonuç yalnızca düz sözlük ve listelerden oluşur; şablon satır başına sorgu yapmaz.
+    """
+    # İş durumu sayıları tek sorguda
+    durumlar = Is.objects.aggregate(
+        tamamlanan=Count('id', filter=Q(durum='tamamlandi')),
+        devam_eden=Count('id', filter=Q(durum='devam_ediyor')),
+        bekleyen=Count('id', filter=Q(durum='beklemede'))
+    )
+    mc_istatistik = MonteCarloSonuc.objects.aggregate(Avg('ortalama_performans'), Avg('risk_skoru'))
+    taguchi_sonuclari = list(TaguchiSonucu.objects.order_by('-guncellenme_tarihi').values(
+        'tasarim_kodu', 'optimum_sure', 'iyilestirme_orani', 'departman', 'guncellenme_tarihi'
+    ))
+    iyilestirmeler = [s['iyilestirme_orani'] for s in taguchi_sonuclari]
+
+    return {
+        'surum': surum,
+        'is_listesi': _is_listesi(),
+        'tasarim_kodlari': list(TasarimKodu.objects.order_by('id').values('kod', 'urun_adi')),
+        'monte_carlo_sonuclari': _monte_carlo_sonuclari(),
+        'genetik_gruplu': _genetik_gruplu(),
+        'taguchi_sonuclari': taguchi_sonuclari,
+        **durumlar,
+        'istatistikler': {
+            'ortalama_performans': mc_istatistik['ortalama_performans__avg'] or 0,
+            'ortalama_risk': mc_istatistik['risk_skoru__avg'] or 0,
+            'ortalama_iyilestirme': sum(iyilestirmeler) / len(iyilestirmeler) if iyilestirmeler else 0
+        },
+    }
+
+def _sayac():
+    return cache.get(PANO_SAYAC_ANAHTARI, 0)
+
+def _sayaci_artir():
+    try:
+        cache.incr(PANO_SAYAC_ANAHTARI)
+    except ValueError:
+        # Sayaç yoksa (ilk kullanım veya önbellekten düşmüş) okuyucuların gördüğü 0'dan farklı bir değerle başlat
+        if not cache.add(PANO_SAYAC_ANAHTARI, 1, timeout=None):
+            cache.incr(PANO_SAYAC_ANAHTARI)
+
+def _kaydet(sayac, pano):
+    """Modeli yalnızca oluşturma başlarken okunan sayaç hâlâ güncelse önbelleğe yazar."""
+    if _sayac() == sayac:
+        cache.set(PANO_ANAHTARI, (sayac, pano), timeout=None)
+
+def pano_yenile(surum):
+    """
+    Optimizasyon sonuçları yayınlandığında okuma modelini yeniden oluşturur ve önbelleğe yazar.
+
+    Sayaç önce artırılır; böylece yayından önce başlamış okuyucu oluşturmaları yeni modelin yerine yazılamaz.
+    """
+    _sayaci_artir()
+    sayac = _sayac()
+    pano = pano_olustur(surum)
+    _kaydet(sayac, pano)
+    return pano
+
+def pano_gecersiz_kil():
+    """
+    İşler elle değiştiğinde okuma modelini geçersiz kılar; bir sonraki istek yeniden oluşturur.
+
+    Sayaç işlem onaylandıktan sonra artırılır; aksi halde arada başlayan bir oluşturma henüz görünmeyen
+    değişikliği kaçırıp modeli yeni sayaçla önbelleğe yazabilirdi.
+    """
+    transaction.on_commit(_sayaci_artir)
+
+def pano_verisi():
+    """
+    İş çizelgesi okuma modelini döndürür.
+
+    Önbellekteki model güncel sayaçla oluşturulduysa iki önbellek okumasıyla döner. Değilse son yayınlanan
+    çalıştırmanın sürümüyle yeniden oluşturulur ve yalnızca oluşturma sırasında sayaç değişmediyse
+    önbelleğe yazılır; eş zamanlı bir geçersiz kılma veya yayından önce okunmuş eski veri saklanmaz.
+    """
+    sayac = _sayac()
+    kayit = cache.get(PANO_ANAHTARI)
+    if kayit is not None and kayit[0] == sayac:
+        return kayit[1]
+
+    surum = (OptimizasyonCalismasi.objects.filter(durum='yayinlandi')
+             .order_by('-id').values_list('id', flat=True).first()) or 0
+    pano = pano_olustur(surum)
+    _kaydet(sayac, pano)
+    return pano
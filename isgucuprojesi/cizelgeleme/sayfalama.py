@@ -0,0 +1,68 @@
+from django.conf import settings
+
+
+class SorguParametresiHatasi(ValueError):
+    """Geçersiz sayfalama veya alan seçimi parametresi; görünümler 400 olarak döndürür."""
+
+
+def sayfa_boyu(params):
+    """
+    ?limit parametresinden sayfa boyunu okur.
+
+    Varsayılan settings.API_SAYFA_BOYU (100), üst sınır settings.API_MAKS_SAYFA_BOYU (1000).
+    """
+    varsayilan = getattr(settings, "API_SAYFA_BOYU", 100)
+    maks = getattr(settings, "API_MAKS_SAYFA_BOYU", 1000)
+    try:
+        limit = int(params.get('limit', varsayilan))
+    except (TypeError, ValueError):
+        raise SorguParametresiHatasi("limit bir tam sayı olmalıdır.")
+    if limit < 1:
+        raise SorguParametresiHatasi("limit en az 1 olmalıdır.")
+    return min(limit, maks)
+
+
+def secili_alanlar(params, izinli):
+    """
+    ?fields=a,b,c parametresini izinli alanlar içinde doğrular; verilmezse tüm izinli alanları döndürür.
+    """
+    istenen = params.get('fields')
+    if not istenen:
+        return list(izinli)
+    alanlar = [alan.strip() for alan in istenen.split(',') if alan.strip()]
+    gecersiz = [alan for alan in alanlar if alan not in izinli]
+    if gecersiz:
+        raise SorguParametresiHatasi(
+            f"Geçersiz alan: {', '.join(gecersiz)}. Kullanılabilir alanlar: {', '.join(izinli)}"
+        )
+    return alanlar
+
+
+def filtre_degeri(params, ad, tip=str):
+    """İsteğe bağlı bir filtre parametresini okur ve tipine çevirir; verilmemişse None döndürür."""
+    deger = params.get(ad)
+    if deger in (None, ''):
+        return None
+    try:
+        return tip(deger)
+    except (TypeError, ValueError):
+        raise SorguParametresiHatasi(f"{ad} parametresi geçersiz.")
+
+
+def imlec_sayfasi(queryset, params):
+    """
+    Sorguyu id üzerinden anahtar kümesi (keyset) sayfalamasıyla böler.
+
+    ?imlec önceki sayfanın son id'sidir; OFFSET kullanılmadığından derin sayfalar da aynı maliyetle
+    okunur. Sayfadaki kayıtları (values() sözlükleri) ve sonraki sayfanın imlecini (yoksa None) döndürür.
+    queryset, 'id' alanını içeren bir values() sorgusu olmalıdır.
+    """
+    limit = sayfa_boyu(params)
+    imlec = filtre_degeri(params, 'imlec', int)
+    if imlec is not None:
+        queryset = queryset.filter(id__gt=imlec)
+    kayitlar = list(queryset.order_by('id')[:limit + 1])
+    if len(kayitlar) > limit:
+        kayitlar = kayitlar[:limit]
+        return kayitlar, str(kayitlar[-1]['id'])
+    return kayitlar, None
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Calisan, TasarimKodu, GecmisPerformansVerisi, GecmisSureVerisi, PerformansDegerlendirme, Is, IsAtama
+from .degisiklik_kuyrugu import kuyruga_ekle
+from .pano import pano_gecersiz_kil
+from .degisiklik_akisi import is_degisikligini_bildir
+
+@receiver([post_save, post_delete], sender=Calisan)
+def calisan_degisti(sender, instance, **kwargs):
+    kuyruga_ekle(calisan_idler=[instance.id])
+
+@receiver([post_save, post_delete], sender=TasarimKodu)
+def tasarim_kodu_degisti(sender, instance, **kwargs):
+    kuyruga_ekle(tasarim_idler=[instance.id])
+
+@receiver([post_save, post_delete], sender=GecmisPerformansVerisi)
+def performans_verisi_degisti(sender, instance, **kwargs):
+    kuyruga_ekle(calisan_idler=[instance.calisan_id])
+
+@receiver([post_save, post_delete], sender=GecmisSureVerisi)
+def sure_verisi_degisti(sender, instance, **kwargs):
+    kuyruga_ekle(tasarim_idler=[instance.tasarim_id])
+
+@receiver([post_save, post_delete], sender=PerformansDegerlendirme)
+def degerlendirme_degisti(sender, instance, **kwargs):
+    kuyruga_ekle(calisan_idler=[instance.calisan_id])
+
+@receiver([post_save, post_delete], sender=Is)
+def is_degisti(sender, instance, **kwargs):
+    pano_gecersiz_kil()
+    is_degisikligini_bildir(instance.id)
+    # Yeni veya değişen iş bekleyen işlerin global atamasını (atama aşaması) yeniden çalıştırmalı
+    kuyruga_ekle(tasarim_idler=[instance.tasarim_id])
+
+@receiver([post_save, post_delete], sender=IsAtama)
+def is_atama_degisti(sender, instance, **kwargs):
+    # Atama çözücüsü de IsAtama satırlarını sildiğinden burada kuyruğa eklenmez; aksi halde her
+    # çalıştırma bir sonrakini tetiklerdi
+    pano_gecersiz_kil()
+    is_degisikligini_bildir(instance.is_objesi_id)
@@ -605,7 +605,7 @@ async function saveAssignmentDetails(requestData, responseData, kontrolData = nu
         const verimlilikPuani = calisanBilgileri.verimlilik_puani * 100;
 
         // Genetik algoritma uygunluk skorunu al
-        const genetikSonuclari = await fetch('/api/genetik-sonuclari').then(r => r.json());
+        const genetikSonuclari = await fetch(`/api/genetik-sonuclari/?tasarim_kodu=${encodeURIComponent(requestData.tasarim_kodu)}&atanma_tipi=atanan`).then(r => r.json());
         const genetikUygunluk = genetikSonuclari[requestData.tasarim_kodu]?.uygunluk || 0;
 
         const assignmentDetails = {
@@ -913,11 +913,8 @@ document.addEventListener('DOMContentLoaded', function() {
 
 // Monte Carlo simülasyonu için
 $(document).ready(function() {
-    // Sayfa yüklendiğinde Monte Carlo sonuçlarını al
-    getMonteCarloCurrent();
-    
-    // Her 60 saniyede bir güncelle
-    setInterval(getMonteCarloCurrent, 60000);
+    // Kart, WebSocket değişiklik akışının ilk görüntüsü ve sonraki değişikliklerle güncellenir;
+    // periyodik sorgu yapılmaz
     
     // Simülasyon başlatma butonu için event listener
     $('#simulasyonBaslat').click(function() {
@@ -925,32 +922,20 @@ $(document).ready(function() {
         btn.prop('disabled', true);
         btn.html('<span class="spinner-border spinner-border-sm"></span> Simülasyon çalışıyor...');
         
-        $.ajax({
-            url: '/performans-simulasyonu/',
-            method: 'POST',
-            headers: {
-                'X-CSRFToken': getCookie('csrftoken')
-            },
-            success: function(response) {
-                if (response.success) {
-                    // Bunun yerine kartı güncelleyelim, eğer HTML'de updateMonteCarloCard varsa
-                    if (typeof updateMonteCarloCard === 'function') {
-                        updateMonteCarloCard(response.monte_carlo_sonuclari);
-                    } else {
-                        // Alternatif olarak sadece konsola yazdırabilir veya başka bir işlem yapabilirsiniz.
-                        console.log("Monte Carlo sonuçları alındı, ancak updateMonteCarloCard fonksiyonu bulunamadı.", response.monte_carlo_sonuclari);
-                    }
-                } else {
-                    bildirimGoster('error', response.mesaj || 'Simülasyon sırasında bir hata oluştu');
-                }
-            },
-            error: function() {
-                bildirimGoster('error', 'Simülasyon sırasında bir hata oluştu');
-            },
-            complete: function() {
-                btn.prop('disabled', false);
-                btn.html('<i class="bi bi-play-circle"></i> Simülasyonu Başlat');
+        tumMonteCarloSonuclariniAl(function(sonuclar) {
+            // Bunun yerine kartı güncelleyelim, eğer HTML'de updateMonteCarloCard varsa
+            if (typeof updateMonteCarloCard === 'function') {
+                updateMonteCarloCard(sonuclar);
+            } else {
+                // Alternatif olarak sadece konsola yazdırabilir veya başka bir işlem yapabilirsiniz.
+                console.log("Monte Carlo sonuçları alındı, ancak updateMonteCarloCard fonksiyonu bulunamadı.", sonuclar);
             }
+            btn.prop('disabled', false);
+            btn.html('<i class="bi bi-play-circle"></i> Simülasyonu Başlat');
+        }, function(mesaj) {
+            bildirimGoster('error', mesaj || 'Simülasyon sırasında bir hata oluştu');
+            btn.prop('disabled', false);
+            btn.html('<i class="bi bi-play-circle"></i> Simülasyonu Başlat');
         });
     });
 
@@ -1086,28 +1071,52 @@ $(document).ready(function() {
     });
 });
 
-function getMonteCarloCurrent() {
-    $.ajax({
-        url: '/performans-simulasyonu/',
-        method: 'POST',
-        headers: {
-            'X-CSRFToken': getCookie('csrftoken')
-        },
-        success: function(response) {
-            if (response.success && response.monte_carlo_sonuclari) {
-                // Bunun yerine kartı güncelleyelim, eğer HTML'de updateMonteCarloCard varsa
-                if (typeof updateMonteCarloCard === 'function') {
-                    updateMonteCarloCard(response.monte_carlo_sonuclari);
+// Monte Carlo sonuçlarının tüm sayfalarını 'sonraki' imlecini izleyerek toplar
+function tumMonteCarloSonuclariniAl(basarili, hatali) {
+    const sonuclar = {};
+
+    function sayfaAl(imlec) {
+        const params = { limit: 1000 };
+        if (imlec) {
+            params.imlec = imlec;
+        }
+        $.ajax({
+            url: '/performans-simulasyonu/?' + $.param(params),
+            method: 'POST',
+            headers: {
+                'X-CSRFToken': getCookie('csrftoken')
+            },
+            success: function(response) {
+                if (!response.success) {
+                    // İlk sayfada sonuç yoksa hata, sonraki sayfalarda boş sayfa toplamanın sonudur
+                    if (imlec) {
+                        basarili(sonuclar);
+                    } else if (hatali) {
+                        hatali(response.mesaj);
+                    }
+                    return;
+                }
+                // Bir çalışanın ilk sonucu korunur (sunucudaki gruplamayla aynı)
+                Object.entries(response.monte_carlo_sonuclari).forEach(([ad, sonuc]) => {
+                    if (!(ad in sonuclar)) {
+                        sonuclar[ad] = sonuc;
+                    }
+                });
+                if (response.sonraki) {
+                    sayfaAl(response.sonraki);
                 } else {
-                    // Alternatif olarak sadece konsola yazdırabilir veya başka bir işlem yapabilirsiniz.
-                    console.log("Monte Carlo sonuçları alındı, ancak updateMonteCarloCard fonksiyonu bulunamadı.", response.monte_carlo_sonuclari);
+                    basarili(sonuclar);
+                }
+            },
+            error: function(xhr, status, error) {
+                if (hatali) {
+                    hatali(error);
                 }
             }
-        },
-        error: function(xhr, status, error) {
-            console.error('Monte Carlo sonuçları alınırken hata:', error);
-        }
-    });
+        });
+    }
+
+    sayfaAl(null);
 }
 
 function updateMonteCarloCard(data) {
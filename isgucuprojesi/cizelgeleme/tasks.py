@@ -1,70 +1,246 @@
-from celery import shared_task
+import time
+import uuid
+from contextlib import contextmanager
+from celery import chain, group, shared_task
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from .algorithms.monte_carlo_simulasyon import simulasyon_calistir
-from .algorithms.taguchi import main as taguchi_main
-from .algorithms.geneticalgorithm import main as genetic_main
-from .models import MonteCarloSonuc, TaguchiSonucu, GenetikSonuc
-from django.db.models import Avg
+from .models import MonteCarloSonuc, TaguchiSonucu, GenetikSonuc, OptimizasyonCalismasi, AsamaSuresi
+from .degisiklik_kuyrugu import kuyrugu_oku, kuyrugu_onayla
+from .pano import pano_yenile
+from .degisiklik_akisi import yayin_degisikligini_kaydet
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+# Çakışan çalıştırmaları önleyen dağıtık kilit ve kilit tutulurken gelen tetiklerin bayrağı
+KILIT_ANAHTARI = 'optimizasyon_hatti:kilit'
+BEKLEYEN_ANAHTARI = 'optimizasyon_hatti:bekleyen'
+
+def _kilit_suresi():
+    """Kilidin en uzun tutulma süresi (saniye); çöken bir çalıştırmanın kilidi bu sürede düşer."""
+    return getattr(settings, "OPTIMIZASYON_KILIT_SURESI", 30 * 60)
+
+def kilidi_al():
+    """
+    Kilit boştaysa alır ve sahiplik anahtarını döndürür, değilse None döndürür.
+
+    Kilit, aşamaları çalıştıran tüm süreçlerin paylaştığı bir önbellek (Redis, Memcached, veritabanı)
+    gerektirir; süreç içi önbellekler için cizelgeleme.W001 sistem kontrolü uyarı verir.
+    """
+    anahtar = uuid.uuid4().hex
+    return anahtar if cache.add(KILIT_ANAHTARI, anahtar, timeout=_kilit_suresi()) else None
+
+def kilidi_birak(anahtar):
+    """Kilidi yalnızca hâlâ bu çalıştırmaya aitse bırakır."""
+    if anahtar and cache.get(KILIT_ANAHTARI) == anahtar:
+        cache.delete(KILIT_ANAHTARI)
+
+def _calismayi_bitir(baglam, durum):
+    """Çalıştırmayı sonlandırır ve kilidi bırakır."""
+    OptimizasyonCalismasi.objects.filter(id=baglam['calisma_id']).update(durum=durum, bitis=timezone.now())
+    kilidi_birak(baglam['kilit'])
+
+def _bekleyen_tetigi_isle():
+    """Çalıştırma sırasında gelen tetikleri tek bir yeni çalıştırmada birleştirir."""
+    if cache.get(BEKLEYEN_ANAHTARI):
+        cache.delete(BEKLEYEN_ANAHTARI)
+        run_all_optimizations.delay()
+
+@contextmanager
+def asama(baglam, ad):
+    """
+    Bir hat aşamasının süresini AsamaSuresi olarak kaydeder.
+
+    Aşama hata verirse yalnızca başarısız olarak kaydedilir ve hata yeniden fırlatılır. Çalıştırmayı
+    'hata' olarak işaretleyip kilidi bırakmak hata_asamasi'nın işidir; paralel aşamalardan biri
+    hata verdiğinde kardeş aşamalar çalışmaya devam ettiğinden kilit burada bırakılmaz.
+    """
+    print(f"{ad} aşaması başlatılıyor...")
+    baslangic = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        AsamaSuresi.objects.create(
+            calisma_id=baglam['calisma_id'], asama=ad, sure=time.perf_counter() - baslangic, basarili=False
+        )
+        print(f"{ad} aşamasında hata oluştu: {str(e)}")
+        raise
+    sure = time.perf_counter() - baslangic
+    AsamaSuresi.objects.create(calisma_id=baglam['calisma_id'], asama=ad, sure=sure)
+    print(f"{ad} aşaması {sure:.2f} sn sürdü.")
+
+def _tam_kontrol_gerekli():
+    """
+    Hattın kuyruktaki kirli kayıtlarla sınırlı kalmadan tam kontrol yapıp yapmayacağını belirler.
+
+    Sinyal üretmeyen toplu değişiklikler (queryset.update, bulk_create, loaddata) yalnızca tüm kayıtların
+    parmak izi kontrolüyle yakalanabildiğinden, son yayından bu yana
+    settings.OPTIMIZASYON_TAM_KONTROL_ARALIGI (varsayılan 15 dk) geçtiyse aşamalar tüm çalışan ve
+    tasarım kodlarını kontrol eder.
+    """
+    if not (MonteCarloSonuc.objects.exists() and TaguchiSonucu.objects.exists() and GenetikSonuc.objects.exists()):
+        return True
+    son = OptimizasyonCalismasi.objects.filter(durum='yayinlandi').order_by('-id').values_list('bitis', flat=True).first()
+    aralik = getattr(settings, "OPTIMIZASYON_TAM_KONTROL_ARALIGI", 15 * 60)
+    return son is None or (timezone.now() - son).total_seconds() >= aralik
 
 @shared_task
-def run_all_optimizations():
-    """Tüm optimizasyonları çalıştır ve sonuçları WebSocket üzerinden gönder"""
-    print("Optimizasyonlar başlatılıyor...")
-    channel_layer = get_channel_layer()
-    
+def run_all_optimizations(force=False):
+    """
+    Optimizasyon hattını başlatır: Monte Carlo, ardından paralel Taguchi/GA/atama, en son yayın.
+
+    Hat zaten çalışıyorsa yeni bir çalıştırma başlatılmaz; tetik bekleyen olarak işaretlenir ve mevcut
+    çalıştırma bittiğinde tek bir çalıştırmada birleştirilir. Değişiklik kuyruğu boşsa (ve tam kontrol
+    zamanı gelmediyse) hat hiç çalışmaz.
+    """
+    kilit = kilidi_al()
+    if kilit is None:
+        cache.set(BEKLEYEN_ANAHTARI, True, timeout=_kilit_suresi())
+        print("Optimizasyon hattı zaten çalışıyor, tetik bekleyen çalıştırmaya eklendi.")
+        return "Bekleyen çalıştırmaya eklendi"
+
     try:
-        # Monte Carlo Simülasyonu
-        print("Monte Carlo simülasyonu başlatılıyor...")
-        monte_carlo_result = simulasyon_calistir()
-        
-        # Veritabanından en son kaydedilen sonuçları al
-        latest_mc_results_qs = MonteCarloSonuc.objects.select_related('calisan').order_by('-simulasyon_zamani')
-        
-        # Genel istatistikleri hesapla
-        ortalama_performans_genel = latest_mc_results_qs.aggregate(Avg('ortalama_performans'))['ortalama_performans__avg'] or 0
-        ortalama_risk_genel = latest_mc_results_qs.aggregate(Avg('risk_skoru'))['risk_skoru__avg'] or 0
-
-        monte_carlo_data = {
-            'genel_istatistikler': {
-                'ortalama_performans': ortalama_performans_genel,
-                'ortalama_risk': ortalama_risk_genel
-            },
-            'latest_results': list(latest_mc_results_qs.values(
-                'calisan__ad_soyad', 'ortalama_performans', 
-                'risk_skoru', 'gecikme_olasiligi', 'performans_kararliligi'
-            )[:5]) # İlk 5 sonucu alalım (isteğe bağlı)
-        }
-        print(f"Monte Carlo sonuçları (WebSocket için): {monte_carlo_data}")
-        
-        # Taguchi Optimizasyonu
-        print("Taguchi optimizasyonu başlatılıyor...")
-        taguchi_result = taguchi_main()
-        
-        # Genetik Algoritma
-        print("Genetik algoritma başlatılıyor...")
-        genetic_result = genetic_main()
-        genetic_data = {
-            'latest_results': list(GenetikSonuc.objects.select_related('tasarim')
-                                .order_by('-id')
-                                .values('tasarim__kod', 'senaryo')[:5])
-        }
-        print(f"Genetik algoritma sonuçları: {genetic_data}")
-        
-        # Sonuçları WebSocket üzerinden gönder
+        # Son çalıştırmadan bu yana değişen (kirli) çalışanlar ve tasarım kodları
+        son_kuyruk_id, kirli_calisanlar, kirli_tasarimlar = kuyrugu_oku()
+        print(f"Kirli çalışan: {len(kirli_calisanlar)}, kirli tasarım kodu: {len(kirli_tasarimlar)}")
+        # Tam kontrolde kuyruk yerine tüm çalışan ve tasarım kodlarının parmak izleri karşılaştırılır
+        tam_kontrol = force or _tam_kontrol_gerekli()
+        if not tam_kontrol and not kirli_calisanlar and not kirli_tasarimlar:
+            kilidi_birak(kilit)
+            print("Değişiklik yok, optimizasyon hattı çalıştırılmadı.")
+            return "Değişiklik yok"
+
+        calisma = OptimizasyonCalismasi.objects.create(
+            kirli_calisan_sayisi=len(kirli_calisanlar),
+            kirli_tasarim_sayisi=len(kirli_tasarimlar)
+        )
+    except Exception:
+        kilidi_birak(kilit)
+        raise
+
+    baglam = {
+        'calisma_id': calisma.id,
+        'kilit': kilit,
+        'son_kuyruk_id': son_kuyruk_id,
+        'kirli_calisanlar': sorted(kirli_calisanlar),
+        'kirli_tasarimlar': sorted(kirli_tasarimlar),
+        'tam_kontrol': tam_kontrol,
+    }
+    # Grup ardından gelen görev zincirde chord'a dönüşür: yayın, paralel aşamaların hepsini bekler.
+    # Paralel aşamalardan biri hata verirse chord, grubun tamamı bittikten sonra yayın yerine yayının
+    # hata geri çağrısını (hata_asamasi) çalıştırır; Monte Carlo hatası grup başlamadan yakalanır.
+    hata = hata_asamasi.s(baglam)
+    try:
+        chain(
+            monte_carlo_asamasi.s(baglam).on_error(hata),
+            group(taguchi_asamasi.s(), genetik_asamasi.s(), atama_asamasi.s()),
+            yayin_asamasi.s(baglam).on_error(hata)
+        ).apply_async()
+    except Exception:
+        # Hat kuyruğa alınamadıysa (aracı hatası, eager modda senkron hata) kilit burada bırakılır
+        _calismayi_bitir(baglam, 'hata')
+        _bekleyen_tetigi_isle()
+        raise
+    return f"Optimizasyon hattı başlatıldı (çalıştırma #{calisma.id})"
+
+@shared_task
+def monte_carlo_asamasi(baglam):
+    """Değişen çalışanlar için Monte Carlo simülasyonunu çalıştırır; bağlamı sonraki aşamalara aktarır."""
+    from .algorithms.monte_carlo_simulasyon import simulasyon_calistir
+
+    with asama(baglam, 'monte_carlo'):
+        calisan_idler = None if baglam['tam_kontrol'] else set(baglam['kirli_calisanlar'])
+        simulasyon_calistir(calisan_idler=calisan_idler, hata_firlat=True)
+    return baglam
+
+@shared_task
+def taguchi_asamasi(baglam):
+    """Değişen tasarım kodları için Taguchi optimizasyonunu çalıştırır."""
+    from .algorithms.taguchi import main as taguchi_main
+
+    with asama(baglam, 'taguchi'):
+        tasarim_idler = None if baglam['tam_kontrol'] else set(baglam['kirli_tasarimlar'])
+        taguchi_main(tasarim_idler=tasarim_idler, hata_firlat=True)
+    return 'taguchi'
+
+@shared_task
+def genetik_asamasi(baglam):
+    """
+    Genetik algoritmayı çalıştırır.
+
+    Yalnızca bir değişiklik varsa veya tam kontrol zamanı geldiyse çalışır; hangi tasarım kodlarının
+    aday havuzu veya uygunluk girdilerinin değiştiğini parmak izleri belirler.
+    """
+    from .algorithms.geneticalgorithm import main as genetic_main
+
+    with asama(baglam, 'genetik'):
+        if (baglam['tam_kontrol'] or baglam['kirli_calisanlar'] or baglam['kirli_tasarimlar']
+                or not GenetikSonuc.objects.exists()):
+            genetic_main(hata_firlat=True)
+        else:
+            print("Değişiklik yok, genetik algoritma atlanıyor.")
+    return 'genetik'
+
+@shared_task
+def atama_asamasi(baglam):
+    """Bekleyen işlerin global atamasını yapar; yalnızca Monte Carlo sonuçlarına bağlıdır."""
+    from .algorithms.assignment_solver import main as assignment_main
+
+    with asama(baglam, 'atama'):
+        assignment_main(hata_firlat=True)
+    return 'atama'
+
+@shared_task
+def yayin_asamasi(tamamlanan_asamalar, baglam):
+    """
+    Sonuçları sürümlü değişiklik akışı olarak yayınlar, değişiklik kuyruğunu onaylar ve kilidi bırakır.
+
+    İstemcilere tüm sonuçlar yerine yalnızca bir önceki yayına göre değişen çalışanlar, tasarım kodları
+    ve iş atamaları gönderilir; değişiklik yoksa yalnızca sürüm bilgisi içeren bir nabız gider.
+    """
+    with asama(baglam, 'yayin'):
+        print(f"Tamamlanan aşamalar: {', '.join(tamamlanan_asamalar)}")
+        onceki_surum, degisiklikler = yayin_degisikligini_kaydet(baglam['calisma_id'])
+
+        # Değişiklikleri WebSocket üzerinden gönder
+        channel_layer = get_channel_layer()
         async_to_sync(channel_layer.group_send)(
             'optimization_updates',
             {
                 'type': 'optimization_update',
-                'monte_carlo': monte_carlo_data,
-                'taguchi': taguchi_result,
-                'genetic': genetic_data
+                'surum': baglam['calisma_id'],
+                'onceki_surum': onceki_surum,
+                'degisiklikler': degisiklikler
             }
         )
-        print("Sonuçlar WebSocket üzerinden gönderildi")
-        
-    except Exception as e:
-        print(f"Hata oluştu: {str(e)}")
-        raise
-    
-    return "Optimizasyonlar tamamlandı" 
\ No newline at end of file
+        print(f"Sürüm {baglam['calisma_id']} WebSocket üzerinden gönderildi "
+              f"({sum(len(fark) for fark in degisiklikler.values())} değişen kayıt)")
+
+        # İş çizelgesi okuma modelini bu çalıştırmanın sürümüyle yeniden oluştur
+        pano_yenile(baglam['calisma_id'])
+
+        # İşlenen değişiklikleri kuyruktan düş; hata durumunda bir sonraki çalıştırmada tekrar denenir
+        kuyrugu_onayla(baglam['son_kuyruk_id'])
+
+    _calismayi_bitir(baglam, 'yayinlandi')
+    _bekleyen_tetigi_isle()
+
+    return "Optimizasyonlar tamamlandı"
+
+@shared_task
+def hata_asamasi(request, exc, traceback, baglam):
+    """
+    Hat hata verdiğinde çalıştırmayı 'hata' olarak işaretler ve kilidi bırakır.
+
+    Değişiklik kuyruğu onaylanmadığı için kirli kayıtlar bir sonraki çalıştırmada yeniden işlenir;
+    hata sırasında gelen tetikler de kaybolmaz.
+    """
+    print(f"Optimizasyon hattı hata verdi (çalıştırma #{baglam['calisma_id']}): {exc}")
+    _calismayi_bitir(baglam, 'hata')
+    _bekleyen_tetigi_isle()
+
+@shared_task
+def render_taguchi_charts(force=False):
+    """Taguchi grafiklerini optimizasyon akışının dışında çizer; sonuç parmak izine göre önbelleğe alınır."""
+    from .algorithms.taguchi_grafikleri import taguchi_grafiklerini_olustur
+    return taguchi_grafiklerini_olustur(force=force)
@@ -1,3 +1,506 @@
+import io
+import itertools
+from contextlib import redirect_stdout
+from datetime import date
+
+import numpy as np
 from django.test import TestCase
+from scipy import stats
+
+from .algorithms import assignment_solver
+from .algorithms.assignment_solver import KRITIK_AGIRLIGI, solve_assignments
+from .algorithms.fitness_matrix import (
+    SENARYOLAR, SEVIYELER, build_fitness_matrix, decode_individual, encode_population, score_population,
+    senaryo_index, slot_levels,
+)
+from .algorithms.geneticalgorithm import (
+    calculate_team_fitness, calculate_worker_fitness_for_task, create_initial_population_array, crossover_array,
+    mutate_array,
+)
+from .algorithms.monte_carlo_simulasyon import akan_simulasyon, toplu_performans_dagilimi, toplu_simulasyon
+from .algorithms.taguchi import (
+    analyze_parameter_effects, calculate_snr, calculate_snr_batch, create_orthogonal_array,
+    toplu_gecmis_analizi,
+)
+from .models import Calisan, Is, IsAtama, TasarimKodu
+
+
+def ga_verisi():
+    """Tüm seviyeleri, Monte Carlo verisi olan/olmayan çalışanları ve boş ihtiyaçları içeren küçük bir GA verisi."""
+    tasarim_kodlari = {
+        "K1": {"urun_adi": "U1", "tahmini_montaj_suresi": 120.0,
+               "personel_ihtiyaci": {"ustabasi": 1, "kalifiyeli": 2, "cirak": 1}},
+        "K2": {"urun_adi": "U2", "tahmini_montaj_suresi": 80.0,
+               "personel_ihtiyaci": {"ustabasi": 0, "kalifiyeli": 1, "cirak": 2}},
+        "K3": {"urun_adi": "U3", "tahmini_montaj_suresi": 60.0,
+               "personel_ihtiyaci": {"ustabasi": 0, "kalifiyeli": 0, "cirak": 1}},
+    }
+    calisanlar = {
+        f"C{i}": {"id": i, "yetkinlik_seviyesi": seviye, "tecrube_yili": tecrube, "verimlilik_puani": verimlilik}
+        for i, (seviye, tecrube, verimlilik) in enumerate([
+            (1, 20.0, 0.9), (1, 3.0, 0.4), (2, 10.0, 0.7), (2, 0.0, 0.2),
+            (2, 16.0, 1.0), (3, 1.0, 0.5), (3, 7.5, 0.8), (3, 30.0, 0.1),
+        ])
+    }
+    mc_results = {"calisanlar": {
+        "C0": {"risk_skoru": 0.1, "gecikme_olasiligi": 0.05, "ortalama_performans": 0.9},
+        "C2": {"risk_skoru": 0.6, "gecikme_olasiligi": 0.3, "ortalama_performans": 0.4},
+        "C5": {"risk_skoru": 0.3, "gecikme_olasiligi": 0.1, "ortalama_performans": 0.7},
+        "C7": {"risk_skoru": 0.9, "gecikme_olasiligi": 0.6, "ortalama_performans": 0.2},
+    }}
+    return tasarim_kodlari, calisanlar, mc_results
+
+
+class UygunlukMatrisiTestleri(TestCase):
+    """build_fitness_matrix, calculate_worker_fitness_for_task ile aynı puanları üretmeli."""
+
+    def test_matris_skaler_hesapla_ayni(self):
+        tasarim_kodlari, calisanlar, mc_results = ga_verisi()
+        fm = build_fitness_matrix(tasarim_kodlari, calisanlar, mc_results)
+
+        self.assertEqual(fm["fitness"].shape, (len(SENARYOLAR), len(tasarim_kodlari), len(calisanlar)))
+        for s_idx, senaryo in enumerate(SENARYOLAR):
+            for task, t_idx in fm["task_index"].items():
+                for worker, w_idx in fm["worker_index"].items():
+                    beklenen = calculate_worker_fitness_for_task(
+                        worker, task, tasarim_kodlari, calisanlar, mc_results, is_kritik=senaryo == "kritik"
+                    )
+                    self.assertAlmostEqual(fm["fitness"][s_idx, t_idx, w_idx], beklenen, places=9,
+                                           msg=f"{senaryo}/{task}/{worker}")
+
+    def test_monte_carlo_verisi_yoksa_bonus_yok(self):
+        tasarim_kodlari, calisanlar, _ = ga_verisi()
+        fm = build_fitness_matrix(tasarim_kodlari, calisanlar, None)
+        for task, t_idx in fm["task_index"].items():
+            for worker, w_idx in fm["worker_index"].items():
+                beklenen = calculate_worker_fitness_for_task(worker, task, tasarim_kodlari, calisanlar, None)
+                self.assertAlmostEqual(fm["fitness"][0, t_idx, w_idx], beklenen, places=9)
+        self.assertTrue(np.all(fm["fitness"] <= 100))
+
+
+class DiziGenetikAlgoritmaTestleri(TestCase):
+    """Dizi tabanlı GA çekirdeği, sözlük tabanlı takım puanlamasıyla aynı sonuçları vermeli."""
+
+    TAKIMLAR = {
+        "K1": [
+            {"ustabasi": ["C0"], "kalifiyeli": ["C2", "C4"], "cirak": ["C7"]},
+            {"ustabasi": ["C1"], "kalifiyeli": ["C3"], "cirak": ["C5"]},
+            {"ustabasi": [], "kalifiyeli": ["C2", "C3"], "cirak": []},
+        ],
+        "K2": [
+            {"kalifiyeli": ["C3"], "cirak": ["C5", "C6"]},
+            {"kalifiyeli": ["C4"], "cirak": ["C7"]},
+        ],
+        "K3": [
+            {"cirak": ["C6"]},
+            {"cirak": []},
+        ],
+    }
+
+    def setUp(self):
+        self.tasarim_kodlari, self.calisanlar, self.mc_results = ga_verisi()
+        self.fm = build_fitness_matrix(self.tasarim_kodlari, self.calisanlar, self.mc_results)
+
+    def test_dizi_puani_skaler_takim_puani_ayni(self):
+        for task, takimlar in self.TAKIMLAR.items():
+            kodlu = encode_population(self.fm, task, takimlar)
+            for is_kritik in (False, True):
+                puanlar = score_population(self.fm, task, kodlu, is_kritik)
+                for takim, puan in zip(takimlar, puanlar):
+                    beklenen = calculate_team_fitness(
+                        takim, task, self.tasarim_kodlari, self.calisanlar, self.mc_results, is_kritik
+                    )
+                    self.assertAlmostEqual(puan, beklenen, places=9, msg=f"{task}/{takim}/{is_kritik}")
+
+    def test_kodlama_geri_cozme_ayni_takimi_verir(self):
+        for task, takimlar in self.TAKIMLAR.items():
+            kodlu = encode_population(self.fm, task, takimlar)
+            for takim, satir in zip(takimlar, kodlu):
+                self.assertEqual(decode_individual(self.fm, task, satir), takim)
+
+    def test_operatorler_seviye_ve_tekrarsizlik_korur(self):
+        rng = np.random.default_rng(0)
+        for task in self.tasarim_kodlari:
+            seviyeler = slot_levels(self.fm, task)
+            p1 = create_initial_population_array(task, self.fm, 40, rng)
+            p2 = create_initial_population_array(task, self.fm, 40, rng)
+            cocuklar = mutate_array(crossover_array(p1, p2, seviyeler, rng), seviyeler, self.fm, 1.0, rng)
+            for populasyon in (p1, p2, cocuklar):
+                for satir in populasyon:
+                    dolu = satir[satir >= 0]
+                    self.assertEqual(len(dolu), len(set(dolu.tolist())), msg=f"{task}: {satir}")
+                    # Sözlükteki seviye numarası 1'den, sütun seviye indeksi 0'dan başlar
+                    np.testing.assert_array_equal(self.fm["seviye"][dolu], seviyeler[satir >= 0] + 1)
+
+
+def simulasyon_parametreleri():
+    """Geçmiş verisi olmayan sütunlar içeren küçük bir (çalışan x tasarım kodu) parametre seti."""
+    loc = np.array([[0.8, 0.4, 0.6], [0.3, 0.7, 0.5], [0.55, 0.2, 0.9], [0.5, 0.5, 0.5]])
+    scale = np.array([[0.1, 0.2, 0.15], [0.05, 0.1, 0.3], [0.2, 0.1, 0.05], [0.1, 0.1, 0.1]])
+    maske = np.array([[True, True, True], [True, False, True], [False, True, False], [True, True, False]])
+    return loc, scale, maske
+
+
+class TopluSimulasyonTestleri(TestCase):
+    """toplu_simulasyon, aynı örnekler üzerinde numpy'nin doğrudan istatistikleriyle aynı sonuçları vermeli."""
+
+    def test_numpy_istatistikleriyle_ayni(self):
+        loc, scale, maske = simulasyon_parametreleri()
+        iterasyon = 500
+        sonuc = toplu_simulasyon(loc, scale, maske, iterasyon, np.random.default_rng(7))
+
+        # Aynı tohumla aynı örnekler tek seferde çekilir
+        sim = np.clip(np.random.default_rng(7).normal(loc[:, :, None], scale[:, :, None],
+                                                      size=loc.shape + (iterasyon,)), 0, 1)
+        np.testing.assert_allclose(sonuc['kod_ortalama'], sim.mean(axis=2))
+        np.testing.assert_allclose(sonuc['kod_risk'], (sim < 0.5).mean(axis=2))
+        np.testing.assert_allclose(sonuc['kod_gecikme'], (sim < 0.3).mean(axis=2))
+        for w in range(len(loc)):
+            ornekler = sim[w, maske[w]].ravel()
+            self.assertAlmostEqual(sonuc['ortalama'][w], np.mean(ornekler), places=12)
+            self.assertAlmostEqual(sonuc['varyans'][w], np.var(ornekler), places=12)
+            self.assertAlmostEqual(sonuc['risk'][w], np.mean(ornekler < 0.5), places=12)
+            self.assertAlmostEqual(sonuc['gecikme'][w], np.mean(ornekler < 0.3), places=12)
+            self.assertEqual(sonuc['min'][w], ornekler.min())
+            self.assertEqual(sonuc['max'][w], ornekler.max())
+            self.assertAlmostEqual(sonuc['q25'][w], np.percentile(ornekler, 25), places=12)
+            self.assertAlmostEqual(sonuc['q75'][w], np.percentile(ornekler, 75), places=12)
+
+    def test_parcalara_bolme_sonucu_degistirmez(self):
+        loc, scale, maske = simulasyon_parametreleri()
+        tek = toplu_simulasyon(loc, scale, maske, 300, np.random.default_rng(3))
+        # Her parçada tek çalışan: örnek akışı aynı sırayla tüketilir
+        parcali = toplu_simulasyon(loc, scale, maske, 300, np.random.default_rng(3), maks_eleman=1)
+        for ad in tek:
+            np.testing.assert_allclose(parcali[ad], tek[ad], err_msg=ad)
+
+    def test_akan_mod_toplu_modla_uyumlu(self):
+        loc, scale, maske = simulasyon_parametreleri()
+        iterasyon = 20_000
+        toplu = toplu_simulasyon(loc, scale, maske, iterasyon, np.random.default_rng(11))
+        akan = akan_simulasyon(loc, scale, maske, iterasyon, np.random.default_rng(12), parca_boyu=3_000)
+
+        # Farklı örneklerle çalıştıklarından karşılaştırma örnekleme hatası payıyla yapılır
+        for ad in ('kod_ortalama', 'kod_risk', 'kod_gecikme', 'ortalama', 'risk', 'gecikme', 'q25', 'q75'):
+            np.testing.assert_allclose(akan[ad], toplu[ad], atol=0.01, err_msg=ad)
+        np.testing.assert_allclose(akan['varyans'], toplu['varyans'], rtol=0.05, err_msg='varyans')
+
+
+def dongu_performans_dagilimi(veriler, calisan):
+    """Toplu hesaplamanın karşılaştırıldığı, çalışan ve tasarım kodu başına döngülü referans hesap."""
+    dagilimlar = {}
+    for tasarim_kodu in veriler:
+        performanslar = [proje[calisan] for proje in veriler[tasarim_kodu] if calisan in proje]
+        if not performanslar:
+            continue
+        if len(performanslar) > 25:
+            agirlikli = np.mean(performanslar[-25:]) * 0.4 + np.mean(performanslar[:-25]) * 0.6
+        else:
+            agirlikli = np.mean(performanslar)
+        trend = np.polyfit(range(len(performanslar)), performanslar, 1)[0] if len(performanslar) > 1 else 0
+        dagilimlar[tasarim_kodu] = {
+            'performanslar': performanslar,
+            'agirlikli_performans': float(agirlikli),
+            'trend': float(trend),
+            'varyans': float(np.var(performanslar)),
+        }
+    return dagilimlar
+
+
+class TopluPerformansDagilimiTestleri(TestCase):
+    """toplu_performans_dagilimi, çalışan başına döngülü hesapla aynı dağılımları üretmeli."""
+
+    def test_dongulu_hesapla_ayni(self):
+        rng = np.random.default_rng(5)
+        calisanlar = [f"C{i}" for i in range(6)]
+        # Tek projeli, 25'ten az ve 25'ten çok projeli tasarım kodları; C5 hiçbir projede yok
+        veriler = {}
+        for kod, proje_sayisi in (("K1", 1), ("K2", 12), ("K3", 60)):
+            veriler[kod] = [
+                {c: float(rng.random()) for c in calisanlar[:5] if rng.random() < 0.7}
+                for _ in range(proje_sayisi)
+            ]
+
+        sonuc = toplu_performans_dagilimi(veriler, calisanlar)
+        self.assertNotIn("C5", sonuc)
+        for calisan in calisanlar[:5]:
+            beklenen = dongu_performans_dagilimi(veriler, calisan)
+            self.assertEqual(set(sonuc.get(calisan, {})), set(beklenen), msg=calisan)
+            for kod, dagilim in beklenen.items():
+                gercek = sonuc[calisan][kod]
+                self.assertEqual(gercek['performanslar'], dagilim['performanslar'])
+                for alan in ('agirlikli_performans', 'trend', 'varyans'):
+                    self.assertAlmostEqual(gercek[alan], dagilim[alan], places=9, msg=f"{calisan}/{kod}/{alan}")
+
+    def test_sabit_seride_trend_ve_varyans_sifir(self):
+        veriler = {"K1": [{"C0": 0.6} for _ in range(30)]}
+        dagilim = toplu_performans_dagilimi(veriler, ["C0"])["C0"]["K1"]
+        self.assertAlmostEqual(dagilim['agirlikli_performans'], 0.6, places=12)
+        self.assertAlmostEqual(dagilim['trend'], 0.0, places=12)
+        self.assertAlmostEqual(dagilim['varyans'], 0.0, places=12)
+
+
+class TopluSnrTestleri(TestCase):
+    """calculate_snr_batch, her değer grubu için calculate_snr ile aynı sonucu vermeli."""
+
+    def test_skaler_hesapla_ayni(self):
+        rng = np.random.default_rng(2)
+        degerler = rng.uniform(10, 200, size=(4, 6, 5))
+        # Sabit grup: nominal SNR'de varyans sıfır durumu
+        degerler[1, 2] = 42.0
+        for snr_type in ("smaller", "larger", "nominal"):
+            toplu = calculate_snr_batch(degerler, snr_type)
+            self.assertEqual(toplu.shape, degerler.shape[:-1])
+            for indeks in np.ndindex(*degerler.shape[:-1]):
+                self.assertAlmostEqual(toplu[indeks], calculate_snr(degerler[indeks], snr_type), places=9,
+                                       msg=f"{snr_type}/{indeks}")
+        self.assertEqual(calculate_snr_batch(degerler, "nominal")[1, 2], 0.0)
+
+    def test_tek_degerli_gruplar(self):
+        degerler = np.array([[50.0], [120.0]])
+        for snr_type in ("smaller", "larger", "nominal"):
+            np.testing.assert_allclose(calculate_snr_batch(degerler, snr_type),
+                                       [calculate_snr(d, snr_type) for d in degerler])
+
+    def test_gecersiz_tip_hata_verir(self):
+        with self.assertRaises(ValueError):
+            calculate_snr_batch([[1.0, 2.0]], "bilinmeyen")
+
+
+class ParametreEtkisiTestleri(TestCase):
+    """analyze_parameter_effects, her (parametre, seviye) çifti için döngüyle bulunan ortalama SNR'yi vermeli."""
+
+    def test_dongulu_ortalamayla_ayni(self):
+        rng = np.random.default_rng(4)
+        parameter_levels = {"K1": [90.0, 100.0, 110.0], "K2": [40.0, 45.0, 50.0], "K3": [200.0, 210.0, 220.0]}
+        deneyler = rng.integers(0, 3, size=(40, 3))
+        # K3'ün son seviyesi hiç denenmemiş olsun
+        deneyler[:, 2] = np.minimum(deneyler[:, 2], 1)
+        snr_values = rng.normal(-40, 2, size=40)
+
+        etkiler = analyze_parameter_effects(parameter_levels, deneyler, snr_values)
+        for i, (kod, seviyeler) in enumerate(parameter_levels.items()):
+            for seviye_idx, seviye in enumerate(seviyeler):
+                secili = snr_values[deneyler[:, i] == seviye_idx]
+                beklenen = float(np.mean(secili)) if len(secili) else 0.0
+                self.assertAlmostEqual(etkiler[kod][seviye], beklenen, places=9, msg=f"{kod}/{seviye}")
+        self.assertEqual(etkiler["K3"][220.0], 0.0)
+
+    def test_ortogonal_dizide_seviyeler_esit_agirlikli(self):
+        parameter_levels = {f"K{i}": [10.0 * i + s for s in range(3)] for i in range(1, 5)}
+        dizi = create_orthogonal_array(len(parameter_levels), 3)
+        snr_values = np.arange(len(dizi), dtype=float)
+
+        etkiler = analyze_parameter_effects(parameter_levels, dizi, snr_values)
+        for i, (kod, seviyeler) in enumerate(parameter_levels.items()):
+            for seviye_idx, seviye in enumerate(seviyeler):
+                self.assertAlmostEqual(etkiler[kod][seviye], snr_values[dizi[:, i] == seviye_idx].mean(), places=9)
+
+
+class OrtogonalDiziTestleri(TestCase):
+    """create_orthogonal_array, güç 2 ortogonal dizi üretmeli: her sütun çiftinde her seviye çifti eşit sayıda."""
+
+    def test_seviye_ciftleri_esit_sayida(self):
+        for level_count in (2, 3, 4, 5, 8, 9):
+            for parameter_count in (1, 2, level_count + 1, level_count + 2, 13):
+                dizi = create_orthogonal_array(parameter_count, level_count)
+                self.assertEqual(dizi.shape[1], parameter_count)
+                satir_sayisi = len(dizi)
+                self.assertEqual(satir_sayisi % level_count ** 2, 0)
+                for i in range(parameter_count):
+                    np.testing.assert_array_equal(
+                        np.bincount(dizi[:, i], minlength=level_count), satir_sayisi // level_count
+                    )
+                    for j in range(i + 1, parameter_count):
+                        ciftler = np.bincount(dizi[:, i].astype(int) * level_count + dizi[:, j],
+                                              minlength=level_count ** 2)
+                        np.testing.assert_array_equal(ciftler, satir_sayisi // level_count ** 2,
+                                                      err_msg=f"q={level_count}, k={parameter_count}, ({i}, {j})")
+
+    def test_bilinen_boyutlar(self):
+        self.assertEqual(create_orthogonal_array(4, 3).shape, (9, 4))
+        self.assertEqual(create_orthogonal_array(13, 3).shape, (27, 13))
+        self.assertEqual(create_orthogonal_array(6, 5).shape, (25, 6))
+        self.assertEqual(create_orthogonal_array(7, 2).shape, (8, 7))
+
+    def test_asal_kuvveti_olmayan_seviye(self):
+        self.assertIsNone(create_orthogonal_array(4, 6))
+        self.assertIsNone(create_orthogonal_array(0, 3))
+
+    def test_dizi_salt_okunur(self):
+        dizi = create_orthogonal_array(4, 3)
+        with self.assertRaises(ValueError):
+            dizi[0, 0] = 1
+
+
+def dongu_gecmis_analizi(sureler):
+    """Toplu analizin karşılaştırıldığı, tek tasarım kodu için döngülü referans hesap."""
+    q1, q3 = np.percentile(sureler, 25), np.percentile(sureler, 75)
+    iqr = q3 - q1
+    filtrelenmis = [s for s in sureler if q1 - 1.5 * iqr <= s <= q3 + 1.5 * iqr] or list(sureler)
+    ortalama, std, minimum = np.mean(filtrelenmis), np.std(filtrelenmis), np.min(filtrelenmis)
+    z = stats.norm.ppf(0.975)
+    return {
+        "optimum_sure": (ortalama - z * std) * 0.4 + ortalama * 0.4 + minimum * 0.2,
+        "ortalama": ortalama,
+        "std": std,
+        "minimum": minimum,
+        "q1": q1,
+        "q3": q3,
+    }
+
+
+class TopluGecmisAnaliziTestleri(TestCase):
+    """toplu_gecmis_analizi, her kod için ayrı yapılan analizle aynı sonuçları vermeli."""
+
+    def test_dongulu_analizle_ayni(self):
+        rng = np.random.default_rng(9)
+        gecmis_veriler = {
+            "K1": {"gecmis_sureler": list(rng.normal(100, 10, size=30)) + [400.0, 5.0]},
+            "K2": {"gecmis_sureler": [75.0]},
+            "K3": {"gecmis_sureler": list(rng.uniform(20, 60, size=7))},
+            "K4": {"gecmis_sureler": []},
+        }
+        analizler = toplu_gecmis_analizi(gecmis_veriler)
+
+        self.assertEqual(set(analizler), {"K1", "K2", "K3"})
+        for kod, analiz in analizler.items():
+            sureler = gecmis_veriler[kod]["gecmis_sureler"]
+            beklenen = dongu_gecmis_analizi(sureler)
+            for alan, deger in beklenen.items():
+                self.assertAlmostEqual(analiz[alan], deger, places=9, msg=f"{kod}/{alan}")
+            self.assertEqual(analiz["original_count"], len(sureler))
+        self.assertEqual(analizler["K1"]["filtered_count"], 30)
+
+    def test_esit_sureler_sonlu_sonuc_verir(self):
+        analiz = toplu_gecmis_analizi({"K1": {"gecmis_sureler": [50.0] * 12}})["K1"]
+        self.assertEqual(analiz["std"], 0.0)
+        self.assertEqual(analiz["filtered_count"], 12)
+        self.assertAlmostEqual(analiz["optimum_sure"], 50.0, places=12)
+        self.assertEqual(analiz["guven_araligi"], (50.0, 50.0))
+        self.assertTrue(all(np.isfinite(v) for v in (analiz["optimum_sure"], analiz["ortalama"], analiz["minimum"])))
+
+
+class AtamaCozucuTestleri(TestCase):
+    """solve_assignments seviye bazlı Macar çözümü üretmeli: her çalışan kendi seviyesinde, en fazla bir kez."""
+
+    ISLER = [
+        {"id": 1, "kod": "K1", "oncelik": "normal"},
+        {"id": 2, "kod": "K2", "oncelik": "kritik"},
+        {"id": 3, "kod": "K1", "oncelik": "normal"},
+        {"id": 4, "kod": "K3", "oncelik": "normal"},
+    ]
+
+    def setUp(self):
+        self.tasarim_kodlari, self.calisanlar, self.mc_results = ga_verisi()
+        self.fm = build_fitness_matrix(self.tasarim_kodlari, self.calisanlar, self.mc_results)
+
+    def atanmis_calisanlar(self, atamalar):
+        return [isim for seviyeler in atamalar.values() for isimler in seviyeler.values() for isim in isimler]
+
+    def test_seviye_ve_tekillik_kisitlari(self):
+        atamalar, eksikler = solve_assignments(self.ISLER, self.fm)
+
+        atananlar = self.atanmis_calisanlar(atamalar)
+        self.assertEqual(len(atananlar), len(set(atananlar)))
+        for is_obj in self.ISLER:
+            ihtiyac = self.tasarim_kodlari[is_obj["kod"]]["personel_ihtiyaci"]
+            for seviye_str, seviye_int in SEVIYELER:
+                isimler = atamalar[is_obj["id"]][seviye_str]
+                self.assertTrue(all(self.calisanlar[i]["yetkinlik_seviyesi"] == seviye_int for i in isimler))
+                self.assertEqual(len(isimler) + eksikler[is_obj["id"]][seviye_str], ihtiyac[seviye_str])
+
+        # Rol sayısı çalışandan fazla olduğundan her seviyedeki tüm çalışanlar kullanılır
+        self.assertEqual(sorted(atananlar), sorted(self.calisanlar))
+
+    def test_seviye_basina_en_iyi_atama(self):
+        atamalar, _ = solve_assignments(self.ISLER, self.fm)
+        isler = {is_obj["id"]: (self.fm["task_index"][is_obj["kod"]], is_obj["oncelik"] == "kritik")
+                 for is_obj in self.ISLER}
+
+        def agirlik(isim, is_id):
+            t_idx, kritik = isler[is_id]
+            return KRITIK_AGIRLIGI * kritik + self.fm["fitness"][senaryo_index(kritik), t_idx,
+                                                                 self.fm["worker_index"][isim]]
+
+        for s_idx, (seviye_str, seviye_int) in enumerate(SEVIYELER):
+            # Seviyedeki tüm rol-çalışan eşleşmeleri kaba kuvvetle denenir
+            roller = [is_id for is_id, (t_idx, _) in isler.items() for _ in range(self.fm["ihtiyac"][t_idx, s_idx])]
+            isimler = [w for w, info in self.calisanlar.items() if info["yetkinlik_seviyesi"] == seviye_int]
+            en_iyi = max(
+                sum(agirlik(isim, is_id) for isim, is_id in zip(isimler, secim))
+                for secim in itertools.permutations(roller, min(len(roller), len(isimler)))
+            )
+            bulunan = sum(
+                agirlik(isim, is_id) for is_id, seviyeler in atamalar.items() for isim in seviyeler[seviye_str]
+            )
+            self.assertAlmostEqual(bulunan, en_iyi, places=9, msg=seviye_str)
+
+    def test_kritik_is_once_doldurulur(self):
+        atamalar, eksikler = solve_assignments(self.ISLER, self.fm)
+        self.assertEqual(sum(eksikler[2].values()), 0)
+        self.assertEqual(len(atamalar[2]["cirak"]), 2)
+
+    def test_mesgul_calisanlar_atanmaz(self):
+        mesgul = {"C0", "C4", "C6"}
+        atamalar, _ = solve_assignments(self.ISLER, self.fm, mesgul)
+        self.assertFalse(mesgul & set(self.atanmis_calisanlar(atamalar)))
+
+
+class AtamaKaydiTestleri(TestCase):
+    """assignment_solver.main meşgul çalışanlara dokunmamalı ve taşeron sayısını onaylı değerin üzerine çıkarmamalı."""
+
+    def setUp(self):
+        self.tasarim = TasarimKodu.objects.create(
+            kod="K1", urun_adi="U1", tahmini_montaj_suresi=100.0, minimum_yetkinlik_seviyesi=1,
+            optimum_yetkinlik_seviyesi=1, ortalama_uretim_adedi=1, zorluk_derecesi=1, departman="D1",
+            ustabasi=1, kalifiyeli=0, cirak=0,
+        )
+        self.u1, self.u2, self.u3 = [
+            Calisan.objects.create(ad_soyad=f"U{i}", yetkinlik_seviyesi=1, tecrube_yili=10.0 * i,
+                                   verimlilik_puani=0.3 * i)
+            for i in (1, 2, 3)
+        ]
+
+    def is_olustur(self, durum, oncelik="normal", taseron_ustabasi=0, calisan=None):
+        is_obj = Is.objects.create(
+            tasarim=self.tasarim, proje_adi=f"P{Is.objects.count()}", teslimat_tarihi=date(2026, 1, 1),
+            durum=durum, oncelik=oncelik, kalan_sure=10.0, taseron_ustabasi=taseron_ustabasi,
+        )
+        if calisan is not None:
+            IsAtama.objects.create(is_objesi=is_obj, calisan=calisan, seviye="ustabasi")
+        return is_obj
+
+    def atananlar(self, is_obj):
+        return set(IsAtama.objects.filter(is_objesi=is_obj).values_list("calisan__ad_soyad", flat=True))
+
+    def test_devam_eden_isin_calisani_atanmaz(self):
+        devam_eden = self.is_olustur("devam_ediyor", calisan=self.u3)
+        bekleyenler = [self.is_olustur("beklemede", taseron_ustabasi=1) for _ in range(3)]
+
+        with redirect_stdout(io.StringIO()):
+            assignment_solver.main()
+
+        self.assertEqual(self.atananlar(devam_eden), {"U3"})
+        atananlar = [isim for is_obj in bekleyenler for isim in self.atananlar(is_obj)]
+        self.assertNotIn("U3", atananlar)
+        self.assertEqual(sorted(atananlar), ["U1", "U2"])
+
+    def test_taseron_onayli_degeri_asmaz(self):
+        self.is_olustur("devam_ediyor", calisan=self.u3)
+        # Onaysız iki iş mevcut çalışanlarıyla dolu; kritik iş için taşeron onayı var
+        a = self.is_olustur("beklemede", calisan=self.u1)
+        b = self.is_olustur("beklemede", calisan=self.u2)
+        c = self.is_olustur("beklemede", oncelik="kritik", taseron_ustabasi=1)
+        onayli = {is_obj.id: is_obj.taseron_ustabasi for is_obj in (a, b, c)}
+
+        with redirect_stdout(io.StringIO()):
+            sonuc = assignment_solver.main()
 
-# Create your tests here.
+        for is_obj in Is.objects.filter(durum="beklemede"):
+            self.assertLessEqual(is_obj.taseron_ustabasi, onayli[is_obj.id], msg=is_obj.proje_adi)
+        self.assertEqual(self.atananlar(a), {"U1"})
+        self.assertEqual(self.atananlar(b), {"U2"})
+        self.assertEqual(self.atananlar(c), set())
+        self.assertEqual(Is.objects.get(id=c.id).taseron_ustabasi, 1)
+        self.assertEqual(sonuc["eksik_rol_sayisi"], 1)
@@ -23,6 +23,7 @@ urlpatterns = [
     path('api/performans-degerlendirme-kaydet/', views.performans_degerlendirme_kaydet, name='performans_degerlendirme_kaydet'),
     path('api/genetik-sonuclari/', views.get_genetik_sonuclari, name='genetik_sonuclari'),
     path('api/son-taguchi-sonuclari', views.son_taguchi_sonuclari, name='son_taguchi_sonuclari'),
+    path('api/taguchi-grafikleri', views.taguchi_grafikleri, name='taguchi_grafikleri'),
 
     # Raporlar
     path('api/rapor/haftalik', views.rapor_haftalik, name='rapor_haftalik'),
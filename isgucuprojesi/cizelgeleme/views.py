@@ -12,14 +12,14 @@ from django.db.models.functions import TruncDate
 from django.core.serializers.json import DjangoJSONEncoder
 import logging
 
-from .models import Calisan, TasarimKodu, Is, IsAtama, MonteCarloSonuc, GenetikSonuc, TaguchiSonucu, MonteCarloTasarimSonuc, PerformansDegerlendirme, GecmisPerformansVerisi, GecmisSureVerisi
-from django.utils.dateparse import parse_date
+from .models import Calisan, TasarimKodu, Is, IsAtama, MonteCarloSonuc, GenetikSonuc, GenetikAtama, TaguchiSonucu, MonteCarloTasarimSonuc, PerformansDegerlendirme, GecmisPerformansVerisi, GecmisSureVerisi
+from django.utils.dateparse import parse_date, parse_datetime
+from django.conf import settings
 from rest_framework.decorators import api_view
+from rest_framework import serializers
 from rest_framework.response import Response
-from .serializers import GenetikSonucSerializer
-from .algorithms.monte_carlo_simulasyon import monte_carlo_simulasyonu, performans_verilerini_oku
-from .algorithms.geneticalgorithm import main as run_genetic_algorithm
-from .algorithms.taguchi import main as taguchi_main_function
+from .sayfalama import SorguParametresiHatasi, secili_alanlar, filtre_degeri, imlec_sayfasi
+from .pano import pano_verisi
 from asgiref.sync import async_to_sync
 
 
@@ -130,42 +130,69 @@ def calisanlar(request):
     return render(request, 'cizelgeleme/calisanlar.html', {'calisanlar': calisanlar})
 
 
+MC_ALANLARI = ('ortalama_performans', 'risk_skoru', 'gecikme_olasiligi', 'performans_kararliligi', 'tasarim_bazli_performans')
+
+def monte_carlo_sayfasi(params):
+    """
+    Monte Carlo sonuçlarının bir sayfasını çalışan adına göre gruplanmış olarak döndürür.
+
+    Parametreler (sorgu dizesi):
+    - limit, imlec: Sayfa boyu ve önceki sayfanın imleci (MonteCarloSonuc id'si)
+    - calisan: Yalnızca bu çalışanın (id) sonuçları
+    - tasarim_kodu: Tasarım bazlı performans listesini bu tasarım koduyla sınırlar
+    - fields: Döndürülecek alanlar (MC_ALANLARI içinden, virgülle ayrılmış)
+    """
+    alanlar = secili_alanlar(params, MC_ALANLARI)
+    sayisal_alanlar = [alan for alan in alanlar if alan != 'tasarim_bazli_performans']
+
+    sorgu = MonteCarloSonuc.objects.filter(calisan__isnull=False)
+    calisan_id = filtre_degeri(params, 'calisan', int)
+    if calisan_id is not None:
+        sorgu = sorgu.filter(calisan_id=calisan_id)
+    sonuclar, sonraki = imlec_sayfasi(
+        sorgu.values('id', 'calisan_id', *sayisal_alanlar, calisan_adi=models.F('calisan__ad_soyad')), params
+    )
+
+    calisan_sonuclari = {}
+    calisan_adlari = {}
+    for sonuc in sonuclar:
+        if sonuc['calisan_adi'] not in calisan_sonuclari:
+            calisan_sonuclari[sonuc['calisan_adi']] = {alan: sonuc[alan] for alan in sayisal_alanlar}
+            calisan_adlari[sonuc['calisan_id']] = sonuc['calisan_adi']
+
+    if 'tasarim_bazli_performans' in alanlar:
+        for kayit in calisan_sonuclari.values():
+            kayit['tasarim_bazli_performans'] = []
+        tasarim_sorgu = MonteCarloTasarimSonuc.objects.filter(calisan_id__in=list(calisan_adlari), tasarim__isnull=False)
+        tasarim_kodu = filtre_degeri(params, 'tasarim_kodu')
+        if tasarim_kodu is not None:
+            tasarim_sorgu = tasarim_sorgu.filter(tasarim__kod=tasarim_kodu)
+        for tasarim_sonuc in tasarim_sorgu.order_by('id').values(
+            'calisan_id', 'ortalama', 'risk_skoru', 'gecikme_olasiligi', tasarim_kodu=models.F('tasarim__kod')
+        ):
+            calisan_sonuclari[calisan_adlari[tasarim_sonuc['calisan_id']]]['tasarim_bazli_performans'].append({
+                'tasarim_kodu': tasarim_sonuc['tasarim_kodu'],
+                'performans_ort': tasarim_sonuc['ortalama'],
+                'risk': tasarim_sonuc['risk_skoru'],
+                'gecikme': tasarim_sonuc['gecikme_olasiligi']
+            })
+
+    return calisan_sonuclari, sonraki
+
+
 @require_http_methods(["GET"])
 def son_simulasyon_verileri(request):
     try:
-        # En son simülasyon sonuçlarını al
-        monte_carlo_sonuclari = MonteCarloSonuc.objects.select_related('calisan').all()
-        tasarim_bazli_sonuclar = MonteCarloTasarimSonuc.objects.select_related('calisan', 'tasarim').all()
-
-        calisan_sonuclari = {}
-
-        for sonuc in monte_carlo_sonuclari:
-            if sonuc.calisan:
-                calisan_adi = sonuc.calisan.ad_soyad
-                if calisan_adi not in calisan_sonuclari:
-                    calisan_sonuclari[calisan_adi] = {
-                        'ortalama_performans': sonuc.ortalama_performans,
-                        'risk_skoru': sonuc.risk_skoru,
-                        'gecikme_olasiligi': sonuc.gecikme_olasiligi,
-                        'performans_kararliligi': sonuc.performans_kararliligi,
-                        'tasarim_bazli_performans': []
-                    }
-
-        for tasarim_sonuc in tasarim_bazli_sonuclar:
-            if tasarim_sonuc.calisan and tasarim_sonuc.tasarim:
-                calisan_adi = tasarim_sonuc.calisan.ad_soyad
-                if calisan_adi in calisan_sonuclari:
-                    calisan_sonuclari[calisan_adi]['tasarim_bazli_performans'].append({
-                        'tasarim_kodu': tasarim_sonuc.tasarim.kod,
-                        'performans_ort': tasarim_sonuc.ortalama,
-                        'risk': tasarim_sonuc.risk_skoru,
-                        'gecikme': tasarim_sonuc.gecikme_olasiligi
-                    })
+        # En son simülasyon sonuçlarını al (sayfalı)
+        calisan_sonuclari, sonraki = monte_carlo_sayfasi(request.GET)
 
         return JsonResponse({
             "success": True,
-            "monte_carlo_sonuclari": calisan_sonuclari
+            "monte_carlo_sonuclari": calisan_sonuclari,
+            "sonraki": sonraki
         })
+    except SorguParametresiHatasi as e:
+        return JsonResponse({"success": False, "mesaj": str(e)}, status=400)
     except Exception as e:
         return JsonResponse({
             "success": False,
@@ -479,149 +506,46 @@ def get_calisanlar_for_is(request):
         return JsonResponse({'success': False, 'message': 'İş bulunamadı.'}, status=404)
 
 
+TAGUCHI_ALANLARI = ('tasarim_kodu', 'optimum_sure', 'optimum_seviye', 'iyilestirme_orani', 'method', 'departman', 'guncellenme_tarihi')
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def taguchi_optimizasyon(request):
+    """
+    Taguchi sonuçlarını sayfalı döndürür.
+
+    Sorgu parametreleri: limit, imlec, tasarim_kodu ve fields (TAGUCHI_ALANLARI içinden).
+    """
     try:
+        alanlar = secili_alanlar(request.GET, TAGUCHI_ALANLARI)
         taguchi_sonuclari = TaguchiSonucu.objects.all()
+        tasarim_kodu = filtre_degeri(request.GET, 'tasarim_kodu')
+        if tasarim_kodu is not None:
+            taguchi_sonuclari = taguchi_sonuclari.filter(tasarim_kodu=tasarim_kodu)
+        sayfa, sonraki = imlec_sayfasi(taguchi_sonuclari.values('id', *alanlar), request.GET)
         # Verileri JSON formatına dönüştürün
         data = {
-            "taguchi_sonuclari": list(taguchi_sonuclari.values())
+            "taguchi_sonuclari": sayfa
         }
-        return JsonResponse({"success": True, "taguchi_sonuclari": data})
+        return JsonResponse({"success": True, "taguchi_sonuclari": data, "sonraki": sonraki})
+    except SorguParametresiHatasi as e:
+        return JsonResponse({"success": False, "mesaj": str(e)}, status=400)
     except Exception as e:
         return JsonResponse({"success": False, "mesaj": str(e)}, status=500)
 
 
 def is_cizelgesi(request):
-    # İş listesi ve tasarım kodları
-    is_listesi = Is.objects.select_related('tasarim').prefetch_related('atananlar__calisan')
-    tasarim_kodlari = TasarimKodu.objects.all()
-
-    durum_map = {
-        'beklemede': 'Beklemede',
-        'devam_ediyor': 'Devam Ediyor',
-        'tamamlandi': 'Tamamlandı'
-    }
-
-    gorsel_is_listesi = []
-    for is_obj in is_listesi:
-        atanan_calisanlar = {'ustabasi': [], 'kalifiyeli': [], 'cirak': []}
-        for atama in is_obj.atananlar.all():
-            if atama.calisan:
-                atanan_calisanlar[atama.seviye].append(atama.calisan.ad_soyad)
-        
-        # Taşeronları ekle
-        if is_obj.taseron_ustabasi > 0:
-            atanan_calisanlar['ustabasi'].extend([f"Taşeron İşçi (Ustabaşı)"] * is_obj.taseron_ustabasi)
-        if is_obj.taseron_kalifiyeli > 0:
-            atanan_calisanlar['kalifiyeli'].extend([f"Taşeron İşçi (Kalifiyeli)"] * is_obj.taseron_kalifiyeli)
-        if is_obj.taseron_cirak > 0:
-            atanan_calisanlar['cirak'].extend([f"Taşeron İşçi (Çırak)"] * is_obj.taseron_cirak)
-
-        is_obj.atanan_calisanlar = atanan_calisanlar
-
-        gorsel_is_listesi.append({
-            'id': is_obj.id,
-            'kod': is_obj.tasarim.kod,
-            'proje_adi': is_obj.proje_adi,
-            'teslimat_tarihi': is_obj.teslimat_tarihi,
-            'oncelik': is_obj.oncelik,
-            'durum': is_obj.durum,
-            'durum_gosterim': durum_map.get(is_obj.durum, is_obj.durum),
-            'kalan_sure': is_obj.kalan_sure,
-            'atanan_calisanlar': atanan_calisanlar
-        })
-
-    # Monte Carlo sonuçlarını hazırla
-    monte_carlo_sonuclari = MonteCarloSonuc.objects.select_related('calisan').all()
-    tasarim_bazli_sonuclar = MonteCarloTasarimSonuc.objects.select_related('calisan', 'tasarim').all()
-    
-    calisan_sonuclari = {}
-    for sonuc in monte_carlo_sonuclari:
-        if sonuc.calisan:
-            calisan_adi = sonuc.calisan.ad_soyad
-            if calisan_adi not in calisan_sonuclari:
-                calisan_sonuclari[calisan_adi] = {
-                    'ortalama_performans': sonuc.ortalama_performans,
-                    'risk_skoru': sonuc.risk_skoru,
-                    'gecikme_olasiligi': sonuc.gecikme_olasiligi,
-                    'performans_kararliligi': sonuc.performans_kararliligi,
-                    'tasarim_bazli_performans': []
-                }
-
-    for tasarim_sonuc in tasarim_bazli_sonuclar:
-        if tasarim_sonuc.calisan and tasarim_sonuc.tasarim:
-            calisan_adi = tasarim_sonuc.calisan.ad_soyad
-            if calisan_adi in calisan_sonuclari:
-                calisan_sonuclari[calisan_adi]['tasarim_bazli_performans'].append({
-                    'tasarim_kodu': tasarim_sonuc.tasarim.kod,
-                    'performans_ort': tasarim_sonuc.ortalama,
-                    'risk': tasarim_sonuc.risk_skoru,
-                    'gecikme': tasarim_sonuc.gecikme_olasiligi
-                })
-
-    # Genetik Algoritma sonuçlarını al ve grupla
-    genetik_sonuclari = GenetikSonuc.objects.select_related('tasarim').prefetch_related(
-        'atamalar', 
-        'atamalar__calisan'
-    ).order_by('-kayit_tarihi')
-
-    # Genetik sonuçları senaryolara göre grupla
-    genetik_gruplu = {
-        'normal': [],
-        'kritik': []
-    }
-    for sonuc in genetik_sonuclari:
-        atamalar = list(sonuc.atamalar.filter(atanma_tipi='atanan').select_related('calisan'))
-        alternatifler = list(sonuc.atamalar.filter(atanma_tipi='alternatif').select_related('calisan').order_by('-uygunluk_orani'))
-        if atamalar:
-            genetik_gruplu[sonuc.senaryo].append({
-                'tasarim_kodu': sonuc.tasarim.kod,
-                'atamalar': atamalar,
-                'alternatifler': alternatifler,
-                'kayit_tarihi': sonuc.kayit_tarihi
-            })
-
-    # Taguchi sonuçlarını al
-    taguchi_sonuclari = TaguchiSonucu.objects.all().order_by('-guncellenme_tarihi')
-
-    # İstatistikler
-    tamamlanan = Is.objects.filter(durum='tamamlandi').count()
-    devam_eden = Is.objects.filter(durum='devam_ediyor').count()
-    bekleyen = Is.objects.filter(durum='beklemede').count()
-
-    # Monte Carlo istatistikleri
-    if monte_carlo_sonuclari.exists():
-        ortalama_performans = monte_carlo_sonuclari.aggregate(Avg('ortalama_performans'))['ortalama_performans__avg']
-        ortalama_risk = monte_carlo_sonuclari.aggregate(Avg('risk_skoru'))['risk_skoru__avg']
-    else:
-        ortalama_performans = 0
-        ortalama_risk = 0
-
-    # Taguchi istatistikleri
-    if taguchi_sonuclari.exists():
-        ortalama_iyilestirme = taguchi_sonuclari.aggregate(Avg('iyilestirme_orani'))['iyilestirme_orani__avg']
-    else:
-        ortalama_iyilestirme = 0
+    """
+    İş çizelgesi sayfası.
 
-    is_listesi_json = json.dumps(gorsel_is_listesi, cls=DjangoJSONEncoder)
+    Sayfa, optimizasyon sonuçları yayınlandığında yeniden oluşturulan ve önbellekte tutulan okuma
+    modelinden (pano) çizilir; önbellek doluysa istek başına veritabanı sorgusu yapılmaz.
+    """
+    pano = pano_verisi()
 
     context = {
-        'is_listesi': gorsel_is_listesi,
-        'tasarim_kodlari': tasarim_kodlari,
-        'monte_carlo_sonuclari': calisan_sonuclari,
-        'genetik_gruplu': genetik_gruplu,
-        'taguchi_sonuclari': taguchi_sonuclari,
-        'tamamlanan': tamamlanan,
-        'devam_eden': devam_eden,
-        'bekleyen': bekleyen,
-        'istatistikler': {
-            'ortalama_performans': ortalama_performans,
-            'ortalama_risk': ortalama_risk,
-            'ortalama_iyilestirme': ortalama_iyilestirme
-        },
-        'is_listesi_json': is_listesi_json
+        **pano,
+        'is_listesi_json': json.dumps(pano['is_listesi'], cls=DjangoJSONEncoder)
     }
 
     return render(request, 'cizelgeleme/is_cizelgesi.html', context)
@@ -637,64 +561,109 @@ def son_taguchi_sonuclari(request):
         }
     })
 
+def taguchi_grafikleri(request):
+    """
+    Taguchi grafiklerinin adreslerini döndürür.
+
+    Güncel sonuçlar için grafikler henüz çizilmediyse çizim görevi kuyruğa alınır ve 202 döner.
+    """
+    from .algorithms.taguchi_grafikleri import onbellekteki_grafikler
+    from .tasks import render_taguchi_charts
+
+    try:
+        grafikler = onbellekteki_grafikler()
+        if grafikler is None:
+            render_taguchi_charts.delay()
+            return JsonResponse({"success": True, "hazir": False}, status=202)
+        return JsonResponse({"success": True, "hazir": True, **grafikler})
+    except Exception as e:
+        return JsonResponse({
+            "success": False,
+            "mesaj": f"Taguchi grafikleri alınırken hata oluştu: {str(e)}"
+        }, status=500)
+
+GENETIK_ATAMA_ALANLARI = ('calisan', 'seviye', 'atanma_tipi', 'uygunluk_orani')
+
 @api_view(['GET'])
 def get_genetik_sonuclari(request):
-    queryset = GenetikSonuc.objects.prefetch_related('atamalar__calisan').select_related('tasarim')
-    serializer = GenetikSonucSerializer(queryset, many=True)
+    """
+    Genetik algoritma sonuçlarını tasarım kodu ve senaryoya göre gruplanmış, sayfalı döndürür.
+
+    Sorgu parametreleri:
+    - limit, imlec: Sayfa boyu ve önceki sayfanın imleci (GenetikSonuc id'si); sonraki sayfanın imleci
+      X-Sonraki-Imlec başlığında döner
+    - tasarim_kodu, senaryo: Sonuç filtreleri
+    - calisan: Yalnızca bu çalışanın (id) yer aldığı sonuçlar ve ona ait atamalar
+    - atanma_tipi: 'atanan' veya 'alternatif'; alternatif listesini hiç almamak için 'atanan' verilebilir
+    - fields: Atama alanları (GENETIK_ATAMA_ALANLARI içinden)
+    """
+    params = request.query_params
+    try:
+        alanlar = secili_alanlar(params, GENETIK_ATAMA_ALANLARI)
+        sorgu = GenetikSonuc.objects.all()
+        atama_sorgu = GenetikAtama.objects.all()
+
+        tasarim_kodu = filtre_degeri(params, 'tasarim_kodu')
+        if tasarim_kodu is not None:
+            sorgu = sorgu.filter(tasarim__kod=tasarim_kodu)
+        senaryo = filtre_degeri(params, 'senaryo')
+        if senaryo is not None:
+            sorgu = sorgu.filter(senaryo=senaryo)
+        calisan_id = filtre_degeri(params, 'calisan', int)
+        if calisan_id is not None:
+            sorgu = sorgu.filter(atamalar__calisan_id=calisan_id).distinct()
+            atama_sorgu = atama_sorgu.filter(calisan_id=calisan_id)
+        atanma_tipi = filtre_degeri(params, 'atanma_tipi')
+        if atanma_tipi is not None:
+            atama_sorgu = atama_sorgu.filter(atanma_tipi=atanma_tipi)
+
+        sonuclar, sonraki = imlec_sayfasi(
+            sorgu.values('id', 'senaryo', 'kayit_tarihi', tasarim_kodu=models.F('tasarim__kod')), params
+        )
+    except SorguParametresiHatasi as e:
+        return Response({"success": False, "mesaj": str(e)}, status=400)
+
+    # Atamalar sayfadaki tüm sonuçlar için tek sorguda, yalnızca istenen alanlarla okunur
+    atama_alanlari = [alan for alan in alanlar if alan != 'calisan']
+    if 'calisan' in alanlar:
+        atama_alanlari.append('calisan__ad_soyad')
+    atamalar = {}
+    for atama in atama_sorgu.filter(sonuc_id__in=[s['id'] for s in sonuclar]).order_by('id').values(
+        'sonuc_id', 'atanma_tipi', *[alan for alan in atama_alanlari if alan != 'atanma_tipi']
+    ):
+        sonuc_id = atama.pop('sonuc_id')
+        tip = atama['atanma_tipi'] if 'atanma_tipi' in alanlar else atama.pop('atanma_tipi')
+        if 'calisan__ad_soyad' in atama:
+            atama['calisan'] = {'ad_soyad': atama.pop('calisan__ad_soyad')}
+        atamalar.setdefault((sonuc_id, tip), []).append(atama)
 
     sonuc_dict = {}
+    tarih_alani = serializers.DateTimeField()
 
-    for entry in serializer.data:
+    for entry in sonuclar:
         kod = entry['tasarim_kodu']
         senaryo = entry['senaryo']
-        atanan = [a for a in entry['atamalar'] if a['atanma_tipi'] == 'atanan']
-        alternatif = [a for a in entry['atamalar'] if a['atanma_tipi'] == 'alternatif']
 
         if kod not in sonuc_dict:
             sonuc_dict[kod] = {}
 
         sonuc_dict[kod][senaryo] = {
-            "atanan": atanan,
-            "alternatif": alternatif,
-            "kayit_tarihi": entry['kayit_tarihi']
+            "atanan": atamalar.get((entry['id'], 'atanan'), []),
+            "alternatif": atamalar.get((entry['id'], 'alternatif'), []),
+            "kayit_tarihi": tarih_alani.to_representation(entry['kayit_tarihi'])
         }
 
-    return Response(sonuc_dict)
+    yanit = Response(sonuc_dict)
+    if sonraki:
+        yanit['X-Sonraki-Imlec'] = sonraki
+    return yanit
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def performans_simulasyonu(request):
     try:
-        # Monte Carlo sonuçlarını al
-        monte_carlo_sonuclari = MonteCarloSonuc.objects.select_related('calisan').all()
-        tasarim_bazli_sonuclar = MonteCarloTasarimSonuc.objects.select_related('calisan', 'tasarim').all()
-
-        # Çalışan bazlı sonuçları hazırla
-        calisan_sonuclari = {}
-
-        # Monte Carlo sonuçlarını işle
-        for sonuc in monte_carlo_sonuclari:
-            if sonuc.calisan:
-                calisan_adi = sonuc.calisan.ad_soyad
-                calisan_sonuclari[calisan_adi] = {
-                    'ortalama_performans': float(sonuc.ortalama_performans),
-                    'risk_skoru': float(sonuc.risk_skoru),
-                    'gecikme_olasiligi': float(sonuc.gecikme_olasiligi),
-                    'performans_kararliligi': float(sonuc.performans_kararliligi),
-                    'tasarim_bazli_performans': []
-                }
-
-        # Tasarım bazlı sonuçları ekle
-        for tasarim_sonuc in tasarim_bazli_sonuclar:
-            if tasarim_sonuc.calisan and tasarim_sonuc.tasarim:
-                calisan_adi = tasarim_sonuc.calisan.ad_soyad
-                if calisan_adi in calisan_sonuclari:
-                    calisan_sonuclari[calisan_adi]['tasarim_bazli_performans'].append({
-                        'tasarim_kodu': tasarim_sonuc.tasarim.kod,
-                        'performans_ort': float(tasarim_sonuc.ortalama),
-                        'risk': float(tasarim_sonuc.risk_skoru),
-                        'gecikme': float(tasarim_sonuc.gecikme_olasiligi)
-                    })
+        # Monte Carlo sonuçlarını al (sayfalı, istenen alanlarla)
+        calisan_sonuclari, sonraki = monte_carlo_sayfasi(request.GET)
 
         # Sonuçları kontrol et
         if not calisan_sonuclari:
@@ -705,9 +674,12 @@ def performans_simulasyonu(request):
             
         return JsonResponse({
             "success": True,
-            "monte_carlo_sonuclari": calisan_sonuclari
+            "monte_carlo_sonuclari": calisan_sonuclari,
+            "sonraki": sonraki
             })
 
+    except SorguParametresiHatasi as e:
+        return JsonResponse({"success": False, "mesaj": str(e)}, status=400)
     except Exception as e:
         import traceback
         return JsonResponse({
@@ -716,33 +688,54 @@ def performans_simulasyonu(request):
             "hata_detay": traceback.format_exc()
         }, status=500)
 
-def raporlama_sayfasi(request):
+def _arsiv_imleci_coz(imlec):
+    """'<tarih>|<id>' biçimindeki arşiv imlecini (tarih, id) olarak çözer; geçersizse None döndürür."""
+    try:
+        tarih, is_id = imlec.rsplit('|', 1)
+        return (parse_datetime(tarih) if tarih else None), int(is_id)
+    except (AttributeError, ValueError):
+        return None
+
+def arsiv_sayfasi(imlec=None):
     """
-    Raporlama ve analiz sayfasını render eder.
+    Tamamlanmış işler arşivinin bir sayfasını anahtar kümesi (keyset) sayfalamasıyla döndürür.
+
+    İşler son değerlendirme tarihine göre yeniden eskiye (değerlendirmesi olmayanlar en sonda), eşitlikte
+    id'ye göre sıralanır. OFFSET kullanılmadığından her sayfa, arşiv ne kadar büyük olursa olsun aynı
+    maliyetle ve iki sorguyla okunur. Sonraki sayfanın imleci (yoksa None) ile birlikte döner.
     """
-    # Genel Pano Verileri
-    toplam_personel_sayisi = Calisan.objects.exclude(ad_soyad__icontains='Taşeron İşçi').count()
+    sayfa_boyu = getattr(settings, "ARSIV_SAYFA_BOYU", 50)
+    sorgu = Is.objects.filter(durum='tamamlandi').select_related('tasarim').annotate(
+        son_degerlendirme_tarihi=models.Max('degerlendirmeler__degerlendirme_tarihi')
+    )
+
+    konum = _arsiv_imleci_coz(imlec) if imlec else None
+    if konum:
+        tarih, is_id = konum
+        if tarih is None:
+            sorgu = sorgu.filter(son_degerlendirme_tarihi__isnull=True, id__gt=is_id)
+        else:
+            sorgu = sorgu.filter(
+                Q(son_degerlendirme_tarihi__lt=tarih) |
+                Q(son_degerlendirme_tarihi=tarih, id__gt=is_id) |
+                Q(son_degerlendirme_tarihi__isnull=True)
+            )
 
-    # Aktif personel sayısı (beklemede veya devam eden işlerdeki)
-    aktif_isler = Is.objects.filter(durum__in=['beklemede', 'devam_ediyor'])
-    aktif_personel_idler = IsAtama.objects.filter(is_objesi__in=aktif_isler).values_list('calisan_id', flat=True).distinct()
-    aktif_personel_sayisi = len(aktif_personel_idler)
-    
-    # Performans skorları
-    genel_performans_skoru = PerformansDegerlendirme.objects.aggregate(ortalama=Avg('puan'))['ortalama'] or 0
+    sayfa = list(sorgu.order_by(
+        models.F('son_degerlendirme_tarihi').desc(nulls_last=True), 'id'
+    ).prefetch_related(
+        models.Prefetch('degerlendirmeler', queryset=PerformansDegerlendirme.objects.select_related('calisan'))
+    )[:sayfa_boyu + 1])
 
-    tamamlanan_is_sayisi = Is.objects.filter(durum='tamamlandi').count()
+    sonraki = None
+    if len(sayfa) > sayfa_boyu:
+        sayfa = sayfa[:sayfa_boyu]
+        son = sayfa[-1]
+        tarih = son.son_degerlendirme_tarihi.isoformat() if son.son_degerlendirme_tarihi else ''
+        sonraki = f"{tarih}|{son.id}"
 
-    # Tamamlanmış İşler Arşivi Verileri
     tamamlanmis_isler = []
-    # İlgili tüm verileri önceden çekerek N+1 probleminden kaçınıyoruz
-    sorgu = Is.objects.filter(durum='tamamlandi').select_related('tasarim').prefetch_related(
-        'degerlendirmeler__calisan'
-    ).annotate(
-        son_degerlendirme_tarihi=models.Max('degerlendirmeler__degerlendirme_tarihi')
-    ).order_by('-son_degerlendirme_tarihi').distinct()
-
-    for is_nesnesi in sorgu:
+    for is_nesnesi in sayfa:
         degerlendirmeler_listesi = []
         genel_notlar = ""
         # Bu işe ait tüm değerlendirmeleri döngü ile alıyoruz
@@ -763,40 +756,58 @@ def raporlama_sayfasi(request):
             'degerlendirmeler': degerlendirmeler_listesi,
             'notlar': genel_notlar
         })
+    return tamamlanmis_isler, sonraki
+
+def raporlama_sayfasi(request):
+    """
+    Raporlama ve analiz sayfasını render eder.
+    """
+    # Genel Pano Verileri
+    toplam_personel_sayisi = Calisan.objects.exclude(ad_soyad__icontains='Taşeron İşçi').count()
+
+    # Aktif personel sayısı (beklemede veya devam eden işlerdeki)
+    aktif_isler = Is.objects.filter(durum__in=['beklemede', 'devam_ediyor'])
+    aktif_personel_idler = IsAtama.objects.filter(is_objesi__in=aktif_isler).values_list('calisan_id', flat=True).distinct()
+    aktif_personel_sayisi = len(aktif_personel_idler)
+    
+    # Performans skorları
+    genel_performans_skoru = PerformansDegerlendirme.objects.aggregate(ortalama=Avg('puan'))['ortalama'] or 0
+
+    tamamlanan_is_sayisi = Is.objects.filter(durum='tamamlandi').count()
+
+    # Tamamlanmış İşler Arşivi Verileri (sayfalı)
+    tamamlanmis_isler, arsiv_sonraki = arsiv_sayfasi(request.GET.get('arsiv_sonraki'))
 
     en_yuksek_performansli = Calisan.objects.annotate(
         ortalama_puan=Avg('performansdegerlendirme__puan')
     ).order_by('-ortalama_puan').first()
 
     # Personel Tablosu Verileri
-    personel_verileri = []
+    # Tamamlanan iş sayısı ve son Monte Carlo sonucu tek sorguda, çalışan başına ek sorgu yapılmadan hesaplanır
+    son_mc_sonuc = MonteCarloSonuc.objects.filter(calisan=models.OuterRef('pk')).order_by('-simulasyon_zamani')
     # Taşeron işçileri hariç tutarak ve puana göre sıralayarak sorgulama
     tum_calisanlar = Calisan.objects.exclude(ad_soyad__icontains='Taşeron İşçi').annotate(
-        ortalama_puan=Avg('performansdegerlendirme__puan', default=0)
-    ).order_by('-ortalama_puan')
-    
+        ortalama_puan=Avg('performansdegerlendirme__puan', default=0),
+        tamamlanan_isler_sayisi=models.Count(
+            'isatama__is_objesi', filter=Q(isatama__is_objesi__durum='tamamlandi'), distinct=True
+        ),
+        son_mc_performans=models.Subquery(son_mc_sonuc.values('ortalama_performans')[:1]),
+        son_mc_risk=models.Subquery(son_mc_sonuc.values('risk_skoru')[:1])
+    ).order_by('-ortalama_puan').values(
+        'ad_soyad', 'yetkinlik_seviyesi', 'ortalama_puan', 'tamamlanan_isler_sayisi',
+        'son_mc_performans', 'son_mc_risk'
+    )
+
     seviye_map = {1: 'Ustabaşı', 2: 'Kalifiyeli', 3: 'Çırak'}
 
-    for calisan in tum_calisanlar:
-        # Tamamladığı iş sayısı
-        tamamlanan_isler_sayisi = Is.objects.filter(
-            durum='tamamlandi',
-            atananlar__calisan=calisan
-        ).distinct().count()
-
-        # Monte Carlo sonuçları
-        son_mc_sonuc = calisan.montecarlosonuc_set.order_by('-simulasyon_zamani').first()
-        mc_performans = son_mc_sonuc.ortalama_performans * 100 if son_mc_sonuc else 0
-        mc_risk = son_mc_sonuc.risk_skoru * 100 if son_mc_sonuc else 0
-        
-        personel_verileri.append({
-            'ad_soyad': calisan.ad_soyad,
-            'seviye': seviye_map.get(calisan.yetkinlik_seviyesi, 'Bilinmiyor'),
-            'tamamladigi_isler': tamamlanan_isler_sayisi,
-            'ortalama_puan': calisan.ortalama_puan,
-            'mc_performans': mc_performans,
-            'mc_risk': mc_risk,
-        })
+    personel_verileri = [{
+        'ad_soyad': calisan['ad_soyad'],
+        'seviye': seviye_map.get(calisan['yetkinlik_seviyesi'], 'Bilinmiyor'),
+        'tamamladigi_isler': calisan['tamamlanan_isler_sayisi'],
+        'ortalama_puan': calisan['ortalama_puan'],
+        'mc_performans': calisan['son_mc_performans'] * 100 if calisan['son_mc_performans'] is not None else 0,
+        'mc_risk': calisan['son_mc_risk'] * 100 if calisan['son_mc_risk'] is not None else 0,
+    } for calisan in tum_calisanlar]
 
     # Geciken iş sayısı
     bugun = timezone.now().date()
@@ -821,6 +832,8 @@ def raporlama_sayfasi(request):
         'en_yuksek_performansli': en_yuksek_performansli,
         'personel_verileri': personel_verileri,
         'tamamlanmis_isler': tamamlanmis_isler,
+        'arsiv_sonraki': arsiv_sonraki,
+        'arsiv_ilk_sayfa_degil': bool(request.GET.get('arsiv_sonraki')),
     }
     return render(request, 'cizelgeleme/raporlama.html', context)
 